@@ -6,7 +6,7 @@ from .models import (
     UserProfile, FreelancerProfile, CreatorProfile, ClientProfile, Notification, 
     ProjectCategory, Project, ProjectApplication, ProjectContract, ProjectReview, 
     AssetPurchase, AssetReview, Post, Like, Comment, CommentLike,
-    BlogLike, BlogComment, BlogCommentLike
+    BlogLike, BlogComment, BlogCommentLike, OutboundEmail
 )
 
 # Register your models here.
@@ -180,6 +180,14 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'message']
     readonly_fields = ['created_at', 'updated_at']
 
+# Outbound email queue
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'category', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'category']
+    search_fields = ['subject', 'to']
+    readonly_fields = ['created_at', 'sent_at', 'claimed_at', 'last_error']
+
 admin.site.register(Service)
 admin.site.register(PortfolioItem)
 admin.site.register(BlogPost)
@@ -1,4 +1,5 @@
 import logging
+from datetime import date
 
 from rest_framework import viewsets, status, serializers
 from rest_framework.decorators import action, api_view, permission_classes
@@ -6,15 +7,22 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, IsAdminUser, AllowAny
 from rest_framework.exceptions import PermissionDenied
 from django.contrib.auth.models import User
-from django.db.models import Q, Avg, Count
+from django.db import transaction
+from django.db.models import Q, Count
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from .permissions import IsOwnerOrReadOnly, IsPortfolioOwnerOrReadOnly
+from .comment_utils import load_comment_thread, parse_comment_page
+from .cache_utils import cached_response
+from .conditional_utils import conditional_get, public_profile_scope
+from .feed_utils import build_feed_context
+from .marketplace_utils import award_project, filter_by_skills, rank_freelancers_for_project
 from .asset_utils import (
     get_recommended_assets, get_asset_search_results, validate_asset_purchase,
-    process_asset_purchase, get_seller_stats, get_trending_assets, calculate_asset_rating
+    process_asset_purchase, get_seller_stats, get_seller_daily_stats, get_trending_assets,
+    calculate_asset_rating
 )
 from .models import (
     TeamMember, Service, PortfolioItem, BlogPost, UserProfile, Notification, Device,
@@ -114,30 +122,24 @@ class UserViewSet(viewsets.ModelViewSet):
         if not token:
             return Response({'error': 'Token is required'}, status=400)
         
-        try:
-            verification = EmailVerification.objects.get(token=token)
-            
-            if verification.is_verified:
-                return Response({'message': 'Email already verified'}, status=200)
-            
-            if verification.is_expired():
-                return Response({'error': 'Verification token has expired'}, status=400)
-            
-            # Verify the email
-            success = verification.verify()
-            if success:
-                # Send welcome email
-                send_welcome_email(verification.user)
-                return Response({
-                    'message': 'Email verified successfully',
-                    'user_id': verification.user.id,
-                    'username': verification.user.username
-                }, status=200)
-            else:
-                return Response({'error': 'Verification failed'}, status=400)
-                
-        except EmailVerification.DoesNotExist:
+        verification, outcome = EmailVerification.verify_token(token)
+        
+        if outcome == 'invalid':
             return Response({'error': 'Invalid verification token'}, status=400)
+        
+        if outcome == 'already_verified':
+            return Response({'message': 'Email already verified'}, status=200)
+        
+        if outcome == 'expired':
+            return Response({'error': 'Verification token has expired'}, status=400)
+        
+        # Send welcome email
+        send_welcome_email(verification.user)
+        return Response({
+            'message': 'Email verified successfully',
+            'user_id': verification.user.id,
+            'username': verification.user.username
+        }, status=200)
     
     @action(detail=False, methods=['post'], permission_classes=[])
     def resend_verification(self, request):
@@ -178,10 +180,20 @@ class UserViewSet(viewsets.ModelViewSet):
         frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
         
         try:
-            verification = EmailVerification.objects.get(token=token)
-            logger.info(f"Processing verification for token: {token}, user: {verification.user.email}")
+            verification, outcome = EmailVerification.verify_token(token)
+            
+            if outcome == 'invalid':
+                logger.error("Verification token not found")
+                params = urlencode({
+                    'status': 'error',
+                    'message': 'This verification link is invalid or has been used already.'
+                })
+                redirect_url = f'{frontend_url}/email-verified?{params}'
+                return redirect(redirect_url)
+            
+            logger.info(f"Processing verification for user: {verification.user.email}")
             
-            if verification.is_verified:
+            if outcome == 'already_verified':
                 params = urlencode({
                     'status': 'already_verified',
                     'message': 'Your email has already been verified. You can log in to your account.'
@@ -190,7 +202,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 logger.info(f"User already verified, redirecting to: {redirect_url}")
                 return redirect(redirect_url)
             
-            if verification.is_expired():
+            if outcome == 'expired':
                 params = urlencode({
                     'status': 'expired',
                     'message': 'This verification link has expired. Please request a new verification email.'
@@ -199,40 +211,21 @@ class UserViewSet(viewsets.ModelViewSet):
                 logger.info(f"Verification expired, redirecting to: {redirect_url}")
                 return redirect(redirect_url)
             
-            # Verify the email
-            success = verification.verify()
-            if success:
-                # Send welcome email
-                try:
-                    send_welcome_email(verification.user)
-                    logger.info(f"Welcome email sent to {verification.user.email}")
-                except Exception as e:
-                    logger.error(f"Failed to send welcome email: {e}")
-                
-                params = urlencode({
-                    'status': 'success',
-                    'message': f'Welcome to VikraHub, {verification.user.first_name or verification.user.username}! Your email has been verified successfully.'
-                })
-                redirect_url = f'{frontend_url}/email-verified?{params}'
-                logger.info(f"Verification successful, redirecting to: {redirect_url}")
-                return redirect(redirect_url)
-            else:
-                params = urlencode({
-                    'status': 'error',
-                    'message': 'There was an error verifying your email. Please try again.'
-                })
-                redirect_url = f'{frontend_url}/email-verified?{params}'
-                logger.error(f"Verification failed, redirecting to: {redirect_url}")
-                return redirect(redirect_url)
-                
-        except EmailVerification.DoesNotExist:
-            logger.error(f"Verification token not found: {token}")
+            # Send welcome email
+            try:
+                send_welcome_email(verification.user)
+                logger.info(f"Welcome email sent to {verification.user.email}")
+            except Exception as e:
+                logger.error(f"Failed to send welcome email: {e}")
+            
             params = urlencode({
-                'status': 'error',
-                'message': 'This verification link is invalid or has been used already.'
+                'status': 'success',
+                'message': f'Welcome to VikraHub, {verification.user.first_name or verification.user.username}! Your email has been verified successfully.'
             })
             redirect_url = f'{frontend_url}/email-verified?{params}'
+            logger.info(f"Verification successful, redirecting to: {redirect_url}")
             return redirect(redirect_url)
+            
         except Exception as e:
             logger.error(f"Unexpected error during verification: {e}")
             # Fallback to simple HTML response if redirect fails
@@ -314,6 +307,19 @@ class PublicUserProfileViewSet(viewsets.ReadOnlyModelViewSet):
             user__is_active=True
         ).exclude(user__is_staff=True)
     
+    @conditional_get('profile', scope=public_profile_scope, max_age=60, per_viewer=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    def get_profile_user(self):
+        """Active user named in the URL (case-insensitive), looked up once per request"""
+        if not hasattr(self, '_profile_user'):
+            username = self.kwargs.get('user__username')
+            self._profile_user = (
+                User.objects.filter(username__iexact=username, is_active=True).first() if username else None
+            )
+        return self._profile_user
+    
     def get_object(self):
         """Get object with case-insensitive username lookup and proper error handling"""
         import logging
@@ -325,11 +331,10 @@ class PublicUserProfileViewSet(viewsets.ReadOnlyModelViewSet):
                 logger.warning("No username provided in URL parameters")
                 raise Http404("Username not provided")
             
-            # Case-insensitive, 404-safe lookup with select_related for user info
-            user = get_object_or_404(
-                User.objects.select_related().filter(username__iexact=username),
-                is_active=True
-            )
+            # Case-insensitive lookup, shared with the conditional GET validator
+            user = self.get_profile_user()
+            if user is None:
+                raise Http404("Profile not found")
             
             # Exclude staff/admin accounts from public profiles
             if user.is_staff or user.is_superuser:
@@ -364,6 +369,7 @@ class PublicUserProfileViewSet(viewsets.ReadOnlyModelViewSet):
             raise Http404("Profile not found")
 
     @action(detail=False, methods=['get'])
+    @cached_response('public_profile_search', tags=('public_profiles',))
     def search(self, request):
         """Search public profiles by username, name, or skills"""
         query = request.query_params.get('q', '')
@@ -455,7 +461,19 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return all published blogs, ordered by creation date"""
-        return BlogPost.objects.filter(published=True).order_by('-created_at')
+        return BlogPost.objects.filter(published=True).select_related('author').order_by('-created_at')
+    
+    @cached_response('blog_list', tags=('blog_feed',), refresh_every=60)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    def _get_feed_context(self, posts):
+        """Serializer context with viewer likes and author stats batched for the page"""
+        context = self.get_serializer_context()
+        context.update(build_feed_context(
+            posts, BlogLike, 'blog_post', 'liked_blog_post_ids', self.request.user, 'author'
+        ))
+        return context
     
     def get_permissions(self):
         """
@@ -638,13 +656,17 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'])
+    @conditional_get('blog_feed', max_age=60, per_viewer=True, refresh_every=60)
+    @cached_response('blog_all_posts', tags=('blog_feed',), refresh_every=60)
     def all_posts(self, request):
         """Get all published blog posts from all users"""
         try:
-            posts = BlogPost.objects.filter(published=True).order_by('-created_at')
-            serializer = self.get_serializer(posts, many=True)
+            posts = list(
+                BlogPost.objects.filter(published=True).select_related('author').order_by('-created_at')
+            )
+            serializer = self.get_serializer(posts, many=True, context=self._get_feed_context(posts))
             return Response({
-                'count': posts.count(),
+                'count': len(posts),
                 'results': serializer.data
             })
         except Exception as e:
@@ -664,10 +686,12 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_401_UNAUTHORIZED)
         
         try:
-            posts = BlogPost.objects.filter(author=request.user).order_by('-created_at')
-            serializer = self.get_serializer(posts, many=True)
+            posts = list(
+                BlogPost.objects.filter(author=request.user).select_related('author').order_by('-created_at')
+            )
+            serializer = self.get_serializer(posts, many=True, context=self._get_feed_context(posts))
             return Response({
-                'count': posts.count(),
+                'count': len(posts),
                 'results': serializer.data
             })
         except Exception as e:
@@ -905,6 +929,14 @@ class AssetCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AssetCategory.objects.all()
     serializer_class = AssetCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    
+    @conditional_get('asset_categories', max_age=3600)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get('asset_categories', max_age=3600)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 class CreativeAssetViewSet(viewsets.ModelViewSet):
     queryset = CreativeAsset.objects.filter(is_active=True)
@@ -970,6 +1002,8 @@ class CreativeAssetViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'])
+    @conditional_get('trending_assets', max_age=300, per_viewer=True, refresh_every=300)
+    @cached_response('trending_assets', tags=('trending_assets',), refresh_every=300)
     def trending(self, request):
         """Get trending assets"""
         days = int(request.query_params.get('days', 7))
@@ -1036,7 +1070,21 @@ class CreativeAssetViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
+        start_date = end_date = None
+        try:
+            if request.query_params.get('start'):
+                start_date = date.fromisoformat(request.query_params['start'])
+            if request.query_params.get('end'):
+                end_date = date.fromisoformat(request.query_params['end'])
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be dates in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         stats = get_seller_stats(request.user)
+        if start_date or end_date:
+            stats['daily'] = get_seller_daily_stats(request.user, start_date, end_date)
         return Response(stats)
         
         # Update asset download count
@@ -1175,8 +1223,8 @@ class FreelancerProfileViewSet(viewsets.ModelViewSet):
         skill_level = self.request.query_params.get('skill_level', None)
         
         if skills:
-            # Search in user's skills from UserProfile
-            queryset = queryset.filter(user__userprofile__skills__icontains=skills)
+            # Normalized skills mirrored from the user's UserProfile
+            queryset = filter_by_skills(queryset, skills)
         if min_rate:
             queryset = queryset.filter(hourly_rate__gte=min_rate)
         if max_rate:
@@ -1243,6 +1291,8 @@ class CreatorProfileViewSet(viewsets.ModelViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @conditional_get('featured_creators', max_age=300)
+    @cached_response('featured_creators', tags=('featured_creators',))
     def featured(self, request):
         """Get featured creators for homepage"""
         featured_creators = CreatorProfile.objects.filter(is_featured=True)[:3]
@@ -1289,6 +1339,14 @@ class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    
+    @conditional_get('project_categories', max_age=3600)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get('project_categories', max_age=3600)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.filter(status='open')
@@ -1309,13 +1367,32 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if budget_max:
             queryset = queryset.filter(budget_max__lte=budget_max)
         if skills:
-            queryset = queryset.filter(required_skills__icontains=skills)
+            queryset = filter_by_skills(queryset, skills)
             
         return queryset.order_by('-created_at')
     
     def perform_create(self, serializer):
         serializer.save(client=self.request.user)
     
+    @action(detail=True, methods=['get'])
+    def matching_freelancers(self, request, pk=None):
+        """Available freelancers ranked by how many of the project's skills they have"""
+        project = self.get_object()
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 50)
+        except ValueError:
+            limit = 20
+        
+        required = project.skills.count()
+        freelancers = rank_freelancers_for_project(project).select_related('user', 'user__userprofile')[:limit]
+        results = []
+        for profile in freelancers:
+            data = FreelancerProfileSerializer(profile, context={'request': request}).data
+            data['match_score'] = profile.match_score
+            data['match_ratio'] = round(profile.match_score / required, 2) if required else 0
+            results.append(data)
+        return Response({'required_skills': required, 'results': results})
+    
     @action(detail=False, methods=['get'])
     def my_projects(self, request):
         """Get current user's posted projects"""
@@ -1342,31 +1419,16 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            application = ProjectApplication.objects.get(
-                project=project, 
-                freelancer__id=freelancer_id,
-                status='pending'
-            )
-        except ProjectApplication.DoesNotExist:
+            project, application, contract = award_project(project.pk, request.user, freelancer_id)
+        except (Project.DoesNotExist, ProjectApplication.DoesNotExist):
             return Response(
                 {'error': 'Application not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
         
-        # Update project and application
-        project.selected_freelancer_id = freelancer_id
-        project.status = 'in_progress'
-        project.save()
-        
-        application.status = 'accepted'
-        application.save()
-        
-        # Reject other applications
-        ProjectApplication.objects.filter(project=project).exclude(
-            id=application.id
-        ).update(status='rejected')
-        
-        return Response({'status': 'freelancer selected successfully'})
+        return Response({'status': 'freelancer selected successfully', 'contract_id': contract.id})
 
 class ProjectApplicationViewSet(viewsets.ModelViewSet):
     queryset = ProjectApplication.objects.all()
@@ -1404,6 +1466,11 @@ class ProjectContractViewSet(viewsets.ModelViewSet):
         return ProjectContract.objects.filter(
             Q(freelancer=user) | Q(client=user)
         )
+    
+    def perform_update(self, serializer):
+        # Completion updates the freelancer and client metrics in the same transaction
+        with transaction.atomic():
+            serializer.save()
 
 class ProjectReviewViewSet(viewsets.ModelViewSet):
     queryset = ProjectReview.objects.all()
@@ -1428,21 +1495,10 @@ class ProjectReviewViewSet(viewsets.ModelViewSet):
         else:
             raise serializers.ValidationError("Invalid review configuration")
         
-        serializer.save(reviewer=self.request.user, review_type=review_type)
-        
-        # Update freelancer rating if reviewing freelancer
-        if review_type == 'client_to_freelancer':
-            freelancer_reviews = ProjectReview.objects.filter(
-                reviewee=reviewee, review_type='client_to_freelancer'
-            )
-            avg_rating = freelancer_reviews.aggregate(Avg('rating'))['rating__avg']
-            
-            try:
-                freelancer_profile = FreelancerProfile.objects.get(user=reviewee)
-                freelancer_profile.rating = round(avg_rating, 2) if avg_rating else 0
-                freelancer_profile.save()
-            except FreelancerProfile.DoesNotExist:
-                pass
+        # Profile ratings are updated incrementally by the review signals
+        # (core.marketplace_utils) inside this transaction
+        with transaction.atomic():
+            serializer.save(reviewer=self.request.user, review_type=review_type)
 
 # Social Media API Views for Posts, Likes, and Comments
 class PostViewSet(viewsets.ModelViewSet):
@@ -1478,7 +1534,21 @@ class PostViewSet(viewsets.ModelViewSet):
         if username:
             queryset = queryset.filter(user__username=username)
         
-        return queryset.order_by('-created_at')
+        return queryset.select_related('user').order_by('-created_at')
+    
+    def list(self, request, *args, **kwargs):
+        """List posts with viewer likes and author stats resolved per page"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        posts = list(page if page is not None else queryset)
+        
+        context = self.get_serializer_context()
+        context.update(build_feed_context(posts, Like, 'post', 'liked_post_ids', request.user, 'user'))
+        serializer = self.get_serializer(posts, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     def perform_create(self, serializer):
         """Set the post creator to the current user"""
@@ -1509,6 +1579,11 @@ class PostViewSet(viewsets.ModelViewSet):
             # New like
             post.increment_like_count()
             state_changed = True
+            try:
+                from .notification_utils import create_like_notification
+                create_like_notification(user, post)
+            except Exception as e:
+                logger.warning(f"Failed to create like notification: {e}")
         elif not desired_state and not created:
             # Remove like
             like.delete()
@@ -1536,9 +1611,19 @@ class PostViewSet(viewsets.ModelViewSet):
     def comments(self, request, pk=None):
         """Get comments for a post"""
         post = self.get_object()
-        comments = Comment.objects.filter(post=post, parent=None).order_by('created_at')
-        serializer = CommentSerializer(comments, many=True, context={'request': request})
-        return Response(serializer.data)
+        page, page_size = parse_comment_page(request)
+        comments, thread_context, total = load_comment_thread(
+            Comment.objects.filter(post=post), CommentLike, request.user, page, page_size
+        )
+        serializer = CommentSerializer(comments, many=True, context={'request': request, **thread_context})
+        if page is None:
+            return Response(serializer.data)
+        return Response({
+            'count': total,
+            'page': page,
+            'page_size': page_size,
+            'results': serializer.data
+        })
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def add_comment(self, request, pk=None):
@@ -1711,9 +1796,19 @@ def blog_comments(request, blog_id):
     
     if request.method == 'GET':
         # Get comments
-        comments = BlogComment.objects.filter(blog_post=blog_post, parent=None).order_by('created_at')
-        serializer = BlogCommentSerializer(comments, many=True, context={'request': request})
-        return Response(serializer.data)
+        page, page_size = parse_comment_page(request)
+        comments, thread_context, total = load_comment_thread(
+            BlogComment.objects.filter(blog_post=blog_post), BlogCommentLike, request.user, page, page_size
+        )
+        serializer = BlogCommentSerializer(comments, many=True, context={'request': request, **thread_context})
+        if page is None:
+            return Response(serializer.data)
+        return Response({
+            'count': total,
+            'page': page,
+            'page_size': page_size,
+            'results': serializer.data
+        })
     
     elif request.method == 'POST':
         # Add comment
@@ -1796,36 +1891,14 @@ def blog_meta_tags(request, slug):
     """
     Get meta tags for a blog post for social media sharing
     """
+    from .share_utils import get_share_artifacts, conditional_share_response
+    
     try:
-        blog = get_object_or_404(BlogPost, slug=slug, published=True)
-        
-        # Generate clean excerpt for description
-        description = blog.excerpt or (blog.content[:160] + '...' if blog.content else '')
-        description = description.replace('\n', ' ').replace('\r', '').strip()
-        
-        # Construct full URLs
-        blog_url = request.build_absolute_uri(f'/blog/{blog.slug}')
-        image_url = blog.image or request.build_absolute_uri('/vikrahub-hero.jpg')
-        
-        # Author name with fallback
-        author_name = (blog.author.first_name and blog.author.last_name and 
-                      f"{blog.author.first_name} {blog.author.last_name}") or blog.author.username or 'Vikra Hub'
-        
-        meta_data = {
-            'title': f"{blog.title} | Vikra Hub",
-            'description': description,
-            'image': image_url,
-            'url': blog_url,
-            'type': 'article',
-            'site_name': 'Vikra Hub',
-            'author': author_name,
-            'published_time': blog.created_at.isoformat(),
-            'modified_time': blog.updated_at.isoformat(),
-            'section': blog.category or 'Blog',
-            'tags': blog.get_tags_list()
-        }
-        
-        return Response(meta_data)
+        artifacts = get_share_artifacts(slug, request)
+        if artifacts is None:
+            raise Http404("No published blog post matches the given slug.")
+        
+        return conditional_share_response(request, artifacts, 'meta', Response(artifacts['meta']))
         
     except Exception as e:
         logger.error(f"Error fetching blog meta tags: {e}")
@@ -1833,3 +1906,33 @@ def blog_meta_tags(request, slug):
             'error': 'Failed to fetch meta tags',
             'detail': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Home timeline built from followed accounts
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_feed(request):
+    """
+    Cursor-paginated home feed of posts, blogs, portfolio items and assets
+    from the accounts the current user follows
+    """
+    from .timeline_utils import get_timeline, hydrate_timeline, TIMELINE_PAGE_SIZE, TIMELINE_MAX_PAGE_SIZE
+    
+    try:
+        limit = int(request.query_params.get('limit', TIMELINE_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = TIMELINE_PAGE_SIZE
+    limit = min(max(1, limit), TIMELINE_MAX_PAGE_SIZE)
+    
+    try:
+        rows, next_cursor = get_timeline(request.user, request.query_params.get('cursor'), limit)
+        return Response({
+            'results': hydrate_timeline(rows, request),
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        logger.error(f"Error building home feed for user {request.user.id}: {e}")
+        return Response({
+            'error': 'Failed to fetch feed',
+            'detail': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -7,3 +7,11 @@ class CoreConfig(AppConfig):
     
     def ready(self):
         import core.models  # This ensures signals are loaded
+        import core.timeline_utils  # Timeline fan-out signals
+        import core.share_utils  # Share page cache invalidation
+        import core.conditional_utils  # Conditional GET version bumps
+        import core.marketplace_utils  # Skill normalization for marketplace search
+        
+        from core import instrumentation
+        if instrumentation.INSTRUMENTATION_ENABLED:
+            instrumentation.install_serializer_timing()  # Serializer time in request metrics
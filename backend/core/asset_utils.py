@@ -5,7 +5,8 @@ Handles file validation, processing, and marketplace operations
 import re
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from django.db.models import Avg, Q, Count
+from django.utils import timezone
+from django.db.models import Avg, Q, Count, Sum, F
 from .cloudinary_utils import validate_cloudinary_url
 
 
@@ -209,6 +210,7 @@ def process_asset_purchase(user, asset):
     # Update asset download count
     asset.downloads += 1
     asset.save(update_fields=['downloads'])
+    record_seller_activity(asset.seller_id, timezone.localdate(purchase.purchase_date), downloads=1)
     
     # TODO: Process payment with payment gateway
     # This would integrate with Stripe, PayPal, etc.
@@ -218,30 +220,142 @@ def process_asset_purchase(user, asset):
 
 def get_seller_stats(seller):
     """Get statistics for a seller"""
-    from .models import CreativeAsset, AssetPurchase, AssetReview
-    
-    assets = CreativeAsset.objects.filter(seller=seller)
-    
-    stats = {
-        'total_assets': assets.count(),
-        'active_assets': assets.filter(is_active=True).count(),
-        'total_downloads': sum(asset.downloads for asset in assets),
-        'total_revenue': sum(
-            purchase.price_paid for purchase in AssetPurchase.objects.filter(asset__seller=seller)
-        ),
-        'average_rating': 0.0,
-        'total_reviews': 0
-    }
+    from .models import CreativeAsset, SellerDailyStats
     
-    # Calculate average rating across all assets
-    reviews = AssetReview.objects.filter(asset__seller=seller)
-    if reviews.exists():
-        stats['average_rating'] = reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
-        stats['total_reviews'] = reviews.count()
+    # Asset counts and downloads in a single aggregate over the seller's assets
+    stats = CreativeAsset.objects.filter(seller=seller).aggregate(
+        total_assets=Count('id'),
+        active_assets=Count('id', filter=Q(is_active=True)),
+        total_downloads=Sum('downloads'),
+    )
+    
+    # Sales and review totals come from the daily rollup instead of raw rows
+    totals = SellerDailyStats.objects.filter(seller=seller).aggregate(
+        total_revenue=Sum('revenue'),
+        total_reviews=Sum('reviews_count'),
+        rating_total=Sum('rating_total'),
+    )
+    
+    total_reviews = totals['total_reviews'] or 0
+    stats['total_downloads'] = stats['total_downloads'] or 0
+    stats['total_revenue'] = totals['total_revenue'] or Decimal('0.00')
+    stats['total_reviews'] = total_reviews
+    stats['average_rating'] = (totals['rating_total'] / total_reviews) if total_reviews else 0.0
     
     return stats
 
 
+def get_seller_daily_stats(seller, start_date=None, end_date=None):
+    """Per-day sales, revenue, downloads and reviews for a seller from the rollup"""
+    from .models import SellerDailyStats
+    
+    rows = SellerDailyStats.objects.filter(seller=seller)
+    if start_date:
+        rows = rows.filter(date__gte=start_date)
+    if end_date:
+        rows = rows.filter(date__lte=end_date)
+    
+    return [
+        {
+            'date': row['date'].isoformat(),
+            'sales': row['sales_count'],
+            'revenue': row['revenue'],
+            'downloads': row['downloads'],
+            'reviews': row['reviews_count'],
+            'average_rating': (row['rating_total'] / row['reviews_count']) if row['reviews_count'] else None,
+        }
+        for row in rows.order_by('date').values(
+            'date', 'sales_count', 'revenue', 'downloads', 'reviews_count', 'rating_total'
+        )
+    ]
+
+
+def record_seller_activity(seller_id, day, sales=0, revenue=0, downloads=0, reviews=0, rating_total=0):
+    """
+    Apply deltas to a seller's rollup row for one day.
+    
+    Uses an F-expression UPDATE so concurrent writers never lose increments;
+    the row is created on first activity for the day.
+    """
+    from django.db import IntegrityError, transaction
+    from .models import SellerDailyStats
+    
+    deltas = {
+        'sales_count': F('sales_count') + sales,
+        'revenue': F('revenue') + revenue,
+        'downloads': F('downloads') + downloads,
+        'reviews_count': F('reviews_count') + reviews,
+        'rating_total': F('rating_total') + rating_total,
+    }
+    rows = SellerDailyStats.objects.filter(seller_id=seller_id, date=day)
+    if rows.update(**deltas):
+        return
+    if max(sales, revenue, downloads, reviews, rating_total) <= 0:
+        # Nothing to reverse on a day that was never recorded
+        return
+    
+    try:
+        with transaction.atomic():
+            SellerDailyStats.objects.create(
+                seller_id=seller_id,
+                date=day,
+                sales_count=max(0, sales),
+                revenue=max(Decimal('0'), Decimal(revenue)),
+                downloads=max(0, downloads),
+                reviews_count=max(0, reviews),
+                rating_total=max(0, rating_total),
+            )
+    except IntegrityError:
+        # Another writer created the row first; apply the deltas to it
+        rows.update(**deltas)
+
+
+def rebuild_seller_rollups(seller_ids=None):
+    """Recompute SellerDailyStats from raw purchases and reviews"""
+    from django.db import transaction
+    from django.db.models.functions import TruncDate
+    from .models import AssetPurchase, AssetReview, SellerDailyStats
+    
+    purchases = AssetPurchase.objects.all()
+    reviews = AssetReview.objects.all()
+    existing = SellerDailyStats.objects.all()
+    if seller_ids is not None:
+        purchases = purchases.filter(asset__seller_id__in=seller_ids)
+        reviews = reviews.filter(asset__seller_id__in=seller_ids)
+        existing = existing.filter(seller_id__in=seller_ids)
+    
+    rows = {}
+    
+    def row_for(seller_id, day):
+        return rows.setdefault((seller_id, day), SellerDailyStats(seller_id=seller_id, date=day))
+    
+    for entry in (
+        purchases.annotate(day=TruncDate('purchase_date'))
+        .values('asset__seller_id', 'day')
+        .annotate(sales=Count('id'), revenue=Sum('price_paid'))
+        .order_by()
+    ):
+        row = row_for(entry['asset__seller_id'], entry['day'])
+        row.sales_count = entry['sales']
+        row.revenue = entry['revenue'] or 0
+        row.downloads = entry['sales']
+    
+    for entry in (
+        reviews.annotate(day=TruncDate('created_at'))
+        .values('asset__seller_id', 'day')
+        .annotate(reviews=Count('id'), rating_total=Sum('rating'))
+        .order_by()
+    ):
+        row = row_for(entry['asset__seller_id'], entry['day'])
+        row.reviews_count = entry['reviews']
+        row.rating_total = entry['rating_total'] or 0
+    
+    with transaction.atomic():
+        existing.delete()
+        SellerDailyStats.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
+
+
 def get_trending_assets(days=7, limit=10):
     """Get trending assets based on recent downloads and ratings"""
     from django.utils import timezone
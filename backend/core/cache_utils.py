@@ -0,0 +1,121 @@
+"""
+Shared response cache for anonymous list endpoints.
+
+Anonymous visitors to the blog list, featured creators, profile search and
+trending assets all receive the same payload, so the serialized data is
+stored in the default cache (Redis in production) and reused by every worker.
+
+Keys are built from the endpoint name, the host, the normalized query
+parameters, the Accept header and the current versions of the endpoint's tags. Tags are
+the conditional GET resources (see conditional_utils.RESOURCE_DEPENDENCIES):
+the model signals that bump a resource version also orphan every cached
+response tagged with it, so invalidation needs no key bookkeeping.
+
+On a miss only the worker that wins a short-lived lock rebuilds and stores
+the entry. Views run on the ASGI thread pool, so the others never wait for
+it: they serve the last payload built for the same request (kept under a
+version-less key for RESPONSE_CACHE_STALE_TIMEOUT seconds), or build the
+response themselves when there is none, without storing it.
+"""
+import hashlib
+import logging
+import math
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .conditional_utils import get_versions
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+RESPONSE_CACHE_LOCK_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 30)
+RESPONSE_CACHE_STALE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_STALE_TIMEOUT', 3600)
+
+
+def _request_parts(request):
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    return [request.get_host(), repr(params), request.META.get('HTTP_ACCEPT', '')]
+
+
+def _digest(parts):
+    return hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def response_cache_key(endpoint, request, tags, refresh_every=None):
+    """Cache key for one endpoint, query and set of tag versions"""
+    parts = _request_parts(request) + [repr(get_versions(tags))]
+    if refresh_every:
+        parts.append(str(math.floor(time.time() / refresh_every)))
+    return f'response:{endpoint}:{_digest(parts)}'
+
+
+def stale_response_key(endpoint, request):
+    """Key of the last payload built for one endpoint and query, whatever the tag versions"""
+    return f'response:{endpoint}:stale:{_digest(_request_parts(request))}'
+
+
+def get_or_build(key, build, timeout=None, stale_key=None):
+    """
+    Cached value for key, calling build() on a miss. Concurrent misses do not
+    wait for the worker holding the rebuild lock: they get the value under
+    stale_key if there is one, or build it without storing it.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, RESPONSE_CACHE_LOCK_TIMEOUT):
+        if stale_key is not None:
+            value = cache.get(stale_key)
+            if value is not None:
+                return value
+        logger.debug(f"Cache rebuild of {key} in progress elsewhere; building it here")
+        return build()
+
+    try:
+        value = build()
+        if value is not None:
+            cache.set(key, value, RESPONSE_CACHE_TIMEOUT if timeout is None else timeout)
+            if stale_key is not None:
+                cache.set(stale_key, value, RESPONSE_CACHE_STALE_TIMEOUT)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def cached_response(endpoint, tags, timeout=None, refresh_every=None):
+    """
+    Serve anonymous GETs of a viewset method from the shared response cache.
+
+    Args:
+        endpoint: name used in cache keys
+        tags: resources whose changes invalidate the cached payloads
+        timeout: seconds to keep an entry (RESPONSE_CACHE_TIMEOUT by default)
+        refresh_every: seconds after which the payload changes with no write
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not RESPONSE_CACHE_ENABLED or request.method != 'GET' or request.user.is_authenticated:
+                return view_method(self, request, *args, **kwargs)
+
+            key = response_cache_key(endpoint, request, tags, refresh_every)
+            built = {}
+
+            def build():
+                response = built['response'] = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200 or not isinstance(response, Response):
+                    return None
+                return response.data
+
+            data = get_or_build(key, build, timeout, stale_response_key(endpoint, request))
+            if 'response' in built:
+                return built['response']
+            return Response(data)
+        return wrapper
+    return decorator
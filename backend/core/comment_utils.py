@@ -0,0 +1,101 @@
+"""
+Threaded comment loading for posts and blog posts.
+
+A whole thread is fetched with one query; a page of it fetches its top-level
+comments and then their replies one depth level at a time, so only the
+rendered comments are loaded. The tree is assembled in Python and decorated
+with the viewer's likes and author follow stats in batched queries, so the
+cost of rendering a thread does not grow with the number of comments.
+"""
+from collections import defaultdict
+from .follow_models import get_follow_stats_map
+
+COMMENT_PAGE_SIZE = 20
+MAX_COMMENT_PAGE_SIZE = 100
+
+
+def load_comment_thread(thread_queryset, like_model, viewer=None, page=None, page_size=COMMENT_PAGE_SIZE):
+    """
+    Load a comment thread as a tree.
+
+    Args:
+        thread_queryset: every comment belonging to one post or blog post
+        like_model: CommentLike or BlogCommentLike, used to resolve viewer likes
+        viewer: requesting user (anonymous users get no like lookup)
+        page: 1-based page over top-level comments, or None for all of them
+        page_size: number of top-level comments per page
+
+    Returns:
+        (roots, serializer_context, total_top_level). Each comment in the tree
+        has a ``thread_replies`` list; the context carries ``liked_comment_ids``
+        and ``follow_stats`` for the comment serializers.
+    """
+    thread_queryset = thread_queryset.order_by('created_at', 'id').select_related('user')
+
+    if page is None:
+        comments = list(thread_queryset)
+    else:
+        top_level = thread_queryset.filter(parent__isnull=True)
+        total_top_level = top_level.count()
+        offset = (page - 1) * page_size
+        comments = level = list(top_level[offset:offset + page_size])
+        # Replies of the page's roots, one query per depth level
+        while level:
+            level = list(thread_queryset.filter(parent_id__in=[comment.id for comment in level]))
+            comments = comments + level
+
+    children = defaultdict(list)
+    roots = []
+    for comment in comments:
+        comment.thread_replies = children[comment.id]
+        if comment.parent_id is None:
+            roots.append(comment)
+        else:
+            children[comment.parent_id].append(comment)
+
+    if page is None:
+        total_top_level = len(roots)
+    elif not roots:
+        return [], {'liked_comment_ids': set(), 'follow_stats': {}}, total_top_level
+
+    # Only decorate comments that will actually be rendered
+    visible = []
+    stack = list(roots)
+    while stack:
+        comment = stack.pop()
+        visible.append(comment)
+        stack.extend(comment.thread_replies)
+
+    liked_comment_ids = set()
+    if viewer is not None and viewer.is_authenticated and visible:
+        liked_comment_ids = set(
+            like_model.objects.filter(
+                user=viewer,
+                comment_id__in=[comment.id for comment in visible]
+            ).values_list('comment_id', flat=True)
+        )
+
+    follow_stats = get_follow_stats_map({comment.user_id for comment in visible}, viewer)
+
+    context = {
+        'liked_comment_ids': liked_comment_ids,
+        'follow_stats': follow_stats,
+    }
+    return roots, context, total_top_level
+
+
+def parse_comment_page(request):
+    """Read optional ?page= and ?page_size= for comment threads; page is None when absent"""
+    page = request.query_params.get('page')
+    if page is None:
+        return None, COMMENT_PAGE_SIZE
+    try:
+        page = max(1, int(page))
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        page_size = int(request.query_params.get('page_size', COMMENT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = COMMENT_PAGE_SIZE
+    page_size = min(max(1, page_size), MAX_COMMENT_PAGE_SIZE)
+    return page, page_size
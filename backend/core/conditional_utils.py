@@ -0,0 +1,181 @@
+"""
+Conditional GET for read-heavy API endpoints.
+
+Each cacheable payload is tied to a resource version kept in the cache.
+Writes to the models a resource is built from bump its version through
+post_save/post_delete, so a request can compute its ETag and Last-Modified
+from the versions alone - one cache round trip, no queries, no serializer -
+and answer 304 when the client already holds the current payload.
+
+Versions are timestamps of the last change. A version that is missing from
+the cache (cold start, eviction) is initialised to the current time, which
+changes every ETag derived from it: eviction costs a full response, never a
+stale 304. Validators are only as shared as the cache backend; with several
+workers the default cache must be a shared one.
+
+Payloads that depend on the viewer (is_liked, is_following, is_purchased)
+mix the viewer id into the ETag, are marked private for signed-in users and
+vary on Authorization so a CDN only stores the anonymous rendition.
+"""
+import hashlib
+import math
+import time
+from functools import wraps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .follow_models import Follow
+from .models import (
+    AssetCategory, AssetPurchase, AssetReview, BlogLike, BlogPost, CreativeAsset,
+    CreatorProfile, PortfolioItem, ProjectCategory, UserProfile
+)
+
+# Models whose writes change each shared resource's payload. The response
+# cache (cache_utils) uses the same resources as its invalidation tags.
+RESOURCE_DEPENDENCIES = {
+    'blog_feed': (BlogPost, BlogLike, Follow, User),
+    'asset_categories': (AssetCategory,),
+    'project_categories': (ProjectCategory,),
+    'featured_creators': (CreatorProfile, UserProfile, User),
+    'trending_assets': (CreativeAsset, AssetPurchase, AssetReview, AssetCategory, Follow, User),
+    'public_profiles': (UserProfile, User, Follow, PortfolioItem),
+}
+
+# Per-user profile resource: model -> fields holding the ids of the users it affects
+PROFILE_DEPENDENCIES = {
+    User: ('id',),
+    UserProfile: ('user_id',),
+    Follow: ('follower_id', 'followed_id'),
+    PortfolioItem: ('user_id',),
+}
+
+# Saves touching only these User fields change no public payload
+IGNORED_USER_FIELDS = {'last_login'}
+
+
+def _version_key(resource, scope=None):
+    if scope is None:
+        return f'conditional:{resource}'
+    return f'conditional:{resource}:{scope}'
+
+
+def bump_version(resource, scope=None):
+    """Mark a resource (optionally one scope of it, e.g. one user's profile) as changed"""
+    cache.set(_version_key(resource, scope), time.time(), None)
+
+
+def get_versions(resources, scope=None):
+    """Current version of each resource, initialising any the cache does not hold"""
+    keys = [_version_key(resource, scope) for resource in resources]
+    versions = cache.get_many(keys)
+    now = time.time()
+    for key in keys:
+        if key not in versions:
+            # add() so a concurrent bump is not overwritten
+            if not cache.add(key, now, None):
+                versions[key] = cache.get(key, now)
+            else:
+                versions[key] = now
+    return [versions[key] for key in keys]
+
+
+def public_profile_scope(view, request, *args, **kwargs):
+    """User id behind a public profile URL, or None to skip validation (e.g. a 404)"""
+    user = view.get_profile_user()
+    if user is None or user.is_staff or user.is_superuser:
+        return None
+    return user.pk
+
+
+def conditional_get(*resources, scope=None, max_age=60, per_viewer=False, refresh_every=None):
+    """
+    Serve a viewset method with ETag/Last-Modified validators and a
+    Cache-Control policy, answering 304 without running the view when the
+    client's copy is current.
+
+    Args:
+        resources: names from RESOURCE_DEPENDENCIES (or 'profile' with scope)
+        scope: callable(view, request, *args, **kwargs) returning the scope id
+            of the resources; None from it skips validation for the request
+        max_age: seconds shared caches and browsers may reuse the payload
+        per_viewer: the payload contains viewer-specific fields
+        refresh_every: seconds after which the payload changes with no write,
+            e.g. relative timestamps or a sliding "last N days" window
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_method(self, request, *args, **kwargs)
+
+            scope_id = None
+            if scope is not None:
+                scope_id = scope(self, request, *args, **kwargs)
+                if scope_id is None:
+                    return view_method(self, request, *args, **kwargs)
+
+            versions = get_versions(resources, scope_id)
+            last_modified = max(versions)
+            parts = [repr(versions), request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+            if refresh_every:
+                window = math.floor(time.time() / refresh_every) * refresh_every
+                last_modified = max(last_modified, window)
+                parts.append(str(window))
+            viewer_id = None
+            if per_viewer and request.user.is_authenticated:
+                viewer_id = request.user.pk
+                parts.append(f'viewer:{viewer_id}')
+            etag = '"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+            last_modified = int(last_modified)
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+
+            if viewer_id is not None:
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, public=True, max_age=max_age)
+            if per_viewer:
+                patch_vary_headers(response, ('Authorization',))
+            return response
+        return wrapper
+    return decorator
+
+
+# Invalidation
+
+def _resources_for(model):
+    return [resource for resource, models in RESOURCE_DEPENDENCIES.items() if model in models]
+
+
+def _bump_all(changed):
+    for resource, scope in changed:
+        bump_version(resource, scope)
+
+
+def _model_changed(sender, instance, update_fields=None, **kwargs):
+    if sender is User and update_fields and set(update_fields) <= IGNORED_USER_FIELDS:
+        return
+    changed = [(resource, None) for resource in _resources_for(sender)]
+    for field in PROFILE_DEPENDENCIES.get(sender, ()):
+        user_id = getattr(instance, field, None)
+        if user_id is not None:
+            changed.append(('profile', user_id))
+    _bump_all(changed)
+    # Again once committed: a request between the two may have read pre-commit rows
+    transaction.on_commit(lambda: _bump_all(changed))
+
+
+for _model in {model for models in RESOURCE_DEPENDENCIES.values() for model in models} | set(PROFILE_DEPENDENCIES):
+    post_save.connect(_model_changed, sender=_model, dispatch_uid=f'conditional_{_model._meta.label_lower}_saved')
+    post_delete.connect(_model_changed, sender=_model, dispatch_uid=f'conditional_{_model._meta.label_lower}_deleted')
@@ -0,0 +1,161 @@
+"""
+Outbound email queue.
+
+Request handlers call enqueue_email(), which only writes an OutboundEmail row.
+The process_email_queue worker claims due rows in batches and delivers each
+batch over a single backend connection (one SMTP session instead of one per
+message). Failures are retried with exponential backoff until
+EMAIL_QUEUE_MAX_ATTEMPTS is reached, after which the row is marked failed.
+"""
+import logging
+import smtplib
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE_BATCH_SIZE = getattr(settings, 'EMAIL_QUEUE_BATCH_SIZE', 50)
+EMAIL_QUEUE_MAX_ATTEMPTS = getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+EMAIL_QUEUE_RETRY_BASE_SECONDS = getattr(settings, 'EMAIL_QUEUE_RETRY_BASE_SECONDS', 60)
+EMAIL_QUEUE_CLAIM_TIMEOUT = getattr(settings, 'EMAIL_QUEUE_CLAIM_TIMEOUT', 600)
+
+# Errors after which the SMTP session cannot be reused
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def enqueue_email(subject, text_body, to, html_body='', from_email=None, category=''):
+    """Queue an email for background delivery and return the OutboundEmail row"""
+    email = OutboundEmail.objects.create(
+        category=category,
+        subject=subject,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or 'noreply@vikrahub.com',
+        to=list(to),
+        text_body=text_body,
+        html_body=html_body,
+    )
+    # Development without a worker: send just this row once the request commits
+    if getattr(settings, 'EMAIL_QUEUE_EAGER', False):
+        transaction.on_commit(lambda: process_email_queue(ids=[email.id]))
+    return email
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base, 2x base, 4x base, ..."""
+    return timedelta(seconds=EMAIL_QUEUE_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+
+
+def claim_batch(batch_size=EMAIL_QUEUE_BATCH_SIZE, ids=None):
+    """
+    Atomically move due emails (only those in ids, if given) to 'sending' and
+    return them.
+
+    Rows stuck in 'sending' longer than EMAIL_QUEUE_CLAIM_TIMEOUT (a worker
+    died mid-batch) become claimable again.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=EMAIL_QUEUE_CLAIM_TIMEOUT)
+    due = (
+        Q(status='pending', next_attempt_at__lte=now) |
+        Q(status='sending', claimed_at__lt=stale_before)
+    )
+    rows = OutboundEmail.objects.filter(due)
+    if ids is not None:
+        rows = rows.filter(id__in=ids)
+    with transaction.atomic():
+        ids = list(
+            rows.select_for_update(skip_locked=True)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        OutboundEmail.objects.filter(id__in=ids).update(status='sending', claimed_at=now)
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('next_attempt_at'))
+
+
+def build_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.text_body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def _mark_sent(email):
+    email.status = 'sent'
+    email.attempts += 1
+    email.sent_at = timezone.now()
+    email.last_error = ''
+    email.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+
+
+def _mark_failed_attempt(email, error):
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    if email.attempts >= EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = 'failed'
+        logger.error(f"Giving up on email {email.id} to {email.to} after {email.attempts} attempts: {error}")
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+        logger.warning(f"Email {email.id} to {email.to} failed (attempt {email.attempts}), retrying: {error}")
+    email.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+
+
+def deliver_batch(emails, connection=None):
+    """
+    Send claimed emails over one backend connection.
+
+    Returns (sent, failed_attempts).
+    """
+    connection = connection or get_connection(fail_silently=False)
+    sent = failed = 0
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            _mark_failed_attempt(email, e)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            try:
+                if not connection.send_messages([build_message(email, connection)]):
+                    raise RuntimeError('Email backend did not accept the message')
+                _mark_sent(email)
+                sent += 1
+            except Exception as e:
+                _mark_failed_attempt(email, e)
+                failed += 1
+                if isinstance(e, CONNECTION_ERRORS):
+                    # Start a fresh session for the rest of the batch
+                    connection.close()
+                    connection.open()
+    except Exception as e:
+        # Reconnect failed; hand the untouched rows back to the queue
+        remaining = [email for email in emails if email.status == 'sending']
+        for email in remaining:
+            _mark_failed_attempt(email, e)
+        failed += len(remaining)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def process_email_queue(batch_size=EMAIL_QUEUE_BATCH_SIZE, connection=None, ids=None):
+    """Claim and deliver one batch (restricted to ids, if given); returns (sent, failed_attempts)"""
+    emails = claim_batch(batch_size, ids)
+    if not emails:
+        return 0, 0
+    return deliver_batch(emails, connection)
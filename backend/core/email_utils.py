@@ -1,5 +1,4 @@
 # backend/core/email_utils.py
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
@@ -7,6 +6,7 @@ from django.urls import reverse
 from django.contrib.sites.models import Site
 from datetime import datetime
 import logging
+from .email_queue import enqueue_email
 
 logger = logging.getLogger(__name__)
 
@@ -44,25 +44,21 @@ def send_verification_email(user, verification_token):
         html_content = render_to_string('emails/verify_email.html', context)
         text_content = render_to_string('emails/verify_email.txt', context)
         
-        # Create and send email using Django's EmailMultiAlternatives
-        msg = EmailMultiAlternatives(
+        # Queue for the background worker (see core.email_queue)
+        enqueue_email(
             subject=subject,
-            body=text_content,  # Plain text version
+            text_body=text_content,  # Plain text version
+            html_body=html_content,
             from_email=from_email,
-            to=[to_email]
+            to=[to_email],
+            category='verification'
         )
         
-        # Attach HTML version
-        msg.attach_alternative(html_content, "text/html")
-        
-        # Send the email
-        msg.send()
-        
-        logger.info(f"Verification email sent successfully to {user.email}")
+        logger.info(f"Verification email queued for {user.email}")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send verification email to {user.email}: {str(e)}")
+        logger.error(f"Failed to queue verification email to {user.email}: {str(e)}")
         return False
 
 
@@ -138,21 +134,21 @@ def send_welcome_email(user):
         The {current_site.name} Team
         """
         
-        # Create and send email
-        email = EmailMultiAlternatives(
+        # Queue for the background worker (see core.email_queue)
+        enqueue_email(
             subject=subject,
-            body=text_content,
+            text_body=text_content,
+            html_body=html_content,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[user.email]
+            to=[user.email],
+            category='welcome'
         )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
         
-        logger.info(f"Welcome email sent to {user.email}")
+        logger.info(f"Welcome email queued for {user.email}")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send welcome email to {user.email}: {str(e)}")
+        logger.error(f"Failed to queue welcome email to {user.email}: {str(e)}")
         return False
 
 
@@ -0,0 +1,42 @@
+"""
+Batched viewer state for feed pages.
+
+Feed serializers need per-item viewer data (has the viewer liked this, does
+the viewer follow the author). Resolving those per item costs a query each,
+so feed views compute them for the whole page up front and hand the results
+to the serializers through the serializer context.
+"""
+from .follow_models import get_follow_stats_map
+
+
+def get_liked_ids(like_model, target_field, object_ids, viewer):
+    """Return the subset of object_ids the viewer has liked, in one IN query"""
+    if viewer is None or not viewer.is_authenticated or not object_ids:
+        return set()
+    return set(
+        like_model.objects.filter(
+            user=viewer,
+            **{f'{target_field}_id__in': object_ids}
+        ).values_list(f'{target_field}_id', flat=True)
+    )
+
+
+def build_feed_context(items, like_model, target_field, liked_key, viewer, author_field):
+    """
+    Serializer context entries for a page of feed items.
+
+    Args:
+        items: materialized page of posts/blog posts
+        like_model: Like or BlogLike
+        target_field: FK name on the like model pointing at the item
+        liked_key: context key the item serializer reads liked ids from
+        viewer: requesting user
+        author_field: FK name on the item pointing at its author
+    """
+    object_ids = [item.id for item in items]
+    author_ids = {getattr(item, f'{author_field}_id') for item in items}
+    author_ids.discard(None)
+    return {
+        liked_key: get_liked_ids(like_model, target_field, object_ids, viewer),
+        'follow_stats': get_follow_stats_map(author_ids, viewer),
+    }
@@ -0,0 +1,72 @@
+"""
+Sparse fieldsets for API responses.
+
+    ?fields=id,username,avatar     only the named fields
+    ?expand=stats,portfolio_items  add heavy fields list responses leave out
+
+Serializers opt in with SparseFieldsetMixin and name their heavy fields in
+Meta.expandable_fields. List responses omit expandable fields unless they are
+expanded (or named in ?fields=); detail responses include them. Omitted
+fields are dropped before serialization, so their method fields and nested
+serializers never run and never query.
+
+Only the serializer a view returns reads the query params; serializers nested
+inside it, or built by it for related objects, keep their full
+representation. Writes are never pruned.
+"""
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_field_list(value):
+    """Set of names from a comma-separated query param value"""
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_expansions(request):
+    """Names in ?expand=, e.g. for views deciding which relations to prefetch"""
+    return parse_field_list(request.query_params.get(EXPAND_PARAM))
+
+
+class SparseFieldsetMixin:
+    """Prune ModelSerializer fields from ?fields= and ?expand=; see the module docstring"""
+
+    def _get_fieldset(self):
+        """(only, expand, is_list) for the response serializer, or None when not applicable"""
+        if hasattr(self, '_fieldset'):
+            return self._fieldset
+        self._fieldset = None
+
+        request = self.context.get('request')
+        view = self.context.get('view')
+        if request is None or view is None or request.method not in ('GET', 'HEAD'):
+            return None
+        is_list = isinstance(self.parent, serializers.ListSerializer)
+        top_level = self.parent is None or (is_list and self.parent.parent is None)
+        if not top_level or not hasattr(view, 'get_serializer_class') or not isinstance(self, view.get_serializer_class()):
+            return None
+
+        params = request.query_params
+        only = parse_field_list(params.get(FIELDS_PARAM)) or None
+        self._fieldset = (only, parse_field_list(params.get(EXPAND_PARAM)), is_list)
+        return self._fieldset
+
+    def includes(self, name):
+        """Whether a field, or a computed part of the representation, should be produced"""
+        fieldset = self._get_fieldset()
+        if fieldset is None:
+            return True
+        only, expand, is_list = fieldset
+        if only is not None:
+            return name in only
+        return not (is_list and name in getattr(self.Meta, 'expandable_fields', ()) and name not in expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self._get_fieldset() is None:
+            return fields
+        return {name: field for name, field in fields.items() if self.includes(name)}
@@ -51,41 +51,6 @@ class Follow(models.Model):
         return f"{self.follower.username} follows {self.followed.username}"
 
 
-class FollowNotification(models.Model):
-    """Model for storing follow notifications"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    follow = models.OneToOneField(
-        Follow, 
-        on_delete=models.CASCADE, 
-        related_name='notification'
-    )
-    recipient = models.ForeignKey(
-        User, 
-        on_delete=models.CASCADE, 
-        related_name='follow_notifications'
-    )
-    is_read = models.BooleanField(default=False)
-    read_at = models.DateTimeField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        indexes = [
-            models.Index(fields=['recipient', 'is_read', 'created_at']),
-            models.Index(fields=['created_at']),
-        ]
-        ordering = ['-created_at']
-    
-    def mark_as_read(self):
-        """Mark notification as read"""
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
-    
-    def __str__(self):
-        return f"Follow notification: {self.follow.follower.username} → {self.recipient.username}"
-
-
 # Add methods to User model via monkey patching
 def get_followers_count(self):
     """Get the number of followers for this user"""
@@ -169,6 +134,45 @@ def unfollow(self, user):
     except Follow.DoesNotExist:
         return False
 
+def get_follow_stats_map(user_ids, viewer=None):
+    """
+    Follow counts and viewer follow state for many users in at most three queries.
+    
+    Returns {user_id: {'followers_count', 'following_count', 'is_following'}},
+    the same values the per-user methods above compute one row at a time.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    
+    followers = dict(
+        Follow.objects.filter(followed_id__in=user_ids, is_active=True)
+        .order_by().values('followed_id').annotate(total=models.Count('id'))
+        .values_list('followed_id', 'total')
+    )
+    following = dict(
+        Follow.objects.filter(follower_id__in=user_ids, is_active=True)
+        .order_by().values('follower_id').annotate(total=models.Count('id'))
+        .values_list('follower_id', 'total')
+    )
+    
+    followed_by_viewer = set()
+    if viewer is not None and viewer.is_authenticated:
+        followed_by_viewer = set(
+            Follow.objects.filter(follower=viewer, followed_id__in=user_ids, is_active=True)
+            .values_list('followed_id', flat=True)
+        )
+    
+    return {
+        user_id: {
+            'followers_count': followers.get(user_id, 0),
+            'following_count': following.get(user_id, 0),
+            'is_following': user_id in followed_by_viewer and user_id != viewer.id,
+        }
+        for user_id in user_ids
+    }
+
+
 # Attach methods to User model
 User.add_to_class('get_followers_count', get_followers_count)
 User.add_to_class('get_following_count', get_following_count)
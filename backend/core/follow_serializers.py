@@ -2,7 +2,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .follow_models import Follow, FollowNotification
+from .follow_models import Follow
+from .models import Notification
 
 
 class UserBasicSerializer(serializers.ModelSerializer):
@@ -96,14 +97,19 @@ class FollowStatsSerializer(serializers.Serializer):
 
 
 class FollowNotificationSerializer(serializers.ModelSerializer):
-    """Serializer for follow notifications"""
-    follower = UserBasicSerializer(source='follow.follower', read_only=True)
-    follow_date = serializers.DateTimeField(source='follow.created_at', read_only=True)
+    """Serializer for follow notifications stored in the main Notification table"""
+    follower = UserBasicSerializer(source='actor', read_only=True)
+    follow_date = serializers.DateTimeField(source='created_at', read_only=True)
+    read_at = serializers.SerializerMethodField()
     
     class Meta:
-        model = FollowNotification
-        fields = ['id', 'follower', 'follow_date', 'is_read', 'read_at', 'created_at']
-        read_only_fields = ['id', 'created_at', 'read_at']
+        model = Notification
+        fields = ['id', 'follower', 'follow_date', 'is_read', 'read_at', 'created_at', 'actor_count']
+        read_only_fields = ['id', 'created_at', 'actor_count']
+    
+    def get_read_at(self, obj):
+        """Notifications do not track a separate read time; the last update is it"""
+        return obj.updated_at if obj.is_read else None
 
 
 class FollowListSerializer(serializers.ModelSerializer):
@@ -23,7 +23,7 @@ urlpatterns = [
     
     # Follow notifications
     path('notifications/', follow_views.FollowNotificationListView.as_view(), name='follow-notifications'),
-    path('notifications/<uuid:notification_id>/read/', follow_views.mark_follow_notification_read, name='mark-notification-read'),
+    path('notifications/<int:notification_id>/read/', follow_views.mark_follow_notification_read, name='mark-notification-read'),
     path('notifications/read-all/', follow_views.mark_all_follow_notifications_read, name='mark-all-notifications-read'),
     
     # Follow suggestions and search
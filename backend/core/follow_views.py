@@ -9,10 +9,10 @@ from django.contrib.auth.models import User
 from django.db.models import Q, Prefetch
 from django.db import models
 from django.utils import timezone
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
-from .follow_models import Follow, FollowNotification
+from .follow_models import Follow
+from .models import Notification
+from .notification_utils import create_follow_notification
 from .follow_serializers import (
     FollowSerializer,
     FollowCreateSerializer,
@@ -92,14 +92,10 @@ class FollowToggleView(generics.GenericAPIView):
                 follow_rel.save()
                 state_changed = True
             
-            # Handle notifications only if state changed to following
-            if follow and state_changed:
+            # Notify on a new follow or a re-follow, never on a repeated request
+            if follow and (created or state_changed):
                 try:
-                    notification, _ = FollowNotification.objects.get_or_create(
-                        follow=follow_rel,
-                        recipient=target_user
-                    )
-                    self.send_follow_notification(follow_rel)
+                    create_follow_notification(request.user, target_user)
                 except Exception as notification_error:
                     logger.warning(f"Failed to create notification: {notification_error}")
             
@@ -135,39 +131,6 @@ class FollowToggleView(generics.GenericAPIView):
             return Response({
                 "error": "An unexpected error occurred"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def send_follow_notification(self, follow_obj):
-        """Send real-time follow notification via WebSocket"""
-        try:
-            channel_layer = get_channel_layer()
-            
-            # Send notification to the followed user
-            async_to_sync(channel_layer.group_send)(
-                f"user_{follow_obj.followed.id}",
-                {
-                    'type': 'follow_notification',
-                    'follower': {
-                        'id': follow_obj.follower.id,
-                        'username': follow_obj.follower.username,
-                        'full_name': f"{follow_obj.follower.first_name} {follow_obj.follower.last_name}".strip() or follow_obj.follower.username,
-                        'profile_picture': self.get_user_profile_picture(follow_obj.follower)
-                    },
-                    'message': f'{follow_obj.follower.username} started following you',
-                    'timestamp': follow_obj.created_at.isoformat(),
-                    'follow_id': str(follow_obj.id)
-                }
-            )
-        except Exception as e:
-            logger.warning(f"Failed to send WebSocket notification: {e}")
-    
-    def get_user_profile_picture(self, user):
-        """Get user profile picture URL"""
-        try:
-            if hasattr(user, 'profile') and user.profile.profile_picture:
-                return user.profile.profile_picture
-        except Exception as e:
-            logger.debug(f"Error getting profile picture: {e}")
-        return None
 
 
 # Legacy endpoints for backward compatibility
@@ -275,61 +238,49 @@ class FollowNotificationListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        """Get notifications for current user"""
-        return FollowNotification.objects.filter(
-            recipient=self.request.user
-        ).select_related('follow__follower').order_by('-created_at')
+        """Follow notifications for current user from the main notification table"""
+        return Notification.objects.filter(
+            user=self.request.user,
+            verb='follow'
+        ).select_related('actor').order_by('-created_at')
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_follow_notification_read(request, notification_id):
     """Mark a follow notification as read"""
-    try:
-        notification = get_object_or_404(
-            FollowNotification,
-            id=notification_id,
-            recipient=request.user
-        )
-        
-        notification.mark_as_read()
-        
+    notifications = Notification.objects.filter(
+        id=notification_id,
+        user=request.user,
+        verb='follow'
+    )
+    if not notifications.exists():
         return Response({
-            'status': 'success',
-            'message': 'Notification marked as read'
-        })
+            'error': 'Notification not found'
+        }, status=status.HTTP_404_NOT_FOUND)
     
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    notifications.filter(is_read=False).update(is_read=True, updated_at=timezone.now())
+    
+    return Response({
+        'status': 'success',
+        'message': 'Notification marked as read'
+    })
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_all_follow_notifications_read(request):
-    """Mark all follow notifications as read for current user"""
-    try:
-        notifications = FollowNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        )
-        
-        count = notifications.count()
-        for notification in notifications:
-            notification.mark_as_read()
-        
-        return Response({
-            'status': 'success',
-            'message': f'Marked {count} notifications as read'
-        })
+    """Mark all follow notifications as read for current user in one UPDATE"""
+    count = Notification.objects.filter(
+        user=request.user,
+        verb='follow',
+        is_read=False
+    ).update(is_read=True, updated_at=timezone.now())
     
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return Response({
+        'status': 'success',
+        'message': f'Marked {count} notifications as read'
+    })
 
 
 @api_view(['GET'])
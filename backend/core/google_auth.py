@@ -3,15 +3,16 @@ Google OAuth2 Authentication for VikraHub
 """
 import os
 import logging
+import requests
 from django.contrib.auth.models import User
 from django.contrib.auth import login
+from django.db import transaction
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from .google_certs import verify_google_id_token
 from .models import UserProfile
 from .serializers import UserProfileSerializer
 
@@ -25,6 +26,52 @@ def get_tokens_for_user(user):
         'access': str(refresh.access_token),
     }
 
+def get_or_create_google_user(email, first_name, last_name, picture, email_verified=False):
+    """
+    Find or create the user for a verified Google identity in one transaction
+    
+    Profile and name changes are written with single UPDATE statements so an
+    existing user's login does not re-run the profile signals.
+    Returns (user, profile, created).
+    """
+    with transaction.atomic():
+        user, created = User.objects.select_related('userprofile').get_or_create(
+            email=email,
+            defaults={
+                'username': email,  # Use email as username
+                'first_name': first_name,
+                'last_name': last_name,
+                'is_active': True,
+            }
+        )
+        
+        if created:
+            # The post_save signal created the profile and marked the account
+            # pending email verification; Google has already verified it
+            user.is_active = bool(email_verified)
+            if email_verified:
+                User.objects.filter(pk=user.pk).update(is_active=True)
+            profile = UserProfile.objects.get(user=user)
+            if picture:
+                UserProfile.objects.filter(pk=profile.pk).update(avatar=picture)
+                profile.avatar = picture
+            return user, profile, created
+        
+        if user.first_name != first_name or user.last_name != last_name:
+            User.objects.filter(pk=user.pk).update(first_name=first_name, last_name=last_name)
+            user.first_name, user.last_name = first_name, last_name
+        
+        try:
+            profile = user.userprofile
+            # Update avatar if available and not already set
+            if picture and not profile.avatar:
+                UserProfile.objects.filter(pk=profile.pk).update(avatar=picture)
+                profile.avatar = picture
+        except UserProfile.DoesNotExist:
+            profile = UserProfile.objects.create(user=user, avatar=picture, user_type='client')
+    
+    return user, profile, created
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def google_auth(request):
@@ -50,21 +97,11 @@ def google_auth(request):
             )
 
         try:
-            # Verify token with Google
-            idinfo = id_token.verify_oauth2_token(
-                id_token_string, 
-                requests.Request(), 
-                client_id
-            )
-
-            # Verify token issuer
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                raise ValueError('Wrong issuer.')
+            # Verify token against cached Google certificates
+            idinfo = verify_google_id_token(id_token_string, client_id)
 
             # Extract user information
-            google_id = idinfo['sub']
             email = idinfo.get('email')
-            name = idinfo.get('name', '')
             first_name = idinfo.get('given_name', '')
             last_name = idinfo.get('family_name', '')
             picture = idinfo.get('picture', '')
@@ -77,55 +114,16 @@ def google_auth(request):
 
             logger.info(f"Google auth attempt for email: {email}")
 
-            # Check if user exists or create new user
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    'username': email,  # Use email as username
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'is_active': True,
-                }
+            user, profile, created = get_or_create_google_user(
+                email, first_name, last_name, picture, email_verified=idinfo.get('email_verified', False)
             )
-
-            if created:
-                logger.info(f"Created new user: {email}")
-                # Create user profile
-                profile, profile_created = UserProfile.objects.get_or_create(
-                    user=user,
-                    defaults={
-                        'avatar': picture,
-                        'user_type': 'client',  # Default to client
-                    }
-                )
-                logger.info(f"Created user profile for: {email}")
-            else:
-                logger.info(f"Existing user logged in: {email}")
-                # Update user info if needed
-                if user.first_name != first_name or user.last_name != last_name:
-                    user.first_name = first_name
-                    user.last_name = last_name
-                    user.save()
-
-                # Update avatar if available and not already set
-                try:
-                    profile = user.userprofile
-                    if picture and not profile.avatar:
-                        profile.avatar = picture
-                        profile.save()
-                except UserProfile.DoesNotExist:
-                    # Create profile if it doesn't exist
-                    profile = UserProfile.objects.create(
-                        user=user,
-                        avatar=picture,
-                        user_type='client'
-                    )
+            logger.info(f"{'Created new' if created else 'Existing'} user logged in with Google: {email}")
 
             # Generate JWT tokens
             tokens = get_tokens_for_user(user)
 
             # Serialize user profile data
-            profile_serializer = UserProfileSerializer(user.userprofile)
+            profile_serializer = UserProfileSerializer(profile)
 
             return Response({
                 'success': True,
@@ -142,6 +140,12 @@ def google_auth(request):
                 'created': created
             }, status=status.HTTP_200_OK)
 
+        except requests.RequestException as e:
+            logger.error(f"Google certificates unavailable: {str(e)}")
+            return Response(
+                {'error': 'Google authentication temporarily unavailable'}, 
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
         except ValueError as e:
             logger.error(f"Invalid Google token: {str(e)}")
             return Response(
@@ -0,0 +1,137 @@
+"""
+Local stand-in for Google's certificate endpoint and ID-token issuer.
+
+Generates RSA keys with self-signed certificates, serves them as the
+{key id: PEM} JSON document Google publishes (with a configurable
+Cache-Control max-age), and signs ID tokens with them. Requests are counted
+so cache hits can be checked.
+
+    with LocalGoogleCertServer() as server:
+        with mock.patch('core.google_certs.GOOGLE_CERTS_URL', server.url):
+            token = server.sign_id_token({'email': 'a@example.com'}, audience='client-id')
+            ...
+        server.request_count
+
+Call rotate_key() to publish a new signing key, and set `fail_next` to
+answer that many upcoming requests with a 503.
+"""
+import datetime
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _generate_key():
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'local-google-stub')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode('ascii')
+    certificate_pem = certificate.public_bytes(serialization.Encoding.PEM).decode('ascii')
+    return private_pem, certificate_pem
+
+
+class _CertHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server.owner
+        with server.lock:
+            server.request_count += 1
+            failing = server.fail_next > 0
+            if failing:
+                server.fail_next -= 1
+            body = json.dumps(server.certs).encode('utf-8')
+
+        if failing:
+            self.send_response(503)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Cache-Control', f'public, max-age={server.max_age}, must-revalidate')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalGoogleCertServer:
+    """Threaded in-process certificate server bound to an ephemeral localhost port"""
+
+    def __init__(self, host='127.0.0.1', port=0, max_age=3600):
+        self.lock = threading.Lock()
+        self.max_age = max_age
+        self.request_count = 0
+        self.fail_next = 0
+        self.keys = {}
+        self.certs = {}
+        self.rotate_key()
+        self._server = ThreadingHTTPServer((host, port), _CertHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.host, self.port = self._server.server_address
+        self.url = f'http://{self.host}:{self.port}/oauth2/v1/certs'
+        self._thread = None
+
+    def rotate_key(self):
+        """Publish a new signing key (kept alongside the old ones) and return its key id"""
+        private_pem, certificate_pem = _generate_key()
+        key_id = uuid.uuid4().hex
+        with self.lock:
+            self.keys[key_id] = private_pem
+            self.certs[key_id] = certificate_pem
+            self.current_key_id = key_id
+        return key_id
+
+    def sign_id_token(self, claims, audience, key_id=None, issuer='https://accounts.google.com', lifetime=3600):
+        """An ID token shaped like Google's, signed with one of the served keys"""
+        from google.auth import crypt, jwt
+
+        key_id = key_id or self.current_key_id
+        now = int(time.time())
+        payload = {
+            'iss': issuer,
+            'aud': audience,
+            'sub': claims.get('sub', uuid.uuid4().hex),
+            'iat': now,
+            'exp': now + lifetime,
+            'email_verified': True,
+        }
+        payload.update(claims)
+        signer = crypt.RSASigner.from_string(self.keys[key_id], key_id=key_id)
+        return jwt.encode(signer, payload).decode('ascii')
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,139 @@
+"""
+Cached verification of Google ID tokens.
+
+google.oauth2.id_token.verify_oauth2_token() downloads Google's signing
+certificates on every call. Here they are fetched over a pooled session,
+kept for the max-age Google sends in Cache-Control and shared across workers
+through the Django cache, with a process-local copy in front of it.
+
+Within GOOGLE_CERTS_REFRESH_AHEAD seconds of expiry the cached set is still
+served while one background refresh (guarded by a cache lock) fetches the
+next one. If Google cannot be reached, the previous set keeps being used for
+GOOGLE_CERTS_STALE_GRACE seconds past its expiry. A token signed with an
+unknown key id forces a refresh, at most once per
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL, so key rotation is picked up promptly.
+"""
+import base64
+import json
+import logging
+import re
+import threading
+import time
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = getattr(settings, 'GOOGLE_OAUTH2_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+GOOGLE_CERTS_DEFAULT_MAX_AGE = getattr(settings, 'GOOGLE_CERTS_DEFAULT_MAX_AGE', 3600)
+GOOGLE_CERTS_REFRESH_AHEAD = getattr(settings, 'GOOGLE_CERTS_REFRESH_AHEAD', 300)
+GOOGLE_CERTS_STALE_GRACE = getattr(settings, 'GOOGLE_CERTS_STALE_GRACE', 3600)
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL = getattr(settings, 'GOOGLE_CERTS_MIN_REFRESH_INTERVAL', 60)
+GOOGLE_CERTS_FETCH_TIMEOUT = getattr(settings, 'GOOGLE_CERTS_FETCH_TIMEOUT', 5)
+GOOGLE_TOKEN_CLOCK_SKEW = getattr(settings, 'GOOGLE_TOKEN_CLOCK_SKEW', 10)
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+CERTS_CACHE_KEY = 'google:oauth2:certs'
+REFRESH_LOCK_KEY = 'google:oauth2:certs:refresh'
+
+_session = requests.Session()
+_local = {'entry': None}
+
+
+def parse_max_age(cache_control):
+    match = re.search(r'max-age=(\d+)', cache_control or '')
+    return int(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE
+
+
+def fetch_certs():
+    """Download the current certificates and publish them to both cache tiers"""
+    response = _session.get(GOOGLE_CERTS_URL, timeout=GOOGLE_CERTS_FETCH_TIMEOUT)
+    response.raise_for_status()
+    max_age = parse_max_age(response.headers.get('Cache-Control'))
+    now = time.time()
+    entry = {'certs': response.json(), 'fetched_at': now, 'expires_at': now + max_age}
+    cache.set(CERTS_CACHE_KEY, entry, max_age + GOOGLE_CERTS_STALE_GRACE)
+    _local['entry'] = entry
+    logger.info(f"Fetched {len(entry['certs'])} Google signing certificates (max-age {max_age}s)")
+    return entry
+
+
+def _cached_entry(now):
+    """Newest known entry; the shared cache is consulted once the local copy nears expiry"""
+    entry = _local['entry']
+    if entry is None or now >= entry['expires_at'] - GOOGLE_CERTS_REFRESH_AHEAD:
+        shared = cache.get(CERTS_CACHE_KEY)
+        if shared and (entry is None or shared['fetched_at'] > entry['fetched_at']):
+            _local['entry'] = entry = shared
+    return entry
+
+
+def _refresh_in_background():
+    # Only one worker refreshes at a time; the rest keep serving the cached set
+    if not cache.add(REFRESH_LOCK_KEY, 1, GOOGLE_CERTS_FETCH_TIMEOUT * 2):
+        return
+
+    def refresh():
+        try:
+            fetch_certs()
+        except Exception as e:
+            logger.warning(f"Background refresh of Google certificates failed: {e}")
+        finally:
+            cache.delete(REFRESH_LOCK_KEY)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def get_google_certs(force_refresh=False):
+    """Google's signing certificates keyed by key id, fetched only when needed"""
+    now = time.time()
+    entry = _cached_entry(now)
+
+    if entry and force_refresh and now - entry['fetched_at'] < GOOGLE_CERTS_MIN_REFRESH_INTERVAL:
+        force_refresh = False
+    if entry and not force_refresh and now < entry['expires_at']:
+        if now >= entry['expires_at'] - GOOGLE_CERTS_REFRESH_AHEAD:
+            _refresh_in_background()
+        return entry['certs']
+
+    try:
+        return fetch_certs()['certs']
+    except (requests.RequestException, ValueError) as e:
+        if entry:
+            logger.warning(f"Serving cached Google certificates after fetch failure: {e}")
+            return entry['certs']
+        raise
+
+
+def _key_id(token):
+    try:
+        header = token.split('.')[0] if isinstance(token, str) else token.decode('utf-8').split('.')[0]
+        header += '=' * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(header)).get('kid')
+    except Exception:
+        raise ValueError('Malformed ID token')
+
+
+def verify_google_id_token(token, client_id):
+    """
+    Verify a Google ID token against cached certificates.
+
+    Returns the token claims; raises ValueError for any invalid token.
+    """
+    certs = get_google_certs()
+    if _key_id(token) not in certs:
+        # Google may have rotated keys since the cached set was fetched
+        certs = get_google_certs(force_refresh=True)
+
+    claims = jwt.decode(token, certs=certs, audience=client_id, clock_skew_in_seconds=GOOGLE_TOKEN_CLOCK_SKEW)
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError('Wrong issuer.')
+    return claims
+
+
+def clear_cached_certs():
+    """Forget both cache tiers (tests, or after changing GOOGLE_OAUTH2_CERTS_URL)"""
+    _local['entry'] = None
+    cache.delete(CERTS_CACHE_KEY)
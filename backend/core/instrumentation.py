@@ -0,0 +1,280 @@
+"""
+Per-request instrumentation.
+
+RequestMetricsMiddleware records, per view and action (e.g. PostViewSet/list),
+request counts and total latency for every request, and for a sampled share
+of requests (INSTRUMENTATION_SAMPLE_RATE) the number of DB queries, time spent
+in the database and time spent producing serializer.data. Serializer time
+includes any queries the serializer triggers lazily, so a high serializer
+time next to a high query count usually points at an N+1.
+
+Metrics are kept in process memory and exposed in the Prometheus text format
+at /internal/metrics (staff users, or `Authorization: Bearer
+<INSTRUMENTATION_METRICS_TOKEN>`). Each worker process reports its own
+counters; the scraper sums them.
+
+Sampled requests slower than INSTRUMENTATION_SLOW_REQUEST_MS, or issuing more
+than INSTRUMENTATION_SLOW_QUERY_COUNT queries, are logged with their most
+frequent query fingerprints.
+"""
+import contextvars
+import hmac
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_ENABLED = getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+INSTRUMENTATION_SAMPLE_RATE = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 1.0)
+INSTRUMENTATION_SLOW_REQUEST_MS = getattr(settings, 'INSTRUMENTATION_SLOW_REQUEST_MS', 500)
+INSTRUMENTATION_SLOW_QUERY_COUNT = getattr(settings, 'INSTRUMENTATION_SLOW_QUERY_COUNT', 50)
+INSTRUMENTATION_METRICS_TOKEN = getattr(settings, 'INSTRUMENTATION_METRICS_TOKEN', '')
+# Raw statements kept per sampled request for fingerprinting slow requests
+MAX_RECORDED_QUERIES = 500
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current_sample = contextvars.ContextVar('instrumentation_sample', default=None)
+
+
+# SQL fingerprints
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Normalize a statement so queries differing only in parameters group together"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+# Metric registry
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Process-local counters and histograms keyed by label tuples"""
+
+    HISTOGRAMS = {
+        'vikrahub_request_duration_seconds': ('Total request latency', LATENCY_BUCKETS),
+        'vikrahub_db_queries_per_request': ('DB queries per sampled request', QUERY_COUNT_BUCKETS),
+        'vikrahub_db_duration_seconds': ('DB time per sampled request', LATENCY_BUCKETS),
+        'vikrahub_serializer_duration_seconds': ('Serializer time per sampled request', LATENCY_BUCKETS),
+    }
+    COUNTERS = {
+        'vikrahub_requests_total': 'Requests handled',
+        'vikrahub_slow_requests_total': 'Sampled requests over the slow thresholds',
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {name: Counter() for name in self.COUNTERS}
+            self.histograms = {name: {} for name in self.HISTOGRAMS}
+
+    def inc(self, name, labels, amount=1):
+        with self.lock:
+            self.counters[name][labels] += amount
+
+    def observe(self, name, labels, value):
+        with self.lock:
+            series = self.histograms[name]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(self.HISTOGRAMS[name][1])
+            histogram.observe(value)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self.lock:
+            for name, help_text in self.COUNTERS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for labels, value in sorted(self.counters[name].items()):
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", _format_number(bound)),))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram.count}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+registry = MetricsRegistry()
+
+
+# Per-request sample
+
+class RequestSample:
+    __slots__ = ('query_count', 'db_time', 'serializer_time', 'serializer_depth', 'queries')
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.query_count += 1
+            if len(self.queries) < MAX_RECORDED_QUERIES:
+                self.queries.append(sql)
+
+    def top_fingerprints(self, limit=5):
+        return Counter(fingerprint(sql) for sql in self.queries).most_common(limit)
+
+
+def install_serializer_timing():
+    """Time top-level serializer.data evaluation for the current sampled request"""
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        original = cls.data
+        if getattr(original.fget, '_instrumented', False):
+            continue
+
+        def timed_data(self, _original=original):
+            sample = _current_sample.get()
+            if sample is None:
+                return _original.fget(self)
+            sample.serializer_depth += 1
+            started = time.perf_counter()
+            try:
+                return _original.fget(self)
+            finally:
+                sample.serializer_depth -= 1
+                if sample.serializer_depth == 0:
+                    sample.serializer_time += time.perf_counter() - started
+
+        timed_data._instrumented = True
+        cls.data = property(timed_data)
+
+
+def view_labels(view_func, method):
+    """(view, action) labels for a resolved view"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    name = view_class.__name__ if view_class else getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    return name, actions.get(method.lower(), method.lower())
+
+
+class RequestMetricsMiddleware:
+    """Record request metrics; see the module docstring"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not INSTRUMENTATION_ENABLED or request.path == '/internal/metrics':
+            return self.get_response(request)
+
+        sample = RequestSample() if random.random() < INSTRUMENTATION_SAMPLE_RATE else None
+        request._instrumentation_labels = ('unresolved', request.method.lower())
+        token = _current_sample.set(sample)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if sample is not None:
+                    for connection in connections.all():
+                        stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current_sample.reset(token)
+        duration = time.perf_counter() - started
+
+        self.record(request, response, duration, sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation_labels = view_labels(view_func, request.method)
+
+    def record(self, request, response, duration, sample):
+        view, action = request._instrumentation_labels
+        labels = (('view', view), ('action', action))
+        registry.inc('vikrahub_requests_total', labels + (('method', request.method), ('status', str(response.status_code))))
+        registry.observe('vikrahub_request_duration_seconds', labels, duration)
+        if sample is None:
+            return
+
+        registry.observe('vikrahub_db_queries_per_request', labels, sample.query_count)
+        registry.observe('vikrahub_db_duration_seconds', labels, sample.db_time)
+        registry.observe('vikrahub_serializer_duration_seconds', labels, sample.serializer_time)
+
+        if duration * 1000 >= INSTRUMENTATION_SLOW_REQUEST_MS or sample.query_count > INSTRUMENTATION_SLOW_QUERY_COUNT:
+            registry.inc('vikrahub_slow_requests_total', labels)
+            fingerprints = '; '.join(f'{count}x {sql[:200]}' for sql, count in sample.top_fingerprints())
+            logger.warning(
+                f"Slow request {request.method} {request.path} view={view} action={action} "
+                f"status={response.status_code} total_ms={duration * 1000:.1f} queries={sample.query_count} "
+                f"db_ms={sample.db_time * 1000:.1f} serializer_ms={sample.serializer_time * 1000:.1f} "
+                f"top_queries=[{fingerprints}]"
+            )
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint for this worker's metrics"""
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    token_ok = bool(INSTRUMENTATION_METRICS_TOKEN) and hmac.compare_digest(
+        authorization.encode('utf-8'), f'Bearer {INSTRUMENTATION_METRICS_TOKEN}'.encode('utf-8')
+    )
+    user = getattr(request, 'user', None)
+    if not token_ok and not (user and user.is_authenticated and user.is_staff):
+        return HttpResponseForbidden('Forbidden')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,83 @@
+"""
+Fast JSON encoding for API responses, request bodies and WebSocket frames.
+
+Uses orjson when it is installed and the standard library otherwise, so the
+output is the same JSON either way. Values orjson does not handle natively
+(Decimal, lazy translation strings, timedeltas, querysets, ...) and
+datetimes go through DRF's JSONEncoder, so responses keep the formats the
+stock JSONRenderer produced. Anything orjson rejects outright (e.g. integers
+beyond 64 bits) is retried with the standard library.
+"""
+import json
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_CODEC_USE_ORJSON = getattr(settings, 'JSON_CODEC_USE_ORJSON', True) and orjson is not None
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Valid JSON but not valid JavaScript; escaped like DRF's JSONRenderer does
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def dumps_bytes(obj):
+    """Compact UTF-8 encoded JSON"""
+    if JSON_CODEC_USE_ORJSON:
+        try:
+            return orjson.dumps(obj, default=_encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return _encoder.encode(obj).encode('utf-8')
+
+
+def dumps(obj):
+    """Compact JSON as str, e.g. for WebSocket text frames"""
+    return dumps_bytes(obj).decode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from str or bytes; errors are json.JSONDecodeError (or a subclass)"""
+    if JSON_CODEC_USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer encoding through json_codec; indented output falls back to the stock renderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps_bytes(data)
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser decoding through json_codec"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding)
+            return loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
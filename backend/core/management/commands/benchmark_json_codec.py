@@ -0,0 +1,118 @@
+"""
+Compare the stock DRF JSON renderer/parser and json.dumps with core.json_codec
+on the heaviest API payloads and on WebSocket message frames.
+
+Payloads are fetched once from the current database through the real views,
+as the participant of the largest conversation, then encoded and decoded
+--repeats times with each codec. Run it against production-scale data, e.g.
+after generate_synthetic_data.
+
+    python manage.py benchmark_json_codec --repeats 200
+"""
+import json
+import time
+from io import BytesIO
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.urls import resolve, reverse
+from rest_framework import parsers, renderers
+from rest_framework.test import APIRequestFactory, force_authenticate
+from core import json_codec
+from core.management.commands.load_test_timeline import percentile
+from messaging.models import Conversation
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the stock DRF JSON codec against core.json_codec on the heaviest endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeats', type=int, default=100, help='Encodes/decodes timed per payload and codec')
+        parser.add_argument('--page-size', type=int, default=100, help='page_size query param for paginated lists')
+
+    def handle(self, *args, **options):
+        conversation = Conversation.objects.annotate(message_total=Count('messages')).order_by('-message_total').first()
+        if conversation is None or not conversation.message_total:
+            raise CommandError('No conversations with messages; run generate_synthetic_data first')
+        self.viewer = conversation.participants.first()
+        self.factory = APIRequestFactory()
+        self.host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        query = {'page_size': options['page_size']}
+
+        endpoints = [
+            ('public profiles', reverse('publicuserprofile-list'), query),
+            ('blog all posts', reverse('blogpost-all-posts'), {}),
+            ('creative assets', reverse('creativeasset-list'), query),
+            ('conversations', reverse('messaging:conversation-list-api'), query),
+            ('conversation history', reverse('messaging:message-list-create',
+                                              kwargs={'conversation_id': conversation.id}), query),
+        ]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'JSON codec benchmark (orjson {"enabled" if json_codec.JSON_CODEC_USE_ORJSON else "unavailable"}), '
+            f'{options["repeats"]} repeats, p50 ms'
+        ))
+        self.stdout.write(f'  {"payload":<22} {"bytes":>9}  {"render":>8} {"fast":>8} {"x":>5}  '
+                          f'{"parse":>8} {"fast":>8} {"x":>5}')
+        for name, path, params in endpoints:
+            data = self._fetch(path, params)
+            if data is None:
+                self.stdout.write(f'  {name:<22} skipped (request failed)')
+                continue
+            self._compare_drf(name, data, options['repeats'])
+
+        history = self._fetch(endpoints[-1][1], query)
+        messages = history.get('results', history) if isinstance(history, dict) else history
+        if messages:
+            self._compare_frames(messages, options['repeats'])
+
+    def _fetch(self, path, params):
+        request = self.factory.get(path, params, HTTP_HOST=self.host)
+        force_authenticate(request, user=self.viewer)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            return None
+        return response.data
+
+    def _time(self, func, repeats):
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return percentile(samples, 50)
+
+    def _row(self, name, size, encode, fast_encode, decode, fast_decode):
+        self.stdout.write(
+            f'  {name:<22} {size:9d}  {encode:8.3f} {fast_encode:8.3f} {encode / max(fast_encode, 1e-9):5.1f}  '
+            f'{decode:8.3f} {fast_decode:8.3f} {decode / max(fast_decode, 1e-9):5.1f}'
+        )
+
+    def _compare_drf(self, name, data, repeats):
+        stock_renderer, fast_renderer = renderers.JSONRenderer(), json_codec.FastJSONRenderer()
+        stock_parser, fast_parser = parsers.JSONParser(), json_codec.FastJSONParser()
+        body = stock_renderer.render(data, 'application/json', {})
+        fast_body = fast_renderer.render(data, 'application/json', {})
+        if json.loads(body) != json.loads(fast_body):
+            self.stderr.write(self.style.WARNING(f'{name}: codecs produced different documents'))
+
+        self._row(
+            name, len(fast_body),
+            self._time(lambda: stock_renderer.render(data, 'application/json', {}), repeats),
+            self._time(lambda: fast_renderer.render(data, 'application/json', {}), repeats),
+            self._time(lambda: stock_parser.parse(BytesIO(body)), repeats),
+            self._time(lambda: fast_parser.parse(BytesIO(body)), repeats),
+        )
+
+    def _compare_frames(self, messages, repeats):
+        # What ChatConsumer/MessagingConsumer send per event and receive per frame
+        frames = [{'type': 'new_message', 'message': message} for message in messages]
+        texts = [json.dumps(frame, default=str) for frame in frames]
+        self._row(
+            'websocket frames', sum(len(text) for text in texts),
+            self._time(lambda: [json.dumps(frame, default=str) for frame in frames], repeats),
+            self._time(lambda: [json_codec.dumps(frame) for frame in frames], repeats),
+            self._time(lambda: [json.loads(text) for text in texts], repeats),
+            self._time(lambda: [json_codec.loads(text) for text in texts], repeats),
+        )
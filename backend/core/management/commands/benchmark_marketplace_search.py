@@ -0,0 +1,157 @@
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from core.models import FreelancerProfile, Project, ProjectCategory, Skill, UserProfile
+from core.marketplace_utils import filter_by_skills, rank_freelancers_for_project
+from core.management.commands.load_test_timeline import percentile
+
+SKILL_POOL = [
+    'python', 'django', 'react', 'javascript', 'typescript', 'node.js', 'postgresql', 'aws', 'docker',
+    'graphic design', 'logo design', 'ui/ux design', 'illustration', 'photography', 'photo editing',
+    'video editing', 'copywriting', 'translation', 'seo', 'social media', 'data analysis', 'excel',
+    'flutter', 'kotlin', 'swift', 'wordpress', 'animation', 'music production', 'voice over', 'marketing',
+]
+
+
+class RollbackBenchmark(Exception):
+    """Raised to discard the synthetic data once measurements are taken"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark marketplace project/freelancer search against synthetic data (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=100000, help='Synthetic projects to create')
+        parser.add_argument('--freelancers', type=int, default=5000, help='Synthetic freelancer profiles')
+        parser.add_argument('--skills-per-row', type=int, default=4, help='Skills per project/freelancer')
+        parser.add_argument('--queries', type=int, default=50, help='Searches to time per scenario')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--keep', action='store_true', help='Commit the synthetic data instead of rolling back')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                self._measure(options)
+                if not options['keep']:
+                    raise RollbackBenchmark()
+        except RollbackBenchmark:
+            self.stdout.write('Synthetic data rolled back')
+
+    def _seed(self, options):
+        run_tag = f'mb{int(time.time())}'
+        per_row = min(options['skills_per_row'], len(SKILL_POOL))
+
+        Skill.objects.bulk_create([Skill(name=name) for name in SKILL_POOL], ignore_conflicts=True)
+        skill_ids = dict(Skill.objects.filter(name__in=SKILL_POOL).values_list('name', 'id'))
+        category = ProjectCategory.objects.create(name=f'{run_tag} benchmark')
+
+        self.stdout.write(f'Creating {options["freelancers"]} freelancers...')
+        User.objects.bulk_create(
+            [User(username=f'{run_tag}_{i}', email=f'{run_tag}_{i}@example.com') for i in range(options['freelancers'])],
+            batch_size=1000
+        )
+        user_ids = list(User.objects.filter(username__startswith=f'{run_tag}_').values_list('id', flat=True))
+        user_skills = {user_id: random.sample(SKILL_POOL, per_row) for user_id in user_ids}
+        UserProfile.objects.bulk_create([
+            UserProfile(user_id=user_id, user_type='freelancer', skills=', '.join(skills))
+            for user_id, skills in user_skills.items()
+        ], batch_size=1000, ignore_conflicts=True)
+        FreelancerProfile.objects.bulk_create([
+            FreelancerProfile(
+                user_id=user_id, title='Freelancer', availability='Full-time', skill_level='expert',
+                hourly_rate=Decimal(random.randint(5, 150)), rating=Decimal(random.randint(0, 500)) / 100,
+            )
+            for user_id in user_ids
+        ], batch_size=1000)
+        links = FreelancerProfile.skills.through
+        links.objects.bulk_create([
+            links(freelancerprofile_id=profile_id, skill_id=skill_ids[name])
+            for profile_id, user_id in FreelancerProfile.objects.filter(user_id__in=user_ids).values_list('id', 'user_id')
+            for name in user_skills[user_id]
+        ], batch_size=5000)
+
+        self.stdout.write(f'Creating {options["projects"]} projects...')
+        client_id = user_ids[0]
+        statuses = ['open'] * 6 + ['in_progress', 'completed', 'cancelled']
+        batch_size = 5000
+        links = Project.skills.through
+        for start in range(0, options['projects'], batch_size):
+            count = min(batch_size, options['projects'] - start)
+            rows = []
+            row_skills = []
+            for i in range(count):
+                skills = random.sample(SKILL_POOL, per_row)
+                budget = random.randint(50, 5000)
+                row_skills.append(skills)
+                rows.append(Project(
+                    title=f'{run_tag} project {start + i}', description='Synthetic project', client_id=client_id,
+                    category=category, budget_type='fixed', budget_min=Decimal(budget),
+                    budget_max=Decimal(budget * 2), required_skills=', '.join(skills),
+                    experience_level='intermediate', status=random.choice(statuses),
+                ))
+            created = Project.objects.bulk_create(rows)
+            if created[0].pk is None:
+                # Backends that do not return primary keys from bulk inserts
+                created = list(Project.objects.filter(title__startswith=f'{run_tag} project ').order_by('-pk')[:count])[::-1]
+            links.objects.bulk_create([
+                links(project_id=project.pk, skill_id=skill_ids[name])
+                for project, skills in zip(created, row_skills) for name in skills
+            ], batch_size=5000)
+        self.category = category
+
+    def _time(self, build):
+        samples = []
+        queries = 0
+        for _ in range(self.options['queries']):
+            skill = random.choice(SKILL_POOL)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                list(build(skill))
+                samples.append((time.perf_counter() - started) * 1000)
+            queries += len(captured)
+        return samples, queries / max(1, len(samples))
+
+    def _report(self, label, samples, queries):
+        self.stdout.write(
+            f'  {label:<34} p50 {percentile(samples, 50):8.2f} ms  p95 {percentile(samples, 95):8.2f} ms  '
+            f'queries/search {queries:.1f}'
+        )
+
+    def _measure(self, options):
+        self.options = options
+        open_projects = Project.objects.filter(status='open')
+        freelancers = FreelancerProfile.objects.filter(is_available=True)
+        scenarios = [
+            ('projects: icontains (before)',
+             lambda skill: open_projects.filter(required_skills__icontains=skill).order_by('-created_at')[:20]),
+            ('projects: normalized skills',
+             lambda skill: filter_by_skills(open_projects, skill).order_by('-created_at')[:20]),
+            ('projects: skills + budget range',
+             lambda skill: filter_by_skills(open_projects, skill).filter(
+                 budget_min__gte=500, budget_max__lte=6000).order_by('-created_at')[:20]),
+            ('freelancers: icontains (before)',
+             lambda skill: freelancers.filter(user__userprofile__skills__icontains=skill).order_by('-rating', '-created_at')[:20]),
+            ('freelancers: normalized skills',
+             lambda skill: filter_by_skills(freelancers, skill).order_by('-rating', '-created_at')[:20]),
+        ]
+
+        self.stdout.write(self.style.SUCCESS('Marketplace search benchmark results'))
+        for label, build in scenarios:
+            self._report(label, *self._time(build))
+
+        sample_projects = list(open_projects.filter(category=self.category).order_by('?')[:options['queries']])
+        ranking = []
+        for project in sample_projects:
+            started = time.perf_counter()
+            list(rank_freelancers_for_project(project)[:20])
+            ranking.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'  {"ranked freelancer matches":<34} p50 {percentile(ranking, 50):8.2f} ms  '
+            f'p95 {percentile(ranking, 95):8.2f} ms'
+        )
@@ -0,0 +1,126 @@
+import random
+import statistics
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from core.follow_models import Follow
+from core.models import Post
+from core.api_views import home_feed
+from core import timeline_utils
+
+
+class RollbackLoadTest(Exception):
+    """Raised to discard the synthetic data once measurements are taken"""
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Load-test home timeline fan-out and reads against synthetic users (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000, help='Synthetic users to create')
+        parser.add_argument('--follows', type=int, default=50, help='Accounts each user follows')
+        parser.add_argument('--celebrities', type=int, default=3, help='High-follower accounts (fan-out-on-read)')
+        parser.add_argument('--posts', type=int, default=500, help='Posts published by normal accounts')
+        parser.add_argument('--reads', type=int, default=300, help='Feed page reads to time')
+        parser.add_argument('--page-size', type=int, default=20, help='Feed page size')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--keep', action='store_true', help='Commit the synthetic data instead of rolling back')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        try:
+            with transaction.atomic():
+                self._run(options)
+                if not options['keep']:
+                    raise RollbackLoadTest()
+        except RollbackLoadTest:
+            self.stdout.write('Synthetic data rolled back')
+        cache.delete(timeline_utils.HIGH_FOLLOWER_CACHE_KEY)
+
+    def _run(self, options):
+        user_count = options['users']
+        celebrity_count = min(options['celebrities'], user_count)
+
+        self.stdout.write(f'Creating {user_count} users...')
+        run_tag = f'lt{int(time.time())}'
+        User.objects.bulk_create(
+            [User(username=f'{run_tag}_{i}', email=f'{run_tag}_{i}@example.com') for i in range(user_count)],
+            batch_size=1000
+        )
+        user_ids = list(User.objects.filter(username__startswith=f'{run_tag}_').values_list('id', flat=True))
+        celebrity_ids = user_ids[:celebrity_count]
+        normal_ids = user_ids[celebrity_count:]
+
+        self.stdout.write('Creating follow graph...')
+        follows = []
+        for user_id in user_ids:
+            targets = set(random.sample(normal_ids, min(options['follows'], len(normal_ids))))
+            targets.update(celebrity_ids)
+            targets.discard(user_id)
+            follows.extend(Follow(follower_id=user_id, followed_id=target) for target in targets)
+        Follow.objects.bulk_create(follows, batch_size=5000)
+
+        # Make sure every celebrity crosses the fan-out threshold for this run
+        original_threshold = timeline_utils.TIMELINE_FANOUT_THRESHOLD
+        timeline_utils.TIMELINE_FANOUT_THRESHOLD = max(2, min(original_threshold, user_count // 2))
+        cache.delete(timeline_utils.HIGH_FOLLOWER_CACHE_KEY)
+        try:
+            self._measure(options, user_ids, celebrity_ids, normal_ids)
+        finally:
+            timeline_utils.TIMELINE_FANOUT_THRESHOLD = original_threshold
+
+    def _measure(self, options, user_ids, celebrity_ids, normal_ids):
+        self.stdout.write(f'Publishing {options["posts"]} posts with fan-out-on-write...')
+        write_times = []
+        rows_written = 0
+        for i in range(options['posts']):
+            author_id = random.choice(normal_ids)
+            # bulk_create skips the post_save hook so the fan-out can be timed directly
+            post = Post(user_id=author_id, title=f'Load post {i}', content='Synthetic content')
+            Post.objects.bulk_create([post])
+            started = time.perf_counter()
+            rows_written += timeline_utils.fan_out_item(post)
+            write_times.append((time.perf_counter() - started) * 1000)
+
+        for celebrity_id in celebrity_ids:
+            Post.objects.bulk_create([
+                Post(user_id=celebrity_id, title=f'Celebrity post {n}', content='Synthetic content')
+                for n in range(20)
+            ])
+
+        self.stdout.write(f'Timing {options["reads"]} feed reads...')
+        factory = APIRequestFactory()
+        readers = list(User.objects.filter(id__in=user_ids))
+        read_times = []
+        items_served = 0
+        for _ in range(options['reads']):
+            reader = random.choice(readers)
+            request = factory.get('/api/feed/', {'limit': options['page_size']})
+            force_authenticate(request, user=reader)
+            started = time.perf_counter()
+            response = home_feed(request)
+            read_times.append((time.perf_counter() - started) * 1000)
+            items_served += len(response.data.get('results', []))
+
+        self.stdout.write(self.style.SUCCESS('Timeline load test results'))
+        self.stdout.write(f'  Fan-out writes:  {len(write_times)} posts, {rows_written} feed rows')
+        self.stdout.write(
+            f'    p50 {percentile(write_times, 50):.2f} ms  p95 {percentile(write_times, 95):.2f} ms  '
+            f'p99 {percentile(write_times, 99):.2f} ms'
+        )
+        self.stdout.write(f'  Feed reads:      {len(read_times)} pages, {items_served} items')
+        self.stdout.write(
+            f'    p50 {percentile(read_times, 50):.2f} ms  p95 {percentile(read_times, 95):.2f} ms  '
+            f'p99 {percentile(read_times, 99):.2f} ms  mean {statistics.mean(read_times or [0]):.2f} ms'
+        )
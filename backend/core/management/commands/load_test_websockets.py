@@ -0,0 +1,305 @@
+"""
+Load-test the WebSocket consumers in-process.
+
+Synthetic users connect to ChatConsumer, MessagingConsumer and
+NotificationConsumer with JWTs through the real ASGI application, so the
+JWT middleware, URL routing and the configured channel layer (Redis when
+REDIS_URL is set, in-memory otherwise) are all exercised. Each phase reports
+throughput and p50/p99 delivery latency measured from the moment a frame or
+group_send leaves the harness to the moment it reaches the receiving socket.
+
+    python manage.py load_test_websockets --users 200 --messages 5
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import AccessToken
+from core.models import UserProfile
+from core.management.commands.load_test_timeline import percentile
+from messaging.models import Conversation
+
+SOCKET_PATHS = {
+    'chat': '/ws/chat/',
+    'messaging': '/ws/messaging/',
+    'notifications': '/ws/notifications/',
+}
+# Loggers that log every connect/message at INFO
+NOISY_LOGGERS = ['messaging', 'notifications', 'vikrahub.middleware', 'core.notification_utils']
+
+
+class SimulatedUser:
+    """One synthetic user and the sockets it holds open"""
+
+    def __init__(self, user_id, username, token):
+        self.user_id = user_id
+        self.username = username
+        self.token = token
+        self.sockets = {}
+        self.readers = []
+        self.received_messages = []
+
+
+class Phase:
+    """Send times and delivery latencies for one measured phase"""
+
+    def __init__(self, name):
+        self.name = name
+        self.sent_at = {}
+        self.latencies = []
+        self.started = None
+        self.finished = None
+
+    def sent(self, key):
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        self.sent_at[key] = now
+
+    def delivered(self, key):
+        sent_at = self.sent_at.get(key)
+        if sent_at is None:
+            return
+        self.finished = time.perf_counter()
+        self.latencies.append((self.finished - sent_at) * 1000)
+
+    @property
+    def elapsed(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class Command(BaseCommand):
+    help = 'Load-test chat, messaging and notification WebSockets with synthetic JWT users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Synthetic users to connect')
+        parser.add_argument('--sockets', default='chat,messaging,notifications',
+                            help='Comma-separated sockets each user opens (chat, messaging, notifications)')
+        parser.add_argument('--messages', type=int, default=5, help='Direct messages each user sends')
+        parser.add_argument('--reactions', type=int, default=2, help='Received messages each user reacts to')
+        parser.add_argument('--read-receipts', type=int, default=2, help='Received messages each user marks read')
+        parser.add_argument('--broadcasts', type=int, default=5, help='Server-side group_sends per user and socket')
+        parser.add_argument('--concurrency', type=int, default=50, help='Connections opened at once')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Seconds to wait for each phase to drain')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic users and their messages')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        self.options = options
+        self.socket_kinds = [kind.strip() for kind in options['sockets'].split(',') if kind.strip()]
+        unknown = set(self.socket_kinds) - set(SOCKET_PATHS)
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Unknown sockets: {", ".join(sorted(unknown))}'))
+            return
+
+        if options['verbosity'] < 2:
+            for name in NOISY_LOGGERS:
+                logging.getLogger(name).setLevel(logging.WARNING)
+
+        users = self._create_users(options['users'])
+        try:
+            asyncio.run(self._run(users))
+        finally:
+            if not options['keep']:
+                self._delete_users(users)
+                self.stdout.write('Synthetic users deleted')
+
+    # Synthetic data (synchronous ORM, outside the event loop)
+
+    def _create_users(self, count):
+        run_tag = f'ws{int(time.time())}'
+        self.stdout.write(f'Creating {count} users...')
+        User.objects.bulk_create(
+            [User(username=f'{run_tag}_{i}', email=f'{run_tag}_{i}@example.com', is_active=True) for i in range(count)],
+            batch_size=1000
+        )
+        users = list(User.objects.filter(username__startswith=f'{run_tag}_').order_by('id'))
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=user, user_type='client') for user in users], batch_size=1000, ignore_conflicts=True
+        )
+        return [SimulatedUser(user.id, user.username, str(AccessToken.for_user(user))) for user in users]
+
+    def _delete_users(self, users):
+        user_ids = [user.user_id for user in users]
+        Conversation.objects.filter(participants__in=user_ids).delete()
+        User.objects.filter(id__in=user_ids).delete()
+
+    # Event loop
+
+    async def _run(self, users):
+        self.application = self._application()
+        self.channel_layer = get_channel_layer()
+        self.phases = {
+            name: Phase(name) for name in ('direct messages', 'reactions', 'read receipts', 'group broadcasts')
+        }
+        self.stdout.write(f'Channel layer: {type(self.channel_layer).__name__}')
+
+        await self._connect_all(users)
+        try:
+            await self._direct_messages(users)
+            await self._reactions(users)
+            await self._read_receipts(users)
+            await self._broadcasts(users)
+        finally:
+            await self._disconnect_all(users)
+
+        self.stdout.write(self.style.SUCCESS('WebSocket load test results'))
+        for phase in self.phases.values():
+            self._report(phase)
+
+    def _application(self):
+        from vikrahub.asgi import application
+        return application
+
+    async def _connect_all(self, users):
+        semaphore = asyncio.Semaphore(self.options['concurrency'])
+        connect_times = []
+        failures = []
+
+        async def connect(user, kind):
+            async with semaphore:
+                communicator = WebsocketCommunicator(self.application, f'{SOCKET_PATHS[kind]}?token={user.token}')
+                started = time.perf_counter()
+                try:
+                    connected, _ = await communicator.connect(timeout=self.options['timeout'])
+                except Exception as e:
+                    failures.append(f'{kind}: {e}')
+                    return
+                if not connected:
+                    failures.append(f'{kind}: rejected')
+                    return
+                connect_times.append((time.perf_counter() - started) * 1000)
+                user.sockets[kind] = communicator
+                user.readers.append(asyncio.create_task(self._read(user, kind, communicator)))
+
+        self.stdout.write(f'Opening {len(users) * len(self.socket_kinds)} connections...')
+        started = time.perf_counter()
+        await asyncio.gather(*(connect(user, kind) for user in users for kind in self.socket_kinds))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'  {"connections":<18} {len(connect_times):7d} open  {len(connect_times) / max(elapsed, 1e-9):9.1f} conn/s  '
+            f'p50 {percentile(connect_times, 50):8.2f} ms  p99 {percentile(connect_times, 99):8.2f} ms  '
+            f'failed {len(failures)}'
+        )
+        for failure in sorted(set(failures))[:5]:
+            self.stdout.write(f'    {failure}')
+
+    async def _disconnect_all(self, users):
+        for user in users:
+            for reader in user.readers:
+                reader.cancel()
+            for communicator in user.sockets.values():
+                try:
+                    await communicator.disconnect(timeout=self.options['timeout'])
+                except Exception:
+                    pass
+
+    async def _read(self, user, kind, communicator):
+        # Reads the output queue directly: receive_output() cancels the consumer on timeout
+        while True:
+            message = await communicator.output_queue.get()
+            if message['type'] == 'websocket.close':
+                return
+            if message['type'] != 'websocket.send' or not message.get('text'):
+                continue
+            self._dispatch(user, kind, json.loads(message['text']))
+
+    def _dispatch(self, user, kind, event):
+        event_type = event.get('type')
+        if kind == 'chat' and event_type == 'new_message':
+            message = event['message']
+            self.phases['direct messages'].delivered(message['text'])
+            user.received_messages.append(message['id'])
+        elif kind == 'chat' and event_type == 'reaction_update' and event['user'] != user.username:
+            self.phases['reactions'].delivered(event['message_id'])
+        elif kind == 'chat' and event_type == 'message_read':
+            self.phases['read receipts'].delivered(event['message_id'])
+        elif event_type in ('new_notification', 'new_message') and kind != 'chat':
+            payload = event.get('notification') or event.get('message') or {}
+            if 'load_test_key' in payload:
+                self.phases['group broadcasts'].delivered(payload['load_test_key'])
+
+    async def _drain(self, phase, expected):
+        deadline = time.perf_counter() + self.options['timeout']
+        while len(phase.latencies) < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+
+    # Phases
+
+    async def _direct_messages(self, users):
+        phase = self.phases['direct messages']
+        senders = [user for user in users if 'chat' in user.sockets]
+        if len(senders) < 2 or not self.options['messages']:
+            return
+
+        async def send(user):
+            for n in range(self.options['messages']):
+                recipient = random.choice(senders)
+                while recipient is user:
+                    recipient = random.choice(senders)
+                text = f'load {user.user_id}:{n}'
+                phase.sent(text)
+                await user.sockets['chat'].send_json_to({'type': 'message', 'recipient_id': recipient.user_id, 'text': text})
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(send(user) for user in senders))
+        await self._drain(phase, len(phase.sent_at))
+
+    async def _reactions(self, users):
+        phase = self.phases['reactions']
+        for user in users:
+            if 'chat' not in user.sockets:
+                continue
+            for message_id in user.received_messages[:self.options['reactions']]:
+                phase.sent(message_id)
+                await user.sockets['chat'].send_json_to({'type': 'react', 'message_id': message_id, 'reaction': 'like'})
+        await self._drain(phase, len(phase.sent_at))
+
+    async def _read_receipts(self, users):
+        phase = self.phases['read receipts']
+        for user in users:
+            if 'chat' not in user.sockets:
+                continue
+            for message_id in user.received_messages[:self.options['read_receipts']]:
+                phase.sent(message_id)
+                await user.sockets['chat'].send_json_to({'type': 'mark_read', 'message_id': message_id})
+        await self._drain(phase, len(phase.sent_at))
+
+    async def _broadcasts(self, users):
+        # The path broadcast_notification() and the REST views use to reach open sockets
+        phase = self.phases['group broadcasts']
+        groups = []
+        for user in users:
+            if 'notifications' in user.sockets:
+                groups.append((f'notifications_{user.user_id}', 'new_notification', 'notification'))
+            if 'messaging' in user.sockets:
+                groups.append((f'user_{user.user_id}', 'new_message', 'message'))
+
+        for n in range(self.options['broadcasts']):
+            for group, event_type, field in groups:
+                key = f'{group}:{n}'
+                phase.sent(key)
+                await self.channel_layer.group_send(group, {
+                    'type': event_type, field: {'load_test_key': key}, 'timestamp': ''
+                })
+        await self._drain(phase, len(phase.sent_at))
+
+    def _report(self, phase):
+        sent = len(phase.sent_at)
+        delivered = len(phase.latencies)
+        if not sent:
+            self.stdout.write(f'  {phase.name:<18} skipped')
+            return
+        self.stdout.write(
+            f'  {phase.name:<18} {delivered:7d}/{sent:<7d} {delivered / max(phase.elapsed, 1e-9):9.1f} msg/s  '
+            f'p50 {percentile(phase.latencies, 50):8.2f} ms  p99 {percentile(phase.latencies, 99):8.2f} ms'
+        )
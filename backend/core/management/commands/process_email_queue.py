@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from core.email_queue import process_email_queue, EMAIL_QUEUE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound emails over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_QUEUE_BATCH_SIZE,
+            help='Emails to claim and send per connection',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the queue instead of exiting when it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls when the queue is empty (with --loop)',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = process_email_queue(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Email queue drained: {total_sent} sent, {total_failed} failed attempts')
+        )
@@ -0,0 +1,34 @@
+import json
+from django.core.management.base import BaseCommand
+from core.retention_utils import purge_notifications, RETENTION_BATCH_SIZE, RETENTION_BATCH_PAUSE
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete old notifications and follow notifications in batches according to '
+        'NOTIFICATION_RETENTION_POLICIES (runs daily as the vikrahub-purge-notifications cron job)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=RETENTION_BATCH_SIZE, help='Rows per delete')
+        parser.add_argument('--sleep', type=float, default=RETENTION_BATCH_PAUSE, help='Seconds to pause between batches')
+        parser.add_argument('--unread-days', type=int, help='Also purge unread notifications older than this')
+        parser.add_argument('--dry-run', action='store_true', help='Only count matching rows')
+        parser.add_argument('--json', action='store_true', help='Print metrics as JSON')
+
+    def handle(self, *args, **options):
+        metrics = purge_notifications(
+            unread_days=options.get('unread_days'),
+            batch_size=options['batch_size'],
+            pause=options['sleep'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps({'dry_run': options['dry_run'], 'removed': metrics}))
+            return
+
+        label = 'Would remove' if options['dry_run'] else 'Removed'
+        for policy, rows in metrics.items():
+            self.stdout.write(f'  {policy}: {rows}')
+        self.stdout.write(self.style.SUCCESS(f'{label} {sum(metrics.values())} notification rows'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.marketplace_utils import rebuild_profile_metrics
+
+
+class Command(BaseCommand):
+    help = 'Recompute freelancer and client ratings, job counts and spend from reviews, projects and contracts'
+
+    def handle(self, *args, **options):
+        freelancers, clients = rebuild_profile_metrics()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt metrics for {freelancers} freelancers and {clients} clients'))
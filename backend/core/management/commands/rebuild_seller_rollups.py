@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.asset_utils import rebuild_seller_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute seller daily stats rollups from purchases and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seller-id',
+            type=int,
+            action='append',
+            help='Only rebuild rollups for this seller (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        row_count = rebuild_seller_rollups(options.get('seller_id'))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {row_count} seller daily stats rows'))
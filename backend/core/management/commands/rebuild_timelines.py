@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from core.timeline_utils import rebuild_timeline, TIMELINE_BACKFILL_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored home timelines from current Follow edges'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Only rebuild the timeline for this user',
+        )
+        parser.add_argument(
+            '--per-account',
+            type=int,
+            default=TIMELINE_BACKFILL_SIZE,
+            help='Recent items to copy per followed account and content type',
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options.get('user_id'):
+            users = users.filter(id=options['user_id'])
+
+        user_ids = list(users.values_list('id', flat=True))
+        total_entries = 0
+        for index, user_id in enumerate(user_ids, start=1):
+            total_entries += rebuild_timeline(user_id, limit=options['per_account'])
+            if index % 500 == 0:
+                self.stdout.write(f'Rebuilt {index}/{len(user_ids)} timelines...')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {len(user_ids)} timelines with {total_entries} entries')
+        )
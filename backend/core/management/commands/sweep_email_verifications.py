@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from core.models import EmailVerification
+
+
+class Command(BaseCommand):
+    help = 'Delete expired email verification tokens in batches (runs hourly as the vikrahub-sweep-email-verifications cron job)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows to delete per statement',
+        )
+        parser.add_argument(
+            '--verified-retention-days',
+            type=int,
+            default=30,
+            help='Days to keep verified tokens after they expire',
+        )
+
+    def handle(self, *args, **options):
+        deleted = EmailVerification.sweep_expired(
+            batch_size=options['batch_size'],
+            verified_retention_days=options['verified_retention_days'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired email verification rows'))
@@ -0,0 +1,339 @@
+"""
+Marketplace search over normalized skills.
+
+Projects keep their comma-separated required_skills and users their
+UserProfile.skills for display. Both are mirrored into Skill rows through
+many-to-many tables, so skill filters become indexed joins instead of
+icontains scans over a comma string, and freelancers can be ranked by how
+many of a project's skills they cover.
+
+Freelancer and client metrics (rating, jobs, completions, spend) are running
+aggregates: each review, project or contract change applies a delta with F()
+expressions in the same transaction, so reading or sorting by them never
+recomputes anything. rebuild_profile_metrics() repairs drift.
+"""
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import (
+    ClientProfile, FreelancerProfile, Project, ProjectApplication, ProjectContract, ProjectReview, Skill,
+    UserProfile
+)
+
+MAX_SKILL_LENGTH = Skill._meta.get_field('name').max_length
+
+
+def normalize_skills(raw):
+    """Unique lowercased skill names from a comma-separated string or a list, in order"""
+    if not raw:
+        return []
+    parts = raw.split(',') if isinstance(raw, str) else raw
+    names = []
+    for part in parts:
+        name = ' '.join(str(part).split()).lower()[:MAX_SKILL_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def get_or_create_skills(names):
+    """Skill rows for already-normalized names, inserting missing ones in one statement"""
+    if not names:
+        return []
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    return list(Skill.objects.filter(name__in=names))
+
+
+def sync_project_skills(project):
+    project.skills.set(get_or_create_skills(normalize_skills(project.required_skills)))
+
+
+def sync_freelancer_skills(profile, user_profile=None):
+    if user_profile is None:
+        user_profile = UserProfile.objects.filter(user_id=profile.user_id).only('skills').first()
+    raw = user_profile.skills if user_profile else ''
+    profile.skills.set(get_or_create_skills(normalize_skills(raw)))
+
+
+def filter_by_skills(queryset, skills):
+    """
+    Restrict a Project or FreelancerProfile queryset to rows that have any of
+    the given skills. Uses a subquery on the link table, so no DISTINCT is
+    needed and the outer ordering can still use its index.
+    """
+    names = normalize_skills(skills)
+    if not names:
+        return queryset
+    through = queryset.model.skills.through
+    owner_column = f'{queryset.model._meta.model_name}_id'
+    matching = through.objects.filter(skill__name__in=names).values(owner_column)
+    return queryset.filter(pk__in=matching)
+
+
+def rank_freelancers_for_project(project, queryset=None):
+    """
+    Available freelancers sharing at least one of the project's skills,
+    annotated with match_score (skills covered) and ordered best first
+    """
+    skill_ids = list(project.skills.values_list('id', flat=True))
+    queryset = queryset if queryset is not None else FreelancerProfile.objects.filter(is_available=True)
+    if not skill_ids:
+        return queryset.none()
+    return queryset.filter(skills__in=skill_ids).annotate(
+        match_score=Count('skills', filter=Q(skills__in=skill_ids))
+    ).order_by('-match_score', '-rating', '-created_at')
+
+
+def award_project(project_id, client, freelancer_id):
+    """
+    Award a project to one of its pending applicants.
+    
+    Everything runs in one transaction with the project row locked, so
+    concurrent selections queue behind each other and only the first finds
+    the project still open. Other pending applications are rejected with a
+    single UPDATE, and notifications are batched and delivered after commit.
+    
+    Awarding also creates the project's ProjectContract, which counts towards
+    the freelancer's total_jobs. A project reopened after an award keeps its
+    contract: awarding the same freelancer again reuses it.
+    
+    Returns (project, application, contract). Raises Project.DoesNotExist,
+    ProjectApplication.DoesNotExist, or ValidationError if the project has
+    already been awarded or has a contract with another freelancer.
+    """
+    from .notification_utils import create_project_award_notifications
+    
+    with transaction.atomic():
+        project = Project.objects.select_for_update().select_related('client').get(pk=project_id, client=client)
+        if project.status != 'open' or project.selected_freelancer_id:
+            raise ValidationError("A freelancer has already been selected for this project")
+        
+        application = ProjectApplication.objects.select_related('freelancer').get(
+            project=project, freelancer_id=freelancer_id, status='pending'
+        )
+        
+        project.selected_freelancer_id = application.freelancer_id
+        project.status = 'in_progress'
+        project.save(update_fields=['selected_freelancer', 'status', 'updated_at'])
+        
+        application.status = 'accepted'
+        application.save(update_fields=['status'])
+        
+        others = ProjectApplication.objects.filter(project=project, status='pending').exclude(pk=application.pk)
+        rejected_ids = list(others.values_list('freelancer_id', flat=True))
+        others.update(status='rejected')
+        
+        # One contract per project (OneToOneField)
+        contract = ProjectContract.objects.filter(project=project).first()
+        if contract is not None and contract.freelancer_id != application.freelancer_id:
+            raise ValidationError("This project already has a contract with another freelancer")
+        if contract is None:
+            agreed_rate = application.proposed_rate or project.budget_max or project.budget_min or 0
+            contract = ProjectContract.objects.create(
+                project=project,
+                freelancer_id=application.freelancer_id,
+                client=project.client,
+                agreed_rate=agreed_rate,
+                total_amount=agreed_rate if project.budget_type == 'fixed' else 0,
+                start_date=timezone.localdate(),
+            )
+        
+        create_project_award_notifications(
+            project, application.freelancer, list(User.objects.filter(id__in=rejected_ids))
+        )
+    
+    return project, application, contract
+
+
+@receiver(post_save, sender=Project, dispatch_uid='marketplace_project_skills')
+def sync_skills_on_project_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and 'required_skills' not in update_fields:
+        return
+    sync_project_skills(instance)
+
+
+@receiver(post_save, sender=FreelancerProfile, dispatch_uid='marketplace_freelancer_created')
+def sync_skills_on_freelancer_create(sender, instance, created, **kwargs):
+    if created:
+        sync_freelancer_skills(instance)
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='marketplace_userprofile_skills')
+def sync_skills_on_profile_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields and 'skills' not in update_fields:
+        return
+    profile = FreelancerProfile.objects.filter(user_id=instance.user_id).first()
+    if profile is not None:
+        sync_freelancer_skills(profile, instance)
+
+
+# Which profile a review rates
+RATED_PROFILES = {
+    'client_to_freelancer': FreelancerProfile,
+    'freelancer_to_client': ClientProfile,
+}
+
+AVERAGE_RATING = Case(
+    When(rating_count=0, then=Value(0)),
+    default=Cast(F('rating_sum'), FloatField()) / F('rating_count'),
+    output_field=DecimalField(max_digits=3, decimal_places=2),
+)
+
+
+def apply_rating_change(review_type, user_id, rating_delta, count_delta):
+    """Add a review's rating to (or remove it from) the reviewee's profile"""
+    model = RATED_PROFILES.get(review_type)
+    if model is None:
+        return
+    profiles = model.objects.filter(user_id=user_id)
+    profiles.update(rating_sum=F('rating_sum') + rating_delta, rating_count=F('rating_count') + count_delta)
+    # Separate statement so the average sees the new totals on every backend
+    profiles.update(rating=AVERAGE_RATING)
+
+
+def contract_spend(amount_paid, total_amount):
+    """What a completed contract counts towards the client's spend"""
+    return amount_paid or total_amount or 0
+
+
+def apply_contract_completion(freelancer_id, client_id, spend, sign):
+    """Count a contract's completion (sign=1) or undo it (sign=-1)"""
+    FreelancerProfile.objects.filter(user_id=freelancer_id).update(completed_jobs=F('completed_jobs') + sign)
+    ClientProfile.objects.filter(user_id=client_id).update(
+        projects_completed=F('projects_completed') + sign,
+        total_spent=F('total_spent') + sign * spend,
+    )
+
+
+@receiver(pre_save, sender=ProjectReview, dispatch_uid='marketplace_review_previous')
+def stash_previous_review(sender, instance, **kwargs):
+    instance._previous_review = None
+    if instance.pk:
+        instance._previous_review = ProjectReview.objects.filter(pk=instance.pk).values(
+            'review_type', 'reviewee_id', 'rating'
+        ).first()
+
+
+@receiver(post_save, sender=ProjectReview, dispatch_uid='marketplace_review_saved')
+def record_review(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_review', None)
+    if not created and previous:
+        if (previous['review_type'], previous['reviewee_id'], previous['rating']) == (
+                instance.review_type, instance.reviewee_id, instance.rating):
+            return
+        apply_rating_change(previous['review_type'], previous['reviewee_id'], -previous['rating'], -1)
+    apply_rating_change(instance.review_type, instance.reviewee_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=ProjectReview, dispatch_uid='marketplace_review_deleted')
+def forget_review(sender, instance, **kwargs):
+    apply_rating_change(instance.review_type, instance.reviewee_id, -instance.rating, -1)
+
+
+@receiver(post_save, sender=Project, dispatch_uid='marketplace_project_posted')
+def record_project_posted(sender, instance, created, **kwargs):
+    if created:
+        ClientProfile.objects.filter(user_id=instance.client_id).update(projects_posted=F('projects_posted') + 1)
+
+
+@receiver(post_delete, sender=Project, dispatch_uid='marketplace_project_deleted')
+def forget_project_posted(sender, instance, **kwargs):
+    ClientProfile.objects.filter(user_id=instance.client_id, projects_posted__gt=0).update(
+        projects_posted=F('projects_posted') - 1
+    )
+
+
+@receiver(pre_save, sender=ProjectContract, dispatch_uid='marketplace_contract_previous')
+def stash_previous_contract(sender, instance, **kwargs):
+    instance._previous_contract = None
+    if instance.pk:
+        instance._previous_contract = ProjectContract.objects.filter(pk=instance.pk).values(
+            'is_completed', 'amount_paid', 'total_amount'
+        ).first()
+
+
+@receiver(post_save, sender=ProjectContract, dispatch_uid='marketplace_contract_saved')
+def record_contract(sender, instance, created, **kwargs):
+    spend = contract_spend(instance.amount_paid, instance.total_amount)
+    if created:
+        FreelancerProfile.objects.filter(user_id=instance.freelancer_id).update(total_jobs=F('total_jobs') + 1)
+        if instance.is_completed:
+            apply_contract_completion(instance.freelancer_id, instance.client_id, spend, 1)
+        return
+    
+    previous = getattr(instance, '_previous_contract', None)
+    if previous is None:
+        return
+    # Undo the contract as it was counted, then count it as it is now
+    if previous['is_completed']:
+        previous_spend = contract_spend(previous['amount_paid'], previous['total_amount'])
+        if instance.is_completed and previous_spend == spend:
+            return
+        apply_contract_completion(instance.freelancer_id, instance.client_id, previous_spend, -1)
+    if instance.is_completed:
+        apply_contract_completion(instance.freelancer_id, instance.client_id, spend, 1)
+
+
+@receiver(post_delete, sender=ProjectContract, dispatch_uid='marketplace_contract_deleted')
+def forget_contract(sender, instance, **kwargs):
+    FreelancerProfile.objects.filter(user_id=instance.freelancer_id, total_jobs__gt=0).update(
+        total_jobs=F('total_jobs') - 1
+    )
+    if instance.is_completed:
+        spend = contract_spend(instance.amount_paid, instance.total_amount)
+        apply_contract_completion(instance.freelancer_id, instance.client_id, spend, -1)
+
+
+def rebuild_profile_metrics():
+    """Recompute every freelancer and client metric from reviews, projects and contracts"""
+    def grouped(queryset, key, **aggregates):
+        return {row[key]: row for row in queryset.values(key).annotate(**aggregates).order_by()}
+    
+    reviews = ProjectReview.objects.all()
+    freelancer_reviews = grouped(reviews.filter(review_type='client_to_freelancer'), 'reviewee_id',
+                                 total=Sum('rating'), count=Count('id'))
+    client_reviews = grouped(reviews.filter(review_type='freelancer_to_client'), 'reviewee_id',
+                             total=Sum('rating'), count=Count('id'))
+    jobs = grouped(ProjectContract.objects.all(), 'freelancer_id',
+                   total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+    posted = grouped(Project.objects.all(), 'client_id', count=Count('id'))
+    completed = {}
+    for contract in ProjectContract.objects.filter(is_completed=True).only(
+            'client_id', 'amount_paid', 'total_amount'):
+        count, spent = completed.get(contract.client_id, (0, 0))
+        completed[contract.client_id] = (count + 1, spent + contract_spend(contract.amount_paid, contract.total_amount))
+    
+    def rating_fields(row):
+        total, count = (row['total'] or 0, row['count']) if row else (0, 0)
+        return {'rating_sum': total, 'rating_count': count, 'rating': round(total / count, 2) if count else 0}
+    
+    with transaction.atomic():
+        freelancers = list(FreelancerProfile.objects.select_for_update())
+        for profile in freelancers:
+            for field, value in rating_fields(freelancer_reviews.get(profile.user_id)).items():
+                setattr(profile, field, value)
+            row = jobs.get(profile.user_id)
+            profile.total_jobs = row['total'] if row else 0
+            profile.completed_jobs = row['completed'] if row else 0
+        FreelancerProfile.objects.bulk_update(
+            freelancers, ['rating', 'rating_sum', 'rating_count', 'total_jobs', 'completed_jobs'], batch_size=500
+        )
+        
+        clients = list(ClientProfile.objects.select_for_update())
+        for profile in clients:
+            for field, value in rating_fields(client_reviews.get(profile.user_id)).items():
+                setattr(profile, field, value)
+            row = posted.get(profile.user_id)
+            profile.projects_posted = row['count'] if row else 0
+            profile.projects_completed, profile.total_spent = completed.get(profile.user_id, (0, 0))
+        ClientProfile.objects.bulk_update(
+            clients, ['rating', 'rating_sum', 'rating_count', 'projects_posted', 'projects_completed', 'total_spent'],
+            batch_size=500
+        )
+    return len(freelancers), len(clients)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0032_add_username_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-content_type', '-object_id'],
+                'indexes': [models.Index(fields=['owner', '-created_at', '-content_type', '-object_id'], name='core_feeden_owner_i_60e918_idx'), models.Index(fields=['owner', 'actor'], name='core_feeden_owner_i_b49d71_idx'), models.Index(fields=['content_type', 'object_id'], name='core_feeden_content_ebb4c7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'content_type', 'object_id'), name='unique_feed_entry')],
+            },
+        ),
+    ]
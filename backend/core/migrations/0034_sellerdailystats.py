@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_seller_rollups(apps, schema_editor):
+    """Build the daily rollups from existing purchases and reviews, like rebuild_seller_rollups"""
+    from django.db.models import Count, Sum
+    from django.db.models.functions import TruncDate
+    AssetPurchase = apps.get_model('core', 'AssetPurchase')
+    AssetReview = apps.get_model('core', 'AssetReview')
+    SellerDailyStats = apps.get_model('core', 'SellerDailyStats')
+
+    rows = {}
+
+    def row_for(seller_id, day):
+        return rows.setdefault((seller_id, day), SellerDailyStats(seller_id=seller_id, date=day))
+
+    for entry in (
+        AssetPurchase.objects.annotate(day=TruncDate('purchase_date'))
+        .values('asset__seller_id', 'day')
+        .annotate(sales=Count('id'), revenue=Sum('price_paid'))
+        .order_by()
+    ):
+        row = row_for(entry['asset__seller_id'], entry['day'])
+        row.sales_count = entry['sales']
+        row.revenue = entry['revenue'] or 0
+        row.downloads = entry['sales']
+
+    for entry in (
+        AssetReview.objects.annotate(day=TruncDate('created_at'))
+        .values('asset__seller_id', 'day')
+        .annotate(reviews=Count('id'), rating_total=Sum('rating'))
+        .order_by()
+    ):
+        row = row_for(entry['asset__seller_id'], entry['day'])
+        row.reviews_count = entry['reviews']
+        row.rating_total = entry['rating_total'] or 0
+
+    SellerDailyStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_feedentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('downloads', models.PositiveIntegerField(default=0)),
+                ('reviews_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seller_daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('seller', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_seller_rollups, migrations.RunPython.noop),
+    ]
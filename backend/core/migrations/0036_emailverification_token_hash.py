@@ -0,0 +1,44 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    """Store digests of outstanding UUID tokens so links already emailed keep working"""
+    EmailVerification = apps.get_model('core', 'EmailVerification')
+    for verification in EmailVerification.objects.only('pk', 'token').iterator():
+        verification.token_hash = hashlib.sha256(str(verification.token).encode('utf-8')).hexdigest()
+        verification.save(update_fields=['token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_outboundemail'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailverification',
+            name='core_emailv_token_606d0a_idx',
+        ),
+        migrations.AddField(
+            model_name='emailverification',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='emailverification',
+            name='token',
+        ),
+        migrations.AlterField(
+            model_name='emailverification',
+            name='token_hash',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='emailverification',
+            index=models.Index(fields=['expires_at'], name='core_emailv_expires_cd90f8_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+
+def copy_follow_notifications(apps, schema_editor):
+    """Move FollowNotification rows into the main Notification table"""
+    FollowNotification = apps.get_model('core', 'FollowNotification')
+    Notification = apps.get_model('core', 'Notification')
+
+    # Keep the original timestamps instead of stamping the migration time
+    for field_name in ('created_at', 'updated_at'):
+        field = Notification._meta.get_field(field_name)
+        field.auto_now = field.auto_now_add = False
+
+    # Follows made through User.follow() already have a main notification
+    existing = set(
+        Notification.objects.filter(verb='follow', actor__isnull=False)
+        .values_list('user_id', 'actor_id')
+    )
+
+    batch = []
+    rows = FollowNotification.objects.select_related('follow__follower').order_by('created_at')
+    for legacy in rows.iterator():
+        follower = legacy.follow.follower
+        if (legacy.recipient_id, follower.id) in existing:
+            continue
+        existing.add((legacy.recipient_id, follower.id))
+        follower_name = f"{follower.first_name} {follower.last_name}".strip() or follower.username
+        batch.append(Notification(
+            user_id=legacy.recipient_id,
+            actor=follower,
+            verb='follow',
+            message=f"{follower_name} started following you",
+            payload={'follower_username': follower.username, 'follower_name': follower_name},
+            is_read=legacy.is_read,
+            created_at=legacy.created_at,
+            updated_at=legacy.read_at or legacy.created_at,
+        ))
+        if len(batch) >= 500:
+            Notification.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_notification_aggregation'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_follow_notifications, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='FollowNotification',
+        ),
+    ]
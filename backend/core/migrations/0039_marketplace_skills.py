@@ -0,0 +1,105 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _normalize(raw):
+    names = []
+    for part in (raw or '').split(','):
+        name = ' '.join(part.split()).lower()[:100]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_skills(apps, schema_editor):
+    """Mirror existing comma-separated skills into Skill link rows"""
+    Skill = apps.get_model('core', 'Skill')
+    Project = apps.get_model('core', 'Project')
+    FreelancerProfile = apps.get_model('core', 'FreelancerProfile')
+    UserProfile = apps.get_model('core', 'UserProfile')
+
+    project_skills = {
+        project_id: _normalize(raw)
+        for project_id, raw in Project.objects.values_list('id', 'required_skills').iterator()
+    }
+    profile_skills = dict(UserProfile.objects.exclude(skills='').values_list('user_id', 'skills'))
+    freelancer_skills = {
+        profile_id: _normalize(profile_skills.get(user_id))
+        for profile_id, user_id in FreelancerProfile.objects.values_list('id', 'user_id').iterator()
+    }
+
+    names = {name for skills in list(project_skills.values()) + list(freelancer_skills.values()) for name in skills}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True, batch_size=1000)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+
+    Project.skills.through.objects.bulk_create([
+        Project.skills.through(project_id=owner_id, skill_id=skill_ids[name])
+        for owner_id, skills in project_skills.items() for name in skills
+    ], ignore_conflicts=True, batch_size=1000)
+    FreelancerProfile.skills.through.objects.bulk_create([
+        FreelancerProfile.skills.through(freelancerprofile_id=owner_id, skill_id=skill_ids[name])
+        for owner_id, skills in freelancer_skills.items() for name in skills
+    ], ignore_conflicts=True, batch_size=1000)
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_fold_follow_notifications'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Lowercased, trimmed skill name', max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='freelancers', to='core.skill'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='projects', to='core.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='freelancerprofile',
+            index=models.Index(fields=['is_available', '-rating', '-created_at'], name='core_freela_is_avai_96ed39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='freelancerprofile',
+            index=models.Index(fields=['is_available', 'hourly_rate'], name='core_freela_is_avai_e6fb63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='freelancerprofile',
+            index=models.Index(fields=['is_available', 'skill_level'], name='core_freela_is_avai_52943f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', '-created_at'], name='core_projec_status_6b945f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'budget_min'], name='core_projec_status_396bbc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'budget_max'], name='core_projec_status_bd6bbb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'category', '-created_at'], name='core_projec_status_03f854_idx'),
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_profile_metrics(apps, schema_editor):
+    """Seed the running ratings and counters from existing rows, like rebuild_profile_metrics"""
+    from django.db.models import Count, Q, Sum
+    ProjectReview = apps.get_model('core', 'ProjectReview')
+    ProjectContract = apps.get_model('core', 'ProjectContract')
+    Project = apps.get_model('core', 'Project')
+    FreelancerProfile = apps.get_model('core', 'FreelancerProfile')
+    ClientProfile = apps.get_model('core', 'ClientProfile')
+
+    def grouped(queryset, key, **aggregates):
+        return {row[key]: row for row in queryset.values(key).annotate(**aggregates).order_by()}
+
+    freelancer_reviews = grouped(ProjectReview.objects.filter(review_type='client_to_freelancer'), 'reviewee_id',
+                                 total=Sum('rating'), count=Count('id'))
+    client_reviews = grouped(ProjectReview.objects.filter(review_type='freelancer_to_client'), 'reviewee_id',
+                             total=Sum('rating'), count=Count('id'))
+    jobs = grouped(ProjectContract.objects.all(), 'freelancer_id',
+                   total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+    posted = grouped(Project.objects.all(), 'client_id', count=Count('id'))
+    completed = {}
+    for contract in ProjectContract.objects.filter(is_completed=True).only('client_id', 'amount_paid', 'total_amount'):
+        count, spent = completed.get(contract.client_id, (0, 0))
+        completed[contract.client_id] = (count + 1, spent + (contract.amount_paid or contract.total_amount or 0))
+
+    def rating_fields(row):
+        total, count = (row['total'] or 0, row['count']) if row else (0, 0)
+        return {'rating_sum': total, 'rating_count': count, 'rating': round(total / count, 2) if count else 0}
+
+    freelancers = list(FreelancerProfile.objects.all())
+    for profile in freelancers:
+        for field, value in rating_fields(freelancer_reviews.get(profile.user_id)).items():
+            setattr(profile, field, value)
+        row = jobs.get(profile.user_id)
+        profile.total_jobs = row['total'] if row else 0
+        profile.completed_jobs = row['completed'] if row else 0
+    FreelancerProfile.objects.bulk_update(
+        freelancers, ['rating', 'rating_sum', 'rating_count', 'total_jobs', 'completed_jobs'], batch_size=500
+    )
+
+    clients = list(ClientProfile.objects.all())
+    for profile in clients:
+        for field, value in rating_fields(client_reviews.get(profile.user_id)).items():
+            setattr(profile, field, value)
+        row = posted.get(profile.user_id)
+        profile.projects_posted = row['count'] if row else 0
+        profile.projects_completed, profile.total_spent = completed.get(profile.user_id, (0, 0))
+    ClientProfile.objects.bulk_update(
+        clients, ['rating', 'rating_sum', 'rating_count', 'projects_posted', 'projects_completed', 'total_spent'],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_marketplace_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientprofile',
+            name='rating',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='clientprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='clientprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='clientprofile',
+            index=models.Index(fields=['-is_verified', '-total_spent', '-created_at'], name='core_client_is_veri_80f360_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientprofile',
+            index=models.Index(fields=['-rating', '-created_at'], name='core_client_rating_7db9df_idx'),
+        ),
+        migrations.RunPython(backfill_profile_metrics, migrations.RunPython.noop),
+    ]
@@ -4,7 +4,7 @@ from django.contrib.postgres.fields import ArrayField  # for Postgres
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.urls import reverse # for URL reversing in templates
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 
 # Add Django Allauth signal import
@@ -17,10 +17,13 @@ from django.utils.text import slugify
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 import uuid
+import hashlib
+import secrets
 from .cloudinary_utils import validate_cloudinary_url
+from .slug_utils import save_with_unique_slug
 
 # Import follow system models
-from .follow_models import Follow, FollowNotification
+from .follow_models import Follow
 
 # This file defines the models for the Vikra Hub project, including user profiles, services, portfolio items, blog posts, team members, and notifications.
 
@@ -48,6 +51,13 @@ class Notification(models.Model):
     # Legacy message field for backward compatibility
     message = models.CharField(max_length=200, blank=True)
     
+    # Aggregation ("X and 12 others liked your post"): one row per
+    # (recipient, verb, target, time bucket), updated in place
+    aggregation_key = models.CharField(max_length=255, null=True, blank=True)
+    actor_count = models.PositiveIntegerField(default=1)
+    latest_actor_ids = models.JSONField(default=list, blank=True)
+    last_delivered_at = models.DateTimeField(null=True, blank=True)
+    
     # Status
     is_read = models.BooleanField(default=False, db_index=True)
     
@@ -62,6 +72,13 @@ class Notification(models.Model):
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['verb', '-created_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'aggregation_key'],
+                condition=models.Q(aggregation_key__isnull=False),
+                name='unique_notification_aggregate',
+            ),
+        ]
     
     def __str__(self):
         actor_name = self.actor.username if self.actor else "System"
@@ -82,6 +99,9 @@ class Notification(models.Model):
             return self.message or "System notification"
             
         actor_name = self.actor.get_full_name() or self.actor.username
+        if self.actor_count > 1:
+            others = self.actor_count - 1
+            actor_name = f"{actor_name} and {others} other{'s' if others > 1 else ''}"
         
         verb_templates = {
             'message': f"{actor_name} sent you a message",
@@ -91,6 +111,8 @@ class Notification(models.Model):
             'reaction': f"{actor_name} reacted to your message",
             'reply': f"{actor_name} replied to your message",
             'mention': f"{actor_name} mentioned you",
+            'project_awarded': f"{actor_name} hired you for a project",
+            'application_rejected': f"{actor_name} selected another freelancer",
         }
         
         return verb_templates.get(self.verb, f"{actor_name} {self.verb}")
@@ -136,11 +158,17 @@ class Device(models.Model):
 
 class EmailVerification(models.Model):
     """
-    Email verification tokens for user account activation
+    Email verification tokens for user account activation.
+    
+    Only a SHA-256 digest of each token is stored; the raw token exists just
+    long enough to be emailed (exposed as `.token` on the instance returned by
+    create_for_user). Expired rows are pruned by sweep_email_verifications.
     """
+    TOKEN_TTL_DAYS = 3
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='email_verifications')
     email = models.EmailField()
-    token = models.UUIDField(default=uuid.uuid4, unique=True)
+    token_hash = models.CharField(max_length=64, unique=True)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     verified_at = models.DateTimeField(null=True, blank=True)
@@ -149,44 +177,144 @@ class EmailVerification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['token']),
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['email', 'is_verified']),
+            models.Index(fields=['expires_at']),
         ]
     
     def __str__(self):
         return f"Email verification for {self.email}"
     
+    @staticmethod
+    def hash_token(raw_token):
+        return hashlib.sha256(str(raw_token).encode('utf-8')).hexdigest()
+    
     def is_expired(self):
         return timezone.now() > self.expires_at
     
     def verify(self):
         """Mark the email as verified"""
-        if not self.is_expired():
-            self.is_verified = True
-            self.verified_at = timezone.now()
-            self.save()
-            
-            # Activate the user account
-            self.user.is_active = True
-            self.user.save()
-            
-            return True
-        return False
+        now = timezone.now()
+        # Conditional update so expiry and single use are enforced by the database
+        updated = EmailVerification.objects.filter(
+            pk=self.pk, is_verified=False, expires_at__gt=now
+        ).update(is_verified=True, verified_at=now)
+        if not updated:
+            return False
+        
+        self.is_verified = True
+        self.verified_at = now
+        
+        # Activate the user account
+        self.user.is_active = True
+        self.user.save()
+        
+        return True
+    
+    @classmethod
+    def verify_token(cls, raw_token):
+        """
+        Verify a raw token.
+        
+        Returns (verification, outcome) where outcome is one of 'verified',
+        'already_verified', 'expired' or 'invalid' (verification is None).
+        """
+        verification = cls.objects.select_related('user').filter(
+            token_hash=cls.hash_token(raw_token)
+        ).first()
+        if verification is None:
+            return None, 'invalid'
+        if verification.verify():
+            return verification, 'verified'
+        
+        verification.refresh_from_db(fields=['is_verified', 'verified_at'])
+        if verification.is_verified:
+            return verification, 'already_verified'
+        return verification, 'expired'
     
     @classmethod
     def create_for_user(cls, user, email=None):
-        """Create a new verification token for a user"""
+        """
+        Create a new verification token for a user, superseding any earlier
+        unverified tokens in the same transaction
+        """
         from datetime import timedelta
+        from django.db import transaction
         
         email = email or user.email
-        expires_at = timezone.now() + timedelta(days=3)  # 3 days expiry
+        raw_token = secrets.token_urlsafe(32)
+        expires_at = timezone.now() + timedelta(days=cls.TOKEN_TTL_DAYS)
+        
+        with transaction.atomic():
+            # Lock the user row so concurrent resends cannot leave two live tokens
+            User.objects.select_for_update().filter(pk=user.pk).first()
+            cls.objects.filter(user=user, is_verified=False).delete()
+            verification = cls.objects.create(
+                user=user,
+                email=email,
+                token_hash=cls.hash_token(raw_token),
+                expires_at=expires_at
+            )
+        
+        verification.token = raw_token
+        return verification
+    
+    @classmethod
+    def sweep_expired(cls, batch_size=1000, verified_retention_days=30):
+        """
+        Delete expired tokens in primary-key batches; verified rows are kept
+        for verified_retention_days after expiry. Returns rows deleted.
+        """
+        from datetime import timedelta
         
-        return cls.objects.create(
-            user=user,
-            email=email,
-            expires_at=expires_at
+        now = timezone.now()
+        expired = cls.objects.filter(
+            models.Q(is_verified=False, expires_at__lt=now) |
+            models.Q(is_verified=True, expires_at__lt=now - timedelta(days=verified_retention_days))
         )
+        total = 0
+        while True:
+            ids = list(expired.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return total
+            total += cls.objects.filter(pk__in=ids).delete()[0]
+
+
+class OutboundEmail(models.Model):
+    """
+    Queued outbound email, delivered by the process_email_queue worker
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    category = models.CharField(max_length=50, blank=True, help_text="e.g. verification, welcome")
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.category or 'email'} to {', '.join(self.to)} ({self.status})"
 
 
 class UserProfile(models.Model):
@@ -298,13 +426,8 @@ class BlogPost(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while BlogPost.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            save_with_unique_slug(self, self.title, super().save, *args, **kwargs)
+            return
         super().save(*args, **kwargs)
     
     def get_tags_list(self):
@@ -469,8 +592,38 @@ class AssetReview(models.Model):
     def __str__(self):
         return f"{self.reviewer.username} - {self.rating} stars for {self.asset.title}"
 
+class SellerDailyStats(models.Model):
+    """
+    Per-seller, per-day marketplace rollup maintained incrementally as
+    purchases and reviews are written, so seller dashboards never scan raw rows
+    """
+    seller = models.ForeignKey(User, on_delete=models.CASCADE, related_name='seller_daily_stats')
+    date = models.DateField()
+    sales_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    downloads = models.PositiveIntegerField(default=0)
+    reviews_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['seller', 'date']
+    
+    def __str__(self):
+        return f"{self.seller.username} stats for {self.date}"
+
 
 # Freelancer Booking System Models
+class Skill(models.Model):
+    """Normalized skill shared by projects and freelancer profiles"""
+    name = models.CharField(max_length=100, unique=True, help_text="Lowercased, trimmed skill name")
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
 class FreelancerProfile(models.Model):
     SKILL_LEVELS = [
         ('beginner', 'Beginner'),
@@ -489,8 +642,10 @@ class FreelancerProfile(models.Model):
     portfolio_url = models.URLField(blank=True)
     resume = models.FileField(upload_to='freelancer/resumes/', blank=True)
     
-    # Ratings and reviews
+    # Ratings and reviews, maintained incrementally from reviews and contracts
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     total_jobs = models.PositiveIntegerField(default=0)
     completed_jobs = models.PositiveIntegerField(default=0)
     
@@ -498,6 +653,16 @@ class FreelancerProfile(models.Model):
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Normalized from UserProfile.skills for indexed matching
+    skills = models.ManyToManyField(Skill, blank=True, related_name='freelancers')
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_available', '-rating', '-created_at']),
+            models.Index(fields=['is_available', 'hourly_rate']),
+            models.Index(fields=['is_available', 'skill_level']),
+        ]
+    
     def __str__(self):
         return f"{self.user.username} - {self.title}"
     
@@ -600,10 +765,13 @@ class ClientProfile(models.Model):
     business_registration = models.CharField(max_length=100, blank=True, help_text="Business registration number")
     tax_id = models.CharField(max_length=50, blank=True, help_text="Tax identification number")
     
-    # Metrics
+    # Metrics, maintained incrementally from projects, contracts and reviews
     projects_posted = models.PositiveIntegerField(default=0)
     projects_completed = models.PositiveIntegerField(default=0)
     total_spent = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     
     # Status
     is_verified = models.BooleanField(default=False)
@@ -624,6 +792,10 @@ class ClientProfile(models.Model):
     class Meta:
         verbose_name = "Client Profile"
         verbose_name_plural = "Client Profiles"
+        indexes = [
+            models.Index(fields=['-is_verified', '-total_spent', '-created_at']),
+            models.Index(fields=['-rating', '-created_at']),
+        ]
 
 class ProjectCategory(models.Model):
     name = models.CharField(max_length=100)
@@ -671,9 +843,20 @@ class Project(models.Model):
         related_name='assigned_projects'
     )
     
+    # Normalized from required_skills for indexed matching
+    skills = models.ManyToManyField(Skill, blank=True, related_name='projects')
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['status', 'budget_min']),
+            models.Index(fields=['status', 'budget_max']),
+            models.Index(fields=['status', 'category', '-created_at']),
+        ]
+    
     def __str__(self):
         return self.title
     
@@ -903,6 +1086,36 @@ class CommentLike(models.Model):
     def __str__(self):
         return f"{self.user.username} likes comment by {self.comment.user.username}"
 
+# Home timeline
+class FeedEntry(models.Model):
+    """
+    Precomputed home-timeline row: one content item delivered to one follower.
+    Written by fan-out-on-write in timeline_utils; items from high-follower
+    creators are merged in at read time instead of being stored here.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feed_entries')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    item = GenericForeignKey('content_type', 'object_id')
+
+    # Timestamp of the underlying item, used for timeline ordering
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at', '-content_type', '-object_id']
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'content_type', 'object_id'], name='unique_feed_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-content_type', '-object_id']),
+            models.Index(fields=['owner', 'actor']),
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} {self.object_id} → {self.owner.username}"
+
 # Add likes and comments to BlogPost model
 def add_engagement_to_blogpost():
     """Add engagement fields to existing BlogPost model"""
@@ -915,6 +1128,58 @@ def create_specialized_profile_on_userprofile_save(sender, instance, created, **
     if instance.user and instance.user_type:
         create_specialized_profile(instance.user, instance.user_type)
 
+# Seller rollup maintenance
+@receiver(post_save, sender=AssetPurchase)
+def record_purchase_in_seller_rollup(sender, instance, created, **kwargs):
+    """Count a new sale in the seller's daily rollup"""
+    if created:
+        from .asset_utils import record_seller_activity
+        record_seller_activity(
+            instance.asset.seller_id, timezone.localdate(instance.purchase_date),
+            sales=1, revenue=instance.price_paid or 0
+        )
+
+@receiver(post_delete, sender=AssetPurchase)
+def remove_purchase_from_seller_rollup(sender, instance, **kwargs):
+    """Reverse a deleted sale in the seller's daily rollup"""
+    from .asset_utils import record_seller_activity
+    seller_id = CreativeAsset.objects.filter(pk=instance.asset_id).values_list('seller_id', flat=True).first()
+    if seller_id:
+        record_seller_activity(
+            seller_id, timezone.localdate(instance.purchase_date),
+            sales=-1, revenue=-(instance.price_paid or 0)
+        )
+
+@receiver(pre_save, sender=AssetReview)
+def remember_previous_review_rating(sender, instance, **kwargs):
+    """Keep the stored rating so an edit can be applied as a delta"""
+    instance._previous_rating = None
+    if instance.pk:
+        instance._previous_rating = AssetReview.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+
+@receiver(post_save, sender=AssetReview)
+def record_review_in_seller_rollup(sender, instance, created, **kwargs):
+    """Count a new or edited review in the seller's daily rollup"""
+    from .asset_utils import record_seller_activity
+    day = timezone.localdate(instance.created_at)
+    if created:
+        record_seller_activity(instance.asset.seller_id, day, reviews=1, rating_total=instance.rating)
+    else:
+        previous_rating = getattr(instance, '_previous_rating', None)
+        if previous_rating is not None and previous_rating != instance.rating:
+            record_seller_activity(instance.asset.seller_id, day, rating_total=instance.rating - previous_rating)
+
+@receiver(post_delete, sender=AssetReview)
+def remove_review_from_seller_rollup(sender, instance, **kwargs):
+    """Reverse a deleted review in the seller's daily rollup"""
+    from .asset_utils import record_seller_activity
+    seller_id = CreativeAsset.objects.filter(pk=instance.asset_id).values_list('seller_id', flat=True).first()
+    if seller_id:
+        record_seller_activity(
+            seller_id, timezone.localdate(instance.created_at),
+            reviews=-1, rating_total=-instance.rating
+        )
+
 # Django Allauth signal handler (if available)
 if ALLAUTH_AVAILABLE:
     @receiver(user_signed_up)
@@ -2,8 +2,12 @@
 import logging
 import json
 from typing import Dict, Any, Optional, List
+from datetime import timedelta
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -11,6 +15,14 @@ from .models import Notification, Device
 
 logger = logging.getLogger(__name__)
 
+# Verbs folded into one row per (recipient, verb, target) and time bucket
+AGGREGATED_VERBS = set(getattr(settings, 'NOTIFICATION_AGGREGATED_VERBS', ['like', 'follow', 'reaction']))
+# Width of an aggregation bucket in seconds
+AGGREGATION_WINDOW = getattr(settings, 'NOTIFICATION_AGGREGATION_WINDOW', 6 * 60 * 60)
+# Minimum seconds between WebSocket/push deliveries for one aggregate
+AGGREGATE_DELIVERY_INTERVAL = getattr(settings, 'NOTIFICATION_AGGREGATE_DELIVERY_INTERVAL', 60)
+LATEST_ACTORS_KEPT = 3
+
 
 def create_notification(
     user: User,
@@ -18,11 +30,16 @@ def create_notification(
     actor: Optional[User] = None,
     target: Optional[Any] = None,
     payload: Optional[Dict] = None,
-    message: str = ""
+    message: str = "",
+    aggregate_on: Optional[str] = None
 ) -> Notification:
     """
     Create a notification and broadcast it via WebSocket
     
+    Notifications for AGGREGATED_VERBS are folded into an existing row for the
+    same recipient, verb and target within the current time bucket, and their
+    re-delivery is rate-limited to one per AGGREGATE_DELIVERY_INTERVAL.
+    
     Args:
         user: Recipient of the notification
         verb: Action type (message, follow, like, etc.)
@@ -30,9 +47,11 @@ def create_notification(
         target: Target object (message, post, etc.)
         payload: Additional data as dict
         message: Legacy message field
+        aggregate_on: Grouping key for targets that cannot be stored as a
+            generic relation (e.g. UUID-keyed messages)
     
     Returns:
-        Created Notification instance
+        Created or updated Notification instance
     """
     notification_data = {
         'user': user,
@@ -47,19 +66,130 @@ def create_notification(
         notification_data['target_content_type'] = ContentType.objects.get_for_model(target)
         notification_data['target_object_id'] = target.pk
     
-    # Create the notification
-    notification = Notification.objects.create(**notification_data)
-    
-    # Broadcast via WebSocket
-    broadcast_notification(notification)
+    if actor and verb in AGGREGATED_VERBS:
+        notification, deliver = aggregate_notification(notification_data, aggregate_on)
+    else:
+        # Create the notification
+        notification = Notification.objects.create(**notification_data)
+        deliver = True
     
-    # Send push notification
-    send_push_notifications(notification)
+    if deliver:
+        # Broadcast via WebSocket
+        broadcast_notification(notification)
+        
+        # Send push notification
+        send_push_notifications(notification)
     
     logger.info(f"Created notification: {notification}")
     return notification
 
 
+def create_bulk_notifications(
+    users: List[User],
+    verb: str,
+    actor: Optional[User] = None,
+    target: Optional[Any] = None,
+    payload: Optional[Dict] = None,
+    message: str = "",
+    push: bool = False
+) -> List[Notification]:
+    """
+    Create the same notification for many recipients in one INSERT
+    
+    Rows are written inside the caller's transaction; WebSocket (and
+    optionally push) delivery runs once it commits, so a rolled-back
+    operation never notifies anyone.
+    """
+    target_fields = {}
+    if target:
+        target_fields = {
+            'target_content_type': ContentType.objects.get_for_model(target),
+            'target_object_id': target.pk,
+        }
+    notifications = Notification.objects.bulk_create([
+        Notification(user=user, verb=verb, actor=actor, payload=payload or {}, message=message, **target_fields)
+        for user in users
+    ])
+    
+    def deliver():
+        for notification in notifications:
+            broadcast_notification(notification)
+            if push:
+                send_push_notifications(notification)
+    
+    transaction.on_commit(deliver)
+    logger.info(f"Created {len(notifications)} '{verb}' notifications")
+    return notifications
+
+
+def get_aggregation_key(notification_data: Dict, aggregate_on: Optional[str] = None, now=None) -> str:
+    """Key for (verb, target, time bucket); the recipient is matched separately"""
+    now = now or timezone.now()
+    bucket = int(now.timestamp() // AGGREGATION_WINDOW)
+    if aggregate_on is None and notification_data.get('target_content_type'):
+        aggregate_on = f"{notification_data['target_content_type'].pk}:{notification_data['target_object_id']}"
+    return f"{notification_data['verb']}:{aggregate_on or '-'}:{bucket}"
+
+
+def aggregate_notification(notification_data: Dict, aggregate_on: Optional[str] = None):
+    """
+    Create or bump the aggregate row for a notification.
+    
+    Returns (notification, deliver) where deliver says whether this update
+    should be pushed to the recipient now.
+    """
+    now = timezone.now()
+    user = notification_data['user']
+    actor = notification_data['actor']
+    key = get_aggregation_key(notification_data, aggregate_on, now)
+    
+    with transaction.atomic():
+        aggregate = Notification.objects.select_for_update().filter(user=user, aggregation_key=key).first()
+        if aggregate is None:
+            try:
+                with transaction.atomic():
+                    notification = Notification.objects.create(
+                        aggregation_key=key,
+                        latest_actor_ids=[actor.id],
+                        last_delivered_at=now,
+                        **notification_data
+                    )
+                return notification, True
+            except IntegrityError:
+                # Another request created the aggregate first
+                aggregate = Notification.objects.select_for_update().get(user=user, aggregation_key=key)
+        
+        if actor.id in aggregate.latest_actor_ids:
+            # Repeat action by a recent actor (e.g. unlike then like again)
+            return aggregate, False
+        
+        latest = [actor.id] + aggregate.latest_actor_ids[:LATEST_ACTORS_KEPT - 1]
+        Notification.objects.filter(pk=aggregate.pk).update(
+            actor=actor,
+            actor_count=F('actor_count') + 1,
+            latest_actor_ids=latest,
+            payload=notification_data['payload'],
+            is_read=False,
+            created_at=now,
+            updated_at=now,
+        )
+        aggregate.refresh_from_db()
+        aggregate.message = aggregate.title[:200]
+        aggregate.save(update_fields=['message'])
+    
+    return aggregate, claim_delivery(aggregate, now)
+
+
+def claim_delivery(notification: Notification, now=None) -> bool:
+    """Atomically take the delivery slot for an aggregate if its interval has passed"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=AGGREGATE_DELIVERY_INTERVAL)
+    claimed = Notification.objects.filter(pk=notification.pk).filter(
+        Q(last_delivered_at__isnull=True) | Q(last_delivered_at__lte=cutoff)
+    ).update(last_delivered_at=now)
+    return claimed == 1
+
+
 def broadcast_notification(notification: Notification):
     """
     Broadcast notification to user's WebSocket group
@@ -84,12 +214,43 @@ def broadcast_notification(notification: Notification):
             }
         )
         
+        if notification.verb == 'follow' and notification.actor:
+            # Clients listening on the messaging socket still expect this event
+            async_to_sync(channel_layer.group_send)(
+                f"user_{notification.user.id}",
+                follow_event(notification, notification_data)
+            )
+        
         logger.debug(f"Broadcasted notification {notification.id} to user {notification.user.id}")
         
     except Exception as e:
         logger.error(f"Failed to broadcast notification {notification.id}: {e}")
 
 
+def follow_event(notification: Notification, notification_data: Dict) -> Dict:
+    """Legacy 'follow_notification' event built from a follow Notification"""
+    follower = notification.actor
+    avatar = None
+    try:
+        avatar = follower.profile.avatar
+    except Exception as e:
+        logger.debug(f"Error getting avatar for {follower.username}: {e}")
+    return {
+        'type': 'follow_notification',
+        # Clients key follow notifications on this id and mark them read with it
+        'follow_id': notification.id,
+        'follower': {
+            'id': follower.id,
+            'username': follower.username,
+            'full_name': follower.get_full_name() or follower.username,
+            'profile_picture': avatar
+        },
+        'message': notification.title,
+        'timestamp': notification.created_at.isoformat(),
+        'notification': notification_data
+    }
+
+
 def send_push_notifications(notification: Notification):
     """
     Send push notifications to all user's active devices
@@ -297,7 +458,7 @@ def create_follow_notification(follower: User, followed: User):
     )
 
 
-def create_reaction_notification(reactor: User, message_owner: User, reaction_type: str):
+def create_reaction_notification(reactor: User, message_owner: User, reaction_type: str, message_id=None):
     """
     Create notification for message reaction
     """
@@ -312,10 +473,50 @@ def create_reaction_notification(reactor: User, message_owner: User, reaction_ty
             "reaction_type": reaction_type,
             "reactor_username": reactor.username
         },
-        message=f"{reactor.get_full_name() or reactor.username} reacted {reaction_type} to your message"
+        message=f"{reactor.get_full_name() or reactor.username} reacted {reaction_type} to your message",
+        aggregate_on=f"message:{message_id}" if message_id else None
     )
 
 
+def create_like_notification(liker: User, post):
+    """
+    Create notification for a new post like
+    """
+    if liker.id == post.user_id:
+        return  # Don't notify self
+    
+    return create_notification(
+        user=post.user,
+        verb="like",
+        actor=liker,
+        target=post,
+        payload={
+            "post_id": post.id,
+            "post_title": post.title
+        },
+        message=f"{liker.get_full_name() or liker.username} liked your post"
+    )
+
+
+def create_project_award_notifications(project, freelancer: User, rejected_freelancers: List[User]):
+    """
+    Notify the selected freelancer and, in one batch, every rejected applicant
+    """
+    client = project.client
+    client_name = client.get_full_name() or client.username
+    payload = {"project_id": project.id, "project_title": project.title}
+    
+    create_bulk_notifications(
+        [freelancer], verb="project_awarded", actor=client, target=project, payload=payload,
+        message=f"{client_name} hired you for {project.title}"[:200], push=True
+    )
+    if rejected_freelancers:
+        create_bulk_notifications(
+            rejected_freelancers, verb="application_rejected", actor=client, target=project, payload=payload,
+            message=f"{client_name} selected another freelancer for {project.title}"[:200]
+        )
+
+
 def create_reply_notification(replier: User, original_sender: User, reply_content: str):
     """
     Create notification for message reply
@@ -340,14 +541,17 @@ def create_reply_notification(replier: User, original_sender: User, reply_conten
 def cleanup_old_notifications(days: int = 30):
     """
     Clean up old read notifications
+    
+    Kept for existing callers; deletes in batches via core.retention_utils.
     """
+    from .retention_utils import delete_in_batches
     from datetime import timedelta
     
     cutoff_date = timezone.now() - timedelta(days=days)
-    deleted_count, _ = Notification.objects.filter(
+    deleted_count = delete_in_batches(Notification.objects.filter(
         is_read=True,
         created_at__lt=cutoff_date
-    ).delete()
+    ))
     
     logger.info(f"Cleaned up {deleted_count} old notifications")
     return deleted_count
@@ -0,0 +1,101 @@
+# backend/core/retention_utils.py
+"""
+Notification retention.
+
+Old notifications are removed in bounded batches, oldest first, with a short
+pause between batches so a purge never holds long locks or produces one huge
+transaction. Retention is configured per verb:
+
+    NOTIFICATION_RETENTION_POLICIES = {'message': 14, 'follow': 60, '*': 30}
+
+Days apply to read notifications; '*' covers any verb without its own entry.
+Unread notifications are only purged when NOTIFICATION_UNREAD_RETENTION_DAYS
+is set.
+Run `python manage.py purge_notifications` from a scheduler (e.g. daily cron).
+"""
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_POLICIES = {'*': 30}
+RETENTION_BATCH_SIZE = getattr(settings, 'NOTIFICATION_RETENTION_BATCH_SIZE', 1000)
+RETENTION_BATCH_PAUSE = getattr(settings, 'NOTIFICATION_RETENTION_BATCH_PAUSE', 0.1)
+
+
+def get_retention_policies() -> Dict[str, int]:
+    policies = dict(DEFAULT_RETENTION_POLICIES)
+    policies.update(getattr(settings, 'NOTIFICATION_RETENTION_POLICIES', {}))
+    return policies
+
+
+def delete_in_batches(queryset, batch_size: int = RETENTION_BATCH_SIZE,
+                      pause: float = RETENTION_BATCH_PAUSE, dry_run: bool = False,
+                      order_field: str = 'created_at') -> int:
+    """
+    Delete rows matching queryset, batch_size at a time and oldest first.
+
+    Each batch selects primary keys then deletes by key, so every statement
+    touches a bounded, index-friendly range. Returns rows matched (dry run)
+    or deleted.
+    """
+    if dry_run:
+        return queryset.count()
+
+    model = queryset.model
+    total = 0
+    while True:
+        ids = list(queryset.order_by(order_field).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return total
+        deleted, _ = model.objects.filter(pk__in=ids).delete()
+        total += deleted
+        if len(ids) < batch_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def purge_notifications(policies: Optional[Dict[str, int]] = None,
+                        unread_days: Optional[int] = None,
+                        batch_size: int = RETENTION_BATCH_SIZE,
+                        pause: float = RETENTION_BATCH_PAUSE,
+                        dry_run: bool = False) -> Dict[str, int]:
+    """
+    Apply retention policies.
+
+    Returns rows removed per policy, keyed like 'notification:read:message',
+    'notification:read:*' and 'notification:unread'.
+    """
+    from .models import Notification
+
+    policies = policies if policies is not None else get_retention_policies()
+    if unread_days is None:
+        unread_days = getattr(settings, 'NOTIFICATION_UNREAD_RETENTION_DAYS', None)
+
+    now = timezone.now()
+    options = {'batch_size': batch_size, 'pause': pause, 'dry_run': dry_run}
+    metrics = {}
+
+    explicit_verbs = [verb for verb in policies if verb != '*']
+    for verb, days in policies.items():
+        read = Notification.objects.filter(is_read=True, created_at__lt=now - timedelta(days=days))
+        if verb == '*':
+            read = read.exclude(verb__in=explicit_verbs)
+        else:
+            read = read.filter(verb=verb)
+        metrics[f'notification:read:{verb}'] = delete_in_batches(read, **options)
+
+    if unread_days is not None:
+        unread = Notification.objects.filter(is_read=False, created_at__lt=now - timedelta(days=unread_days))
+        metrics['notification:unread'] = delete_in_batches(unread, **options)
+
+    action = 'would remove' if dry_run else 'removed'
+    for policy, rows in metrics.items():
+        logger.info(f"notification_retention policy={policy} rows_{action.replace(' ', '_')}={rows}")
+    logger.info(f"notification_retention total_{action.replace(' ', '_')}={sum(metrics.values())}")
+    return metrics
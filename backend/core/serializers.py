@@ -9,6 +9,7 @@ from .models import (
 )
 from .cloudinary_utils import get_optimized_avatar_url, validate_cloudinary_url
 from .asset_utils import validate_asset_price, validate_asset_tags
+from .fieldset_utils import SparseFieldsetMixin
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -25,13 +26,29 @@ class UserSerializer(serializers.ModelSerializer):
             'password': {'write_only': True},
         }
     
+    def _get_batched_follow_stats(self, obj):
+        """Follow stats precomputed by the view (see get_follow_stats_map), if any"""
+        follow_stats = self.context.get('follow_stats')
+        if follow_stats is not None:
+            return follow_stats.get(obj.id)
+        return None
+    
     def get_followers_count(self, obj):
+        stats = self._get_batched_follow_stats(obj)
+        if stats is not None:
+            return stats['followers_count']
         return obj.get_followers_count()
     
     def get_following_count(self, obj):
+        stats = self._get_batched_follow_stats(obj)
+        if stats is not None:
+            return stats['following_count']
         return obj.get_following_count()
     
     def get_is_following(self, obj):
+        stats = self._get_batched_follow_stats(obj)
+        if stats is not None:
+            return stats['is_following']
         user = self.context.get('request').user if self.context.get('request') else None
         return user.is_authenticated and user.is_following(obj) if user else False
     
@@ -413,8 +430,12 @@ class PortfolioItemSerializer(serializers.ModelSerializer):
         validated_data.pop('user', None)
         return super().update(instance, validated_data)
 
-class PublicUserProfileSerializer(serializers.ModelSerializer):
-    """Serializer for public user profiles (only public information)"""
+class PublicUserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Serializer for public user profiles (only public information).
+    Lists leave out portfolio items, stats, recognitions and the cover photo
+    size variants unless requested with ?expand=.
+    """
     userId = serializers.IntegerField(source='user.id', read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
     display_name = serializers.SerializerMethodField()
@@ -432,6 +453,7 @@ class PublicUserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'userId', 'username', 'display_name', 'user_type', 'avatar', 'cover_photo',
                            'bio', 'headline', 'skills', 'skills_list', 'location', 'website', 
                            'member_since', 'portfolio_items', 'recognitions_list', 'stats']
+        expandable_fields = ['portfolio_items', 'stats', 'recognitions_list', 'cover_photo_variants']
     
     def get_display_name(self, obj):
         """Get user's display name with fallback to username"""
@@ -466,40 +488,36 @@ class PublicUserProfileSerializer(serializers.ModelSerializer):
         """Override to ensure safe field values and required user info"""
         data = super().to_representation(instance)
         
-        # Ensure userId and username are always present
-        if 'userId' not in data or data['userId'] is None:
+        # Ensure requested identity fields are always present
+        if self.includes('userId') and data.get('userId') is None:
             data['userId'] = instance.user.id if instance.user else None
         
-        if 'username' not in data or not data['username']:
+        if self.includes('username') and not data.get('username'):
             data['username'] = instance.user.username if instance.user else ''
         
         # Ensure display_name is never empty
-        if not data.get('display_name'):
-            data['display_name'] = data['username'] or 'Anonymous'
+        if self.includes('display_name') and not data.get('display_name'):
+            data['display_name'] = (instance.user.username if instance.user else '') or 'Anonymous'
         
         # Ensure skills field is never null/undefined - provide empty string fallback
-        if data.get('skills') is None:
+        if self.includes('skills') and data.get('skills') is None:
             data['skills'] = ''
             
         # Ensure other string fields are never null
         for field in ['bio', 'headline', 'location', 'website', 'user_type']:
-            if data.get(field) is None:
+            if self.includes(field) and data.get(field) is None:
                 data[field] = ''
                 
         # Ensure user_type has a default
-        if not data.get('user_type'):
+        if self.includes('user_type') and not data.get('user_type'):
             data['user_type'] = 'creator'
         
-        # Add optimized cover photo URLs if cover photo exists
-        if data.get('cover_photo'):
-            data['cover_photo_small'] = get_optimized_avatar_url(data['cover_photo'], size=600)
-            data['cover_photo_medium'] = get_optimized_avatar_url(data['cover_photo'], size=1200)
-            data['cover_photo_large'] = get_optimized_avatar_url(data['cover_photo'], size=1920)
-        else:
-            # Ensure optimized cover photo fields are empty strings if no cover photo
-            data['cover_photo_small'] = ''
-            data['cover_photo_medium'] = ''
-            data['cover_photo_large'] = ''
+        # Add optimized cover photo URLs (empty strings if no cover photo)
+        if self.includes('cover_photo_variants'):
+            cover_photo = instance.cover_photo
+            data['cover_photo_small'] = get_optimized_avatar_url(cover_photo, size=600) if cover_photo else ''
+            data['cover_photo_medium'] = get_optimized_avatar_url(cover_photo, size=1200) if cover_photo else ''
+            data['cover_photo_large'] = get_optimized_avatar_url(cover_photo, size=1920) if cover_photo else ''
                 
         return data
     
@@ -573,7 +591,7 @@ class ServiceSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'slug']
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     tags_list = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
@@ -596,6 +614,9 @@ class BlogPostSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            liked_blog_post_ids = self.context.get('liked_blog_post_ids')
+            if liked_blog_post_ids is not None:
+                return obj.id in liked_blog_post_ids
             return obj.blog_likes.filter(user=request.user).exists()
         return False
     
@@ -620,7 +641,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         else:
             return obj.created_at.strftime("%b %d, %Y")
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Enhanced notification serializer with actor, verb, and payload support
     """
@@ -633,9 +654,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = [
             'id', 'user', 'actor', 'verb', 'title', 'message', 'payload',
-            'target_name', 'is_read', 'created_at', 'updated_at'
+            'target_name', 'actor_count', 'latest_actor_ids', 'is_read', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'user', 'actor', 'actor_count', 'latest_actor_ids'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'user', 'actor']
     
     def get_target_name(self, obj):
         """Get a string representation of the target object"""
@@ -674,7 +697,7 @@ class AssetCategorySerializer(serializers.ModelSerializer):
         model = AssetCategory
         fields = '__all__'
 
-class CreativeAssetSerializer(serializers.ModelSerializer):
+class CreativeAssetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     seller = UserSerializer(read_only=True)
     category = AssetCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(queryset=AssetCategory.objects.all(), source='category', write_only=True)
@@ -702,6 +725,9 @@ class CreativeAssetSerializer(serializers.ModelSerializer):
         """Check if current user has purchased this asset"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            purchased_asset_ids = self.context.get('purchased_asset_ids')
+            if purchased_asset_ids is not None:
+                return obj.id in purchased_asset_ids
             return obj.assetpurchase_set.filter(buyer=request.user).exists()
         return False
     
@@ -793,16 +819,16 @@ class UserWithProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'userprofile']
         read_only_fields = ['id', 'date_joined']
 
-class FreelancerProfileSerializer(serializers.ModelSerializer):
+class FreelancerProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserWithProfileSerializer(read_only=True)
     success_rate = serializers.ReadOnlyField()
     
     class Meta:
         model = FreelancerProfile
-        fields = '__all__'
-        read_only_fields = ['id', 'user', 'rating', 'total_jobs', 'completed_jobs', 'created_at']
+        exclude = ['skills']  # Derived from UserProfile.skills
+        read_only_fields = ['id', 'user', 'rating', 'rating_sum', 'rating_count', 'total_jobs', 'completed_jobs', 'created_at']
 
-class CreatorProfileSerializer(serializers.ModelSerializer):
+class CreatorProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserWithProfileSerializer(read_only=True)
     creator_type_display = serializers.CharField(source='get_creator_type_display', read_only=True)
     experience_level_display = serializers.CharField(source='get_experience_level_display', read_only=True)
@@ -812,7 +838,7 @@ class CreatorProfileSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'user', 'followers_count', 'created_at']
 
-class ClientProfileSerializer(serializers.ModelSerializer):
+class ClientProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserWithProfileSerializer(read_only=True)
     client_type_display = serializers.CharField(source='get_client_type_display', read_only=True)
     completion_rate = serializers.ReadOnlyField()
@@ -820,14 +846,15 @@ class ClientProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = ClientProfile
         fields = '__all__'
-        read_only_fields = ['id', 'user', 'projects_posted', 'projects_completed', 'total_spent', 'created_at']
+        read_only_fields = ['id', 'user', 'projects_posted', 'projects_completed', 'total_spent',
+                           'rating', 'rating_sum', 'rating_count', 'created_at']
 
 class ProjectCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = ProjectCategory
         fields = '__all__'
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     client = UserSerializer(read_only=True)
     category = ProjectCategorySerializer(read_only=True)
     selected_freelancer = UserSerializer(read_only=True)
@@ -836,7 +863,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['skills']  # Derived from required_skills
         read_only_fields = ['id', 'client', 'selected_freelancer', 'created_at', 'updated_at']
     
     def get_applications_count(self, obj):
@@ -872,14 +899,17 @@ class ProjectContractSerializer(serializers.ModelSerializer):
 class ProjectReviewSerializer(serializers.ModelSerializer):
     reviewer = UserSerializer(read_only=True)
     reviewee = UserSerializer(read_only=True)
+    reviewee_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), source='reviewee', write_only=True
+    )
     
     class Meta:
         model = ProjectReview
         fields = '__all__'
-        read_only_fields = ['id', 'reviewer', 'reviewee', 'created_at']
+        read_only_fields = ['id', 'reviewer', 'reviewee', 'review_type', 'created_at']
 
 # Social Media Serializers for Posts, Likes, and Comments
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     tags_list = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
@@ -902,6 +932,9 @@ class PostSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            liked_post_ids = self.context.get('liked_post_ids')
+            if liked_post_ids is not None:
+                return obj.id in liked_post_ids
             return obj.likes.filter(user=request.user).exists()
         return False
     
@@ -949,6 +982,10 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'post', 'like_count', 'created_at', 'updated_at']
     
     def get_replies(self, obj):
+        # Trees assembled by load_comment_thread carry their replies already
+        replies = getattr(obj, 'thread_replies', None)
+        if replies is not None:
+            return CommentSerializer(replies, many=True, context=self.context).data
         if obj.replies.exists():
             return CommentSerializer(obj.replies.all(), many=True, context=self.context).data
         return []
@@ -956,6 +993,9 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            liked_comment_ids = self.context.get('liked_comment_ids')
+            if liked_comment_ids is not None:
+                return obj.id in liked_comment_ids
             return obj.comment_likes.filter(user=request.user).exists()
         return False
     
@@ -1009,6 +1049,10 @@ class BlogCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'blog_post', 'like_count', 'created_at', 'updated_at']
     
     def get_replies(self, obj):
+        # Trees assembled by load_comment_thread carry their replies already
+        replies = getattr(obj, 'thread_replies', None)
+        if replies is not None:
+            return BlogCommentSerializer(replies, many=True, context=self.context).data
         if obj.replies.exists():
             return BlogCommentSerializer(obj.replies.all(), many=True, context=self.context).data
         return []
@@ -1016,6 +1060,9 @@ class BlogCommentSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            liked_comment_ids = self.context.get('liked_comment_ids')
+            if liked_comment_ids is not None:
+                return obj.id in liked_comment_ids
             return obj.comment_likes.filter(user=request.user).exists()
         return False
     
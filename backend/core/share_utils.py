@@ -0,0 +1,193 @@
+"""
+Pre-rendered social share artifacts for blog posts.
+
+Crawlers (WhatsApp, Facebook, Telegram, ...) re-fetch share URLs every time a
+post is passed around. The share page HTML, the redirect stub for regular
+browsers and the meta-tag payload are rendered once per BlogPost revision and
+kept in the cache, so repeat hits are served without touching the database or
+the template engine.
+
+Cache keys carry a per-slug generation number; saving or deleting a post bumps
+the generation, which orphans every rendition of the previous revision.
+"""
+import hashlib
+import json
+import re
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import BlogPost
+
+SHARE_CACHE_TIMEOUT = getattr(settings, 'SHARE_CACHE_TIMEOUT', 60 * 60 * 24)
+SHARE_MAX_AGE = getattr(settings, 'SHARE_MAX_AGE', 300)
+
+CRAWLER_AGENTS = [
+    'facebookexternalhit', 'twitterbot', 'linkedinbot', 'whatsapp',
+    'telegrambot', 'slackbot', 'discordbot', 'google', 'bing'
+]
+
+# Saves touching only these fields do not change what crawlers see
+COUNTER_FIELDS = {'like_count', 'comment_count', 'view_count'}
+
+
+def is_crawler(request):
+    user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
+    return any(bot in user_agent for bot in CRAWLER_AGENTS)
+
+
+def _generation_key(slug):
+    return f'share:blog:gen:{slug}'
+
+
+def _artifact_key(slug, generation, host):
+    return f'share:blog:{slug}:{generation}:{host}'
+
+
+def _etag(body):
+    return '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+
+
+def build_meta(blog, request):
+    """Meta-tag payload for a blog post"""
+    description = blog.excerpt or (blog.content[:160] + '...' if blog.content else '')
+    description = re.sub(r'<[^>]+>', '', description)  # Remove HTML tags
+    description = description.replace('\n', ' ').replace('\r', '').strip()
+
+    author = blog.author
+    author_name = 'Vikra Hub'
+    if author:
+        author_name = (author.first_name and author.last_name and
+                       f"{author.first_name} {author.last_name}") or author.username or 'Vikra Hub'
+
+    return {
+        'title': f"{blog.title} | Vikra Hub",
+        'description': description,
+        'image': blog.image or request.build_absolute_uri('/vikrahub-hero.jpg'),
+        'url': request.build_absolute_uri(f'/blog/{blog.slug}'),
+        'type': 'article',
+        'site_name': 'Vikra Hub',
+        'author': author_name,
+        'published_time': blog.created_at.isoformat(),
+        'modified_time': blog.updated_at.isoformat(),
+        'section': blog.category or 'Blog',
+        'tags': blog.get_tags_list()
+    }
+
+
+def _render_redirect_page(blog, meta):
+    return f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="utf-8">
+                <title>{meta['title']}</title>
+                <meta name="description" content="{meta['description']}">
+                <meta property="og:title" content="{meta['title']}">
+                <meta property="og:description" content="{meta['description']}">
+                <meta property="og:image" content="{meta['image']}">
+                <meta property="og:url" content="{meta['url']}">
+                <meta property="og:type" content="article">
+                <script>window.location.href = '/#/blog/{blog.slug}';</script>
+            </head>
+            <body>
+                <p>Redirecting to <a href="/#/blog/{blog.slug}">{blog.title}</a>...</p>
+            </body>
+            </html>
+            """
+
+
+def render_share_artifacts(blog, request):
+    """Render every share representation of a blog post"""
+    meta = build_meta(blog, request)
+    context = {
+        'blog': blog,
+        'title': meta['title'],
+        'description': meta['description'],
+        'image': meta['image'],
+        'url': meta['url'],
+        'og_type': 'article',
+        'structured_data_type': 'Article',
+        'article': {
+            'author': meta['author'],
+            'published_time': meta['published_time'],
+            'modified_time': meta['modified_time'],
+            'section': meta['section'],
+            'tags': meta['tags']
+        }
+    }
+    crawler_html = render_to_string('blog_share.html', context, request=request)
+    redirect_html = _render_redirect_page(blog, meta)
+    meta_json = json.dumps(meta, sort_keys=True)
+
+    return {
+        'last_modified': blog.updated_at.timestamp(),
+        'meta': meta,
+        'crawler_html': crawler_html,
+        'redirect_html': redirect_html,
+        'etags': {
+            'crawler_html': _etag(crawler_html),
+            'redirect_html': _etag(redirect_html),
+            'meta': _etag(meta_json),
+        },
+    }
+
+
+def get_share_artifacts(slug, request):
+    """
+    Cached share artifacts for a published blog post, or None if there is no
+    such post. Only a cache miss touches the database and templates.
+    """
+    generation = cache.get(_generation_key(slug), 0)
+    key = _artifact_key(slug, generation, request.get_host())
+    artifacts = cache.get(key)
+    if artifacts is not None:
+        return artifacts
+
+    blog = BlogPost.objects.select_related('author').filter(slug=slug, published=True).first()
+    if blog is None:
+        return None
+
+    artifacts = render_share_artifacts(blog, request)
+    cache.set(key, artifacts, SHARE_CACHE_TIMEOUT)
+    return artifacts
+
+
+def conditional_share_response(request, artifacts, variant, response):
+    """
+    Attach validators for one artifact variant and answer 304 when the
+    client already holds the current revision
+    """
+    etag = artifacts['etags'][variant]
+    last_modified = int(artifacts['last_modified'])
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={SHARE_MAX_AGE}'
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def invalidate_share_artifacts(slug):
+    """Orphan every cached rendition for a slug"""
+    if not slug:
+        return
+    key = _generation_key(slug)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='share_blog_saved')
+def invalidate_share_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    invalidate_share_artifacts(instance.slug)
+
+
+@receiver(post_delete, sender=BlogPost, dispatch_uid='share_blog_deleted')
+def invalidate_share_on_delete(sender, instance, **kwargs):
+    invalidate_share_artifacts(instance.slug)
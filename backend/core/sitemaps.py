@@ -2,12 +2,60 @@
 VikraHub SEO Sitemaps
 This module defines sitemap classes for different sections of the VikraHub platform
 to improve search engine optimization and discoverability.
+
+/sitemap.xml is a sitemap index pointing at one child sitemap per section,
+split into chunks of SITEMAP_CHUNK_SIZE URLs (sitemap-<section>.xml?p=N).
+Each chunk only loads its own slice of rows (and only the columns needed for
+the URL), and rendered XML is cached under a key built from the section's row
+count and latest lastmod, so any publish, edit or delete produces a fresh key.
 """
 
+import hashlib
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps import views as sitemap_views
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
 from django.urls import reverse
 from django.utils import timezone
-from .models import BlogPost
+from .models import BlogPost, Post
+
+SITEMAP_CHUNK_SIZE = getattr(settings, 'SITEMAP_CHUNK_SIZE', 5000)
+SITEMAP_CACHE_TIMEOUT = getattr(settings, 'SITEMAP_CACHE_TIMEOUT', 60 * 60 * 6)
+
+
+class ModelSitemap(Sitemap):
+    """
+    Base class for sitemaps backed by a queryset.
+    
+    Subclasses set `lastmod_field` and implement `queryset()`; items are paged
+    in primary key order so chunk boundaries stay stable as content grows.
+    """
+    limit = SITEMAP_CHUNK_SIZE
+    protocol = 'https'
+    lastmod_field = 'updated_at'
+    location_fields = ('pk',)
+
+    def queryset(self):
+        raise NotImplementedError
+
+    def items(self):
+        return self.queryset().only(*self.location_fields, self.lastmod_field).order_by('pk')
+
+    def lastmod(self, obj):
+        return getattr(obj, self.lastmod_field)
+
+    def get_latest_lastmod(self):
+        """Latest lastmod via an aggregate instead of loading every item"""
+        return self.queryset().aggregate(latest=Max(self.lastmod_field))['latest']
+
+    def cache_token(self):
+        """Changes whenever an item in the section is added, edited or removed"""
+        stats = self.queryset().aggregate(count=Count('pk'), latest=Max(self.lastmod_field))
+        latest = stats['latest'].isoformat() if stats['latest'] else ''
+        return f"{stats['count']}:{latest}"
 
 
 class StaticViewSitemap(Sitemap):
@@ -38,22 +86,18 @@ class StaticViewSitemap(Sitemap):
         return timezone.now().date()
 
 
-class BlogSitemap(Sitemap):
+class BlogSitemap(ModelSitemap):
     """
     Sitemap for blog posts.
     Includes all published blog posts with dynamic lastmod dates.
     """
     changefreq = 'daily'
     priority = 0.6
-    protocol = 'https'
+    location_fields = ('pk', 'slug')
 
-    def items(self):
+    def queryset(self):
         """Return all published blog posts"""
-        return BlogPost.objects.filter(published=True).order_by('-updated_at')
-
-    def lastmod(self, obj):
-        """Return the last modification date for each blog post"""
-        return obj.updated_at
+        return BlogPost.objects.filter(published=True)
 
     def location(self, obj):
         """Return the URL for each blog post"""
@@ -62,6 +106,37 @@ class BlogSitemap(Sitemap):
         return f'/blog/{obj.slug}/'
 
 
+class PublicProfileSitemap(ModelSitemap):
+    """
+    Sitemap for public user profiles.
+    """
+    changefreq = 'weekly'
+    priority = 0.5
+    lastmod_field = 'date_joined'
+    location_fields = ('pk', 'username')
+
+    def queryset(self):
+        """Return active users that have a profile"""
+        return User.objects.filter(is_active=True, userprofile__isnull=False)
+
+    def location(self, obj):
+        return f'/profile/{obj.username}'
+
+
+class PostSitemap(ModelSitemap):
+    """
+    Sitemap for public community posts.
+    """
+    changefreq = 'weekly'
+    priority = 0.4
+
+    def queryset(self):
+        return Post.objects.filter(is_public=True)
+
+    def location(self, obj):
+        return f'/posts/{obj.pk}'
+
+
 class APISitemap(Sitemap):
     """
     Sitemap for important API endpoints that should be discoverable.
@@ -86,23 +161,60 @@ class APISitemap(Sitemap):
         return timezone.now().date()
 
 
-class PortfolioSitemap(Sitemap):
-    """
-    Future sitemap for portfolio pages.
-    This can be expanded when you want individual portfolio items to be indexed.
-    """
-    priority = 0.4
-    changefreq = 'weekly'
-    protocol = 'https'
-
-    def items(self):
-        """Return portfolio-related static pages"""
-        return []  # Add portfolio URL names when ready
-
-    def location(self, item):
-        """Return the URL for portfolio pages"""
-        return reverse(item)
-
-    def lastmod(self, obj):
-        """Return last modification date"""
-        return timezone.now().date()
+# Every location must be a route in frontend/src/App.js
+SITEMAPS = {
+    'static': StaticViewSitemap,
+    'blog': BlogSitemap,
+    'profiles': PublicProfileSitemap,
+    'posts': PostSitemap,
+    'api': APISitemap,
+}
+
+
+def _cache_token(sitemap):
+    if isinstance(sitemap, ModelSitemap):
+        return sitemap.cache_token()
+    # Static sections report today's date as lastmod
+    return timezone.now().date().isoformat()
+
+
+def _cached_xml(request, key_parts, render):
+    """Return cached sitemap XML for key_parts, rendering it on a miss"""
+    digest = hashlib.md5('|'.join(key_parts).encode('utf-8')).hexdigest()
+    key = f'sitemap:{request.get_host()}:{digest}'
+    cached = cache.get(key)
+    if cached is None:
+        response = render()
+        response.render()
+        cached = (response.content, response.get('Last-Modified'))
+        cache.set(key, cached, SITEMAP_CACHE_TIMEOUT)
+    
+    content, last_modified = cached
+    response = HttpResponse(content, content_type='application/xml')
+    if last_modified:
+        response['Last-Modified'] = last_modified
+    response['X-Robots-Tag'] = 'noindex, noodp, noarchive'
+    return response
+
+
+def sitemap_index(request):
+    """Sitemap index listing every chunk of every section"""
+    tokens = [f'{name}={_cache_token(site())}' for name, site in SITEMAPS.items()]
+    return _cached_xml(
+        request,
+        ['index', str(SITEMAP_CHUNK_SIZE)] + tokens,
+        lambda: sitemap_views.index(request, SITEMAPS, sitemap_url_name='sitemap_section'),
+    )
+
+
+def sitemap_section(request, section):
+    """One chunk (?p=N) of a section sitemap"""
+    if section not in SITEMAPS:
+        raise Http404(f"No sitemap available for section: {section!r}")
+    page = request.GET.get('p', '1')
+    token = _cache_token(SITEMAPS[section]())
+    return _cached_xml(
+        request,
+        ['section', section, page, str(SITEMAP_CHUNK_SIZE), token],
+        lambda: sitemap_views.sitemap(request, SITEMAPS, section=section),
+    )
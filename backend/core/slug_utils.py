@@ -0,0 +1,76 @@
+"""
+Unique slug allocation for slugged models.
+
+The next free suffix is found with a single prefix query instead of probing
+candidates one by one, and the save is retried inside a savepoint if a
+concurrent writer claims the same slug first.
+"""
+import re
+import logging
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def build_base_slug(value, max_length, fallback='item'):
+    """Slugify value, leaving room for a numeric suffix within max_length"""
+    base_slug = slugify(value or '') or fallback
+    # Reserve space for "-<counter>" so suffixed slugs still fit the column
+    return base_slug[:max(1, max_length - 8)].strip('-') or fallback
+
+
+def next_available_slug(model, base_slug, field='slug', exclude_pk=None):
+    """
+    Return base_slug or base_slug-N using one query over existing slugs.
+
+    N is one greater than the highest numeric suffix currently in use, so the
+    result does not depend on how many collisions the title has had.
+    """
+    queryset = model._default_manager.filter(**{f'{field}__startswith': base_slug})
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    existing = set(queryset.values_list(field, flat=True))
+
+    if base_slug not in existing:
+        return base_slug
+
+    suffix_pattern = re.compile(rf'^{re.escape(base_slug)}-(\d+)$')
+    highest = 0
+    for slug in existing:
+        match = suffix_pattern.match(slug)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return f"{base_slug}-{highest + 1}"
+
+
+def save_with_unique_slug(instance, source_value, save, *args, field='slug', **kwargs):
+    """
+    Assign a unique slug derived from source_value and persist the instance.
+
+    `save` is the model's underlying save callable (usually ``super().save``).
+    Each attempt runs in its own savepoint; if another writer takes the slug
+    between the lookup and the insert, the suffix is recomputed and retried.
+    """
+    model = type(instance)
+    max_length = model._meta.get_field(field).max_length or 50
+    base_slug = build_base_slug(source_value, max_length, fallback=model._meta.model_name)
+
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        slug = next_available_slug(model, base_slug, field=field, exclude_pk=instance.pk)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                save(*args, **kwargs)
+            return slug
+        except IntegrityError:
+            # Only retry when the collision was on the slug itself
+            if not model._default_manager.filter(**{field: slug}).exclude(pk=instance.pk).exists():
+                raise
+            logger.info(f"Slug '{slug}' taken concurrently for {model.__name__}, retrying")
+
+    raise IntegrityError(
+        f"Could not allocate a unique {field} for {model.__name__} after {SLUG_SAVE_ATTEMPTS} attempts"
+    )
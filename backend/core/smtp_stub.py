@@ -0,0 +1,109 @@
+"""
+Minimal local SMTP server for exercising real SMTP delivery without a relay.
+
+Speaks just enough of RFC 5321 (HELO/EHLO, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT) for smtplib and Django's SMTP backend. Accepted messages are kept in
+memory, and the server counts sessions so connection reuse can be checked.
+
+    with LocalSMTPServer() as server:
+        with override_settings(EMAIL_HOST=server.host, EMAIL_PORT=server.port, ...):
+            ...
+        server.messages, server.session_count
+
+Set `fail_next` to reject that many upcoming messages with a transient 451.
+"""
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        server = self.server.owner
+        with server.lock:
+            server.session_count += 1
+
+        self._reply('220 localhost LocalSMTPServer ready')
+        envelope = {'from': None, 'to': []}
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            command = line[:4].upper()
+
+            if command in ('HELO', 'EHLO'):
+                self._reply('250 localhost')
+            elif command == 'MAIL':
+                envelope = {'from': line.split(':', 1)[-1].strip(), 'to': []}
+                self._reply('250 OK')
+            elif command == 'RCPT':
+                envelope['to'].append(line.split(':', 1)[-1].strip())
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b'..') else chunk)
+                with server.lock:
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        accepted = False
+                    else:
+                        server.messages.append({
+                            'from': envelope['from'],
+                            'to': envelope['to'],
+                            'data': b''.join(data).decode('utf-8', 'replace'),
+                        })
+                        accepted = True
+                self._reply('250 OK' if accepted else '451 Temporary local failure')
+            elif command == 'RSET':
+                envelope = {'from': None, 'to': []}
+                self._reply('250 OK')
+            elif command == 'NOOP':
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """Threaded in-process SMTP sink bound to an ephemeral localhost port"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.session_count = 0
+        self.fail_next = 0
+        self._server = _ThreadingTCPServer((host, port), _SMTPHandler)
+        self._server.owner = self
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
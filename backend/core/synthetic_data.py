@@ -0,0 +1,499 @@
+"""
+Deterministic synthetic data at production-like volumes.
+
+SyntheticDataGenerator writes users with their profiles, follows, posts, blog
+posts, comments, likes, creative assets, purchases, reviews, projects,
+conversations and messages using bulk_create in fixed-size batches. Rows
+are streamed: memory holds the id lists of users, posts, blog posts, assets
+and conversations plus one batch, not the generated rows, so follows, likes,
+purchases, reviews and messages can run to millions. Likes and purchases are
+unique because each user's targets are drawn without repeats; reviews pick
+purchases by selection sampling over the stored rows. Every choice comes from
+one seeded Random, so the same seed and volumes always produce the same graph.
+
+Follows are drawn from a Zipf-like distribution over a fixed popularity
+ranking: a few accounts collect most followers and the long tail has few,
+as in production. Authors of posts, blog posts and assets are picked the same
+way. bulk_create skips signals, so counters, rollups and running metrics are
+recomputed once at the end.
+
+    generator = SyntheticDataGenerator(seed=7)
+    generator.generate(users=10000, posts=200000)
+    generator.counts
+"""
+import datetime
+import logging
+import random
+import uuid
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db.models import Avg, Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .follow_models import Follow
+from .models import (
+    AssetCategory, AssetPurchase, AssetReview, BlogComment, BlogLike, BlogPost, ClientProfile, Comment,
+    CreativeAsset, CreatorProfile, FreelancerProfile, Like, Post, Project, ProjectCategory, Skill, UserProfile
+)
+from .marketplace_utils import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_PASSWORD = 'synthetic-password'
+
+DEFAULT_VOLUMES = {
+    'users': 1000,
+    'follows': 20,  # mean accounts followed per user
+    'posts': 5000,
+    'blog_posts': 500,
+    'comments': 10000,
+    'likes': 20000,
+    'assets': 500,
+    'purchases': 2000,
+    'reviews': 1000,
+    'projects': 1000,
+    'conversations': 2000,
+    'messages': 20000,
+}
+
+SKILL_POOL = [
+    'python', 'django', 'react', 'javascript', 'typescript', 'node.js', 'postgresql', 'aws', 'docker',
+    'graphic design', 'logo design', 'ui/ux design', 'illustration', 'photography', 'photo editing',
+    'video editing', 'copywriting', 'translation', 'seo', 'social media', 'data analysis', 'excel',
+    'flutter', 'kotlin', 'swift', 'wordpress', 'animation', 'music production', 'voice over', 'marketing',
+]
+WORDS = [
+    'juba', 'market', 'design', 'studio', 'river', 'sunrise', 'community', 'launch', 'portfolio', 'story',
+    'color', 'brand', 'music', 'photo', 'craft', 'city', 'culture', 'festival', 'project', 'update',
+]
+USER_TYPES = (('client', 5), ('freelancer', 3), ('creator', 2))
+PROJECT_STATUSES = (('open', 6), ('in_progress', 2), ('completed', 1), ('cancelled', 1))
+REVIEW_RATINGS = ((5, 5), (4, 3), (3, 1), (2, 0.5), (1, 0.5))
+
+
+def _weighted(rng, options):
+    values, weights = zip(*options)
+    return rng.choices(values, weights=weights)[0]
+
+
+class PopularityPicker:
+    """Picks ids with Zipf-like probability 1 / rank^exponent over a seeded ranking"""
+
+    def __init__(self, rng, ids, exponent=1.0):
+        self.rng = rng
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        total = 0.0
+        self.cum_weights = []
+        for rank in range(1, len(self.ids) + 1):
+            total += 1.0 / rank ** exponent
+            self.cum_weights.append(total)
+
+    def pick(self, k=1):
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+
+class SyntheticDataGenerator:
+
+    def __init__(self, seed=42, batch_size=5000, days=365, follow_exponent=1.0, log=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tag = f'syn{seed}'
+        self.batch_size = batch_size
+        self.follow_exponent = follow_exponent
+        self.now = timezone.now()
+        self.span_seconds = days * 86400
+        self.log = log or logger.info
+        self.counts = {}
+
+    # Helpers
+
+    def _timestamp(self):
+        return self.now - datetime.timedelta(seconds=self.rng.uniform(0, self.span_seconds))
+
+    def _text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _bulk(self, model, rows, label=None):
+        """bulk_create rows (any iterable) batch by batch; explicit timestamps are kept"""
+        auto_fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+        for field in auto_fields:
+            field.auto_now_add = False
+        created = 0
+        try:
+            batch = []
+            for row in rows:
+                for field in auto_fields:
+                    if getattr(row, field.attname) is None:
+                        setattr(row, field.attname, self.now)
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    created += len(model.objects.bulk_create(batch))
+                    batch = []
+            if batch:
+                created += len(model.objects.bulk_create(batch))
+        finally:
+            for field in auto_fields:
+                field.auto_now_add = True
+        if label:
+            self.counts[label] = self.counts.get(label, 0) + created
+            self.log(f'Created {created} {label}')
+        return created
+
+    def _new_ids(self, model, before_id, **filters):
+        return list(model.objects.filter(pk__gt=before_id, **filters).order_by('pk').values_list('pk', flat=True))
+
+    def _max_id(self, model):
+        return model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    def _per_user_pairs(self, count, draw, limit):
+        """
+        Up to `count` (user_id, target) pairs spread over all users, where
+        draw(k) returns k distinct targets. Pairs are unique because no user
+        draws a target twice, so only one user's targets are held at a time.
+        """
+        remaining = count
+        for index, user_id in enumerate(self.user_ids):
+            if remaining <= 0:
+                break
+            share = remaining / (len(self.user_ids) - index)
+            wanted = min(remaining, limit, int(self.rng.uniform(0, 2 * share) + 0.5))
+            targets = draw(wanted) if wanted else []
+            remaining -= len(targets)
+            for target in targets:
+                yield user_id, target
+
+    def _distinct_picks(self, picker, k):
+        """Up to k distinct ids from a PopularityPicker"""
+        picked = {}
+        for _ in range(3):
+            if len(picked) >= k:
+                break
+            picked.update(dict.fromkeys(picker.pick(k * 2)))
+        return list(picked)[:k]
+
+    def _unique_pairs(self, count, pick_left, pick_right, exclude_same=False):
+        """Up to `count` distinct (left, right) pairs; keeps every pair, so only for small volumes"""
+        seen = set()
+        attempts = 0
+        while len(seen) < count and attempts < count * 5:
+            attempts += 1
+            pair = (pick_left(), pick_right())
+            if exclude_same and pair[0] == pair[1]:
+                continue
+            if pair not in seen:
+                seen.add(pair)
+                yield pair
+
+    # Entities
+
+    def create_users(self, count):
+        password = make_password(SYNTHETIC_PASSWORD)
+        self._bulk(User, (
+            User(
+                username=f'{self.tag}_{i}', email=f'{self.tag}_{i}@example.com', password=password,
+                first_name=self.rng.choice(WORDS).title(), last_name=self.rng.choice(WORDS).title(),
+                is_active=True, date_joined=self._timestamp(),
+            )
+            for i in range(count)
+        ), 'users')
+        self.user_ids = list(
+            User.objects.filter(username__startswith=f'{self.tag}_').order_by('pk').values_list('pk', flat=True)
+        )
+        self.user_types = {user_id: _weighted(self.rng, USER_TYPES) for user_id in self.user_ids}
+        self.user_skills = {user_id: self.rng.sample(SKILL_POOL, self.rng.randint(2, 6)) for user_id in self.user_ids}
+        self.ids_by_type = {
+            user_type: [user_id for user_id in self.user_ids if self.user_types[user_id] == user_type]
+            for user_type, _ in USER_TYPES
+        }
+        self.popular_users = PopularityPicker(self.rng, self.user_ids, self.follow_exponent)
+
+        self._bulk(UserProfile, (
+            UserProfile(
+                user_id=user_id, user_type=self.user_types[user_id], headline=self._text(4),
+                bio=self._text(20), location='Juba, South Sudan', skills=', '.join(self.user_skills[user_id]),
+            )
+            for user_id in self.user_ids
+        ), 'user profiles')
+        # Every account also gets a client profile, as the user signal does
+        self._bulk(ClientProfile, (
+            ClientProfile(user_id=user_id, created_at=self._timestamp()) for user_id in self.user_ids
+        ), 'client profiles')
+        self._bulk(FreelancerProfile, (
+            FreelancerProfile(
+                user_id=user_id, title=self._text(2).title(), availability='Full-time',
+                skill_level=self.rng.choice(['beginner', 'intermediate', 'expert']),
+                hourly_rate=Decimal(self.rng.randint(5, 150)), years_experience=self.rng.randint(0, 15),
+                is_available=self.rng.random() < 0.8, created_at=self._timestamp(),
+            )
+            for user_id in self.ids_by_type['freelancer']
+        ), 'freelancer profiles')
+        self._bulk(CreatorProfile, (
+            CreatorProfile(
+                user_id=user_id, creator_type=self.rng.choice(['artist', 'photographer', 'designer']),
+                years_active=self.rng.randint(0, 20), is_featured=self.rng.random() < 0.05,
+                created_at=self._timestamp(),
+            )
+            for user_id in self.ids_by_type['creator']
+        ), 'creator profiles')
+
+        skill_ids = self._skill_ids()
+        links = FreelancerProfile.skills.through
+        profiles = FreelancerProfile.objects.filter(user_id__in=self.ids_by_type['freelancer']).values_list('pk', 'user_id')
+        self._bulk(links, (
+            links(freelancerprofile_id=profile_id, skill_id=skill_ids[name])
+            for profile_id, user_id in profiles.iterator() for name in normalize_skills(self.user_skills[user_id])
+        ))
+
+    def _skill_ids(self):
+        Skill.objects.bulk_create([Skill(name=name) for name in SKILL_POOL], ignore_conflicts=True)
+        return dict(Skill.objects.filter(name__in=SKILL_POOL).values_list('name', 'pk'))
+
+    def create_follows(self, mean_per_user):
+        user_count = len(self.user_ids)
+
+        def rows():
+            for follower_id in self.user_ids:
+                # Pareto(2) has mean 2, so out-degree averages mean_per_user
+                wanted = min(user_count - 1, int(self.rng.paretovariate(2.0) * mean_per_user / 2))
+                followed = {}
+                for _ in range(3):
+                    if len(followed) >= wanted:
+                        break
+                    followed.update(dict.fromkeys(self.popular_users.pick(wanted * 2)))
+                    followed.pop(follower_id, None)
+                for followed_id in list(followed)[:wanted]:
+                    yield Follow(id=self._uuid(), follower_id=follower_id, followed_id=followed_id,
+                                 created_at=self._timestamp())
+
+        self._bulk(Follow, rows(), 'follows')
+
+    def create_posts(self, count):
+        before = self._max_id(Post)
+        categories = [value for value, _ in Post.POST_CATEGORIES]
+        self._bulk(Post, (
+            Post(
+                user_id=self.popular_users.pick()[0], title=self._text(5).capitalize(), content=self._text(40),
+                category=self.rng.choice(categories), tags=', '.join(self.rng.sample(WORDS, 3)),
+                created_at=self._timestamp(),
+            )
+            for _ in range(count)
+        ), 'posts')
+        self.post_ids = self._new_ids(Post, before)
+
+    def create_blog_posts(self, count):
+        before = self._max_id(BlogPost)
+        self._bulk(BlogPost, (
+            BlogPost(
+                author_id=self.popular_users.pick()[0], title=self._text(6).capitalize(),
+                slug=f'{self.tag}-blog-{i}', content=self._text(200), excerpt=self._text(20),
+                tags=', '.join(self.rng.sample(WORDS, 3)), published=self.rng.random() < 0.9,
+                created_at=self._timestamp(),
+            )
+            for i in range(count)
+        ), 'blog posts')
+        self.blog_post_ids = self._new_ids(BlogPost, before)
+
+    def create_comments(self, count):
+        blog_share = count // 5 if self.blog_post_ids else 0
+        if self.post_ids:
+            self._bulk(Comment, (
+                Comment(post_id=self.rng.choice(self.post_ids), user_id=self.rng.choice(self.user_ids),
+                        content=self._text(12), created_at=self._timestamp())
+                for _ in range(count - blog_share)
+            ), 'comments')
+        if blog_share:
+            self._bulk(BlogComment, (
+                BlogComment(blog_post_id=self.rng.choice(self.blog_post_ids), user_id=self.rng.choice(self.user_ids),
+                            content=self._text(12), created_at=self._timestamp())
+                for _ in range(blog_share)
+            ), 'blog comments')
+
+    def create_likes(self, count):
+        blog_share = count // 5 if self.blog_post_ids else 0
+        if self.post_ids:
+            self._bulk(Like, (
+                Like(user_id=user_id, post_id=post_id, created_at=self._timestamp())
+                for user_id, post_id in self._per_user_pairs(
+                    count - blog_share, lambda k: self.rng.sample(self.post_ids, k), len(self.post_ids))
+            ), 'likes')
+        if blog_share:
+            self._bulk(BlogLike, (
+                BlogLike(user_id=user_id, blog_post_id=blog_id, created_at=self._timestamp())
+                for user_id, blog_id in self._per_user_pairs(
+                    blog_share, lambda k: self.rng.sample(self.blog_post_ids, k), len(self.blog_post_ids))
+            ), 'blog likes')
+
+    def create_assets(self, count):
+        categories = [
+            AssetCategory.objects.get_or_create(name=f'{self.tag} {name}')[0].pk
+            for name in ('graphics', 'templates', 'photos', 'audio')
+        ]
+        sellers = PopularityPicker(self.rng, self.ids_by_type['creator'] + self.ids_by_type['freelancer'] or self.user_ids)
+        asset_types = [value for value, _ in CreativeAsset.ASSET_TYPES]
+        before = self._max_id(CreativeAsset)
+        self._bulk(CreativeAsset, (
+            CreativeAsset(
+                title=self._text(3).title(), description=self._text(30), seller_id=sellers.pick()[0],
+                category_id=self.rng.choice(categories), asset_type=self.rng.choice(asset_types),
+                price=Decimal(self.rng.randint(1, 200)) if self.rng.random() < 0.8 else None,
+                tags=', '.join(self.rng.sample(WORDS, 4)),
+                created_at=self._timestamp(),
+            )
+            for _ in range(count)
+        ), 'assets')
+        self.asset_prices = dict(
+            CreativeAsset.objects.filter(pk__gt=before).order_by('pk').values_list('pk', 'price')
+        )
+        self.asset_ids = list(self.asset_prices)
+
+    def create_purchases(self, count):
+        self.purchases_before = self._max_id(AssetPurchase)
+        self.purchase_count = 0
+        if not self.asset_ids:
+            return
+        popular_assets = PopularityPicker(self.rng, self.asset_ids)
+        self.purchase_count = self._bulk(AssetPurchase, (
+            AssetPurchase(buyer_id=buyer_id, asset_id=asset_id, price_paid=self.asset_prices[asset_id] or 0,
+                          download_count=self.rng.randint(0, 5), purchase_date=self._timestamp())
+            for buyer_id, asset_id in self._per_user_pairs(
+                count, lambda k: self._distinct_picks(popular_assets, k), len(self.asset_ids))
+        ), 'purchases')
+
+    def create_reviews(self, count):
+        purchases = (
+            AssetPurchase.objects.filter(pk__gt=self.purchases_before).order_by('pk')
+            .values_list('buyer_id', 'asset_id').iterator(chunk_size=self.batch_size)
+        )
+
+        def rows():
+            # Selection sampling: each purchase is reviewed with probability needed / left
+            needed, left = min(count, self.purchase_count), self.purchase_count
+            for buyer_id, asset_id in purchases:
+                if needed <= 0:
+                    break
+                if self.rng.random() * left < needed:
+                    needed -= 1
+                    yield AssetReview(asset_id=asset_id, reviewer_id=buyer_id, rating=_weighted(self.rng, REVIEW_RATINGS),
+                                      comment=self._text(10), created_at=self._timestamp())
+                left -= 1
+
+        self._bulk(AssetReview, rows(), 'reviews')
+
+    def create_projects(self, count):
+        categories = [
+            ProjectCategory.objects.get_or_create(name=f'{self.tag} {name}')[0].pk
+            for name in ('development', 'design', 'writing', 'media')
+        ]
+        clients = self.ids_by_type['client'] or self.user_ids
+        skill_ids = self._skill_ids()
+        before = self._max_id(Project)
+        project_skills = []
+
+        def rows():
+            for _ in range(count):
+                skills = self.rng.sample(SKILL_POOL, self.rng.randint(1, 5))
+                budget = self.rng.randint(50, 5000)
+                project_skills.append(skills)
+                yield Project(
+                    title=self._text(4).capitalize(), description=self._text(60), client_id=self.rng.choice(clients),
+                    category_id=self.rng.choice(categories), budget_type=self.rng.choice(['fixed', 'hourly']),
+                    budget_min=Decimal(budget), budget_max=Decimal(budget * 2), required_skills=', '.join(skills),
+                    experience_level=self.rng.choice(['beginner', 'intermediate', 'expert']),
+                    status=_weighted(self.rng, PROJECT_STATUSES), created_at=self._timestamp(),
+                )
+
+        self._bulk(Project, rows(), 'projects')
+        links = Project.skills.through
+        self._bulk(links, (
+            links(project_id=project_id, skill_id=skill_ids[name])
+            for project_id, skills in zip(self._new_ids(Project, before), project_skills) for name in skills
+        ))
+
+    def create_conversations(self, count, message_count):
+        from messaging.models import Conversation, ConversationParticipant, Message
+
+        pairs = [
+            tuple(sorted(pair)) for pair in self._unique_pairs(
+                count, lambda: self.popular_users.pick()[0], lambda: self.rng.choice(self.user_ids), exclude_same=True)
+        ]
+        pairs = list(dict.fromkeys(pairs))
+        conversations = [(self._uuid(), pair, self._timestamp()) for pair in pairs]
+        self._bulk(Conversation, (
+            Conversation(id=conversation_id, created_at=started) for conversation_id, _, started in conversations
+        ), 'conversations')
+        self._bulk(ConversationParticipant, (
+            ConversationParticipant(conversation_id=conversation_id, user_id=user_id, joined_at=started)
+            for conversation_id, pair, started in conversations for user_id in pair
+        ))
+        if not conversations:
+            return
+
+        busy_conversations = PopularityPicker(self.rng, range(len(conversations)))
+
+        def rows():
+            for _ in range(message_count):
+                conversation_id, pair, started = conversations[busy_conversations.pick()[0]]
+                sender, recipient = pair if self.rng.random() < 0.5 else pair[::-1]
+                sent = started + (self.now - started) * self.rng.random()
+                yield Message(id=self._uuid(), conversation_id=conversation_id, sender_id=sender,
+                              recipient_id=recipient, content=self._text(12), created_at=sent)
+
+        self._bulk(Message, rows(), 'messages')
+
+    # Denormalized state
+
+    def refresh_aggregates(self):
+        """Recompute the counters, rollups and metrics that signals normally maintain"""
+        from .asset_utils import rebuild_seller_rollups
+        from .marketplace_utils import rebuild_profile_metrics
+
+        def count_of(model, column):
+            return Coalesce(Subquery(
+                model.objects.filter(**{column: OuterRef('pk')}).order_by().values(column)
+                .annotate(total=Count('pk')).values('total'),
+                output_field=IntegerField()
+            ), Value(0))
+
+        if getattr(self, 'post_ids', None):
+            Post.objects.filter(pk__in=self.post_ids).update(
+                like_count=count_of(Like, 'post'), comment_count=count_of(Comment, 'post')
+            )
+        if getattr(self, 'blog_post_ids', None):
+            BlogPost.objects.filter(pk__in=self.blog_post_ids).update(
+                like_count=count_of(BlogLike, 'blog_post'), comment_count=count_of(BlogComment, 'blog_post')
+            )
+        if getattr(self, 'asset_ids', None):
+            CreativeAsset.objects.filter(pk__in=self.asset_ids).update(
+                review_count=count_of(AssetReview, 'asset'),
+                downloads=count_of(AssetPurchase, 'asset'),
+                rating=Coalesce(Subquery(
+                    AssetReview.objects.filter(asset=OuterRef('pk')).order_by().values('asset')
+                    .annotate(average=Avg('rating')).values('average')
+                ), Value(0.0)),
+            )
+            sellers = set(CreativeAsset.objects.filter(pk__in=self.asset_ids).values_list('seller_id', flat=True))
+            rebuild_seller_rollups(list(sellers))
+        rebuild_profile_metrics()
+        self.log('Recomputed counters, seller rollups and profile metrics')
+
+    def generate(self, **volumes):
+        volumes = {**DEFAULT_VOLUMES, **{key: value for key, value in volumes.items() if value is not None}}
+        self.create_users(volumes['users'])
+        self.create_follows(volumes['follows'])
+        self.create_posts(volumes['posts'])
+        self.create_blog_posts(volumes['blog_posts'])
+        self.create_comments(volumes['comments'])
+        self.create_likes(volumes['likes'])
+        self.create_assets(volumes['assets'])
+        self.create_purchases(volumes['purchases'])
+        self.create_reviews(volumes['reviews'])
+        self.create_projects(volumes['projects'])
+        self.create_conversations(volumes['conversations'], volumes['messages'])
+        self.refresh_aggregates()
+        return self.counts
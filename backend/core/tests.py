@@ -1,10 +1,20 @@
 import json
-from django.test import TestCase
+import time
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import UserProfile
+from .models import (
+    UserProfile, BlogPost, Post, Like, Comment, CommentLike, BlogComment, BlogCommentLike,
+    BlogLike, ClientProfile, FreelancerProfile, Project, ProjectApplication, ProjectCategory
+)
 
 
 class PublicProfileAPITestCase(APITestCase):
@@ -216,3 +226,1715 @@ class PublicProfileListAPITestCase(APITestCase):
         usernames = [profile['username'] for profile in data]
         self.assertIn('user1', usernames)
         self.assertIn('user2', usernames)
+
+
+class BlogSlugAllocationTestCase(TestCase):
+    """Test cases for unique blog slug allocation"""
+    
+    def test_first_post_uses_plain_slug(self):
+        """A new title gets its slugified form without a suffix"""
+        post = BlogPost.objects.create(title='My First Post', content='Hello')
+        self.assertEqual(post.slug, 'my-first-post')
+    
+    def test_colliding_titles_get_increasing_suffixes(self):
+        """Repeated titles receive -1, -2, ... suffixes"""
+        slugs = [BlogPost.objects.create(title='My First Post', content='x').slug for _ in range(4)]
+        self.assertEqual(slugs, ['my-first-post', 'my-first-post-1', 'my-first-post-2', 'my-first-post-3'])
+    
+    def test_suffix_follows_highest_existing(self):
+        """The next suffix is one past the highest in use, not the first gap"""
+        BlogPost.objects.create(title='Gallery', content='x')
+        BlogPost.objects.create(title='Other', slug='gallery-7', content='x')
+        BlogPost.objects.create(title='Other', slug='gallery-walk', content='x')
+        post = BlogPost.objects.create(title='Gallery', content='x')
+        self.assertEqual(post.slug, 'gallery-8')
+    
+    def test_slug_lookup_is_single_query(self):
+        """Allocation costs one lookup regardless of the number of collisions"""
+        for _ in range(5):
+            BlogPost.objects.create(title='Popular Title', content='x')
+        # One prefix lookup plus the insert (and savepoint bookkeeping)
+        with self.assertNumQueries(4):
+            post = BlogPost.objects.create(title='Popular Title', content='x')
+        self.assertEqual(post.slug, 'popular-title-5')
+    
+    def test_explicit_slug_is_kept(self):
+        """A slug supplied by the caller is not rewritten"""
+        post = BlogPost.objects.create(title='Anything', slug='custom-slug', content='x')
+        self.assertEqual(post.slug, 'custom-slug')
+
+
+class CommentThreadQueryTestCase(APITestCase):
+    """Comment threads load in a fixed number of queries"""
+    
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', email='viewer@example.com')
+        self.authors = [
+            User.objects.create_user(username=f'author{i}', email=f'author{i}@example.com')
+            for i in range(3)
+        ]
+        self.post = Post.objects.create(user=self.authors[0], title='Thread', content='Body')
+        self.blog = BlogPost.objects.create(title='Blog Thread', content='Body', published=True)
+        self.client.force_authenticate(self.viewer)
+    
+    def _add_post_threads(self, count):
+        for i in range(count):
+            root = Comment.objects.create(post=self.post, user=self.authors[i % 3], content=f'root {i}')
+            reply = Comment.objects.create(post=self.post, user=self.authors[(i + 1) % 3], content='reply', parent=root)
+            Comment.objects.create(post=self.post, user=self.viewer, content='nested', parent=reply)
+            CommentLike.objects.create(user=self.viewer, comment=reply)
+    
+    def _add_blog_threads(self, count):
+        for i in range(count):
+            root = BlogComment.objects.create(blog_post=self.blog, user=self.authors[i % 3], content=f'root {i}')
+            reply = BlogComment.objects.create(blog_post=self.blog, user=self.viewer, content='reply', parent=root)
+            BlogCommentLike.objects.create(user=self.viewer, comment=reply)
+    
+    def _count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response.json()
+    
+    def test_post_comment_tree_is_constant_queries(self):
+        """Doubling the thread size does not add queries"""
+        url = reverse('post-comments', kwargs={'pk': self.post.pk})
+        self._add_post_threads(2)
+        small_count, small_data = self._count_queries(url)
+        self._add_post_threads(4)
+        large_count, large_data = self._count_queries(url)
+        
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(large_data), 6)
+        reply = large_data[0]['replies'][0]
+        self.assertTrue(reply['is_liked'])
+        self.assertFalse(large_data[0]['is_liked'])
+        self.assertEqual(reply['replies'][0]['content'], 'nested')
+    
+    def test_post_comment_tree_pages_top_level(self):
+        """?page= pages over top-level comments and keeps their replies"""
+        self._add_post_threads(5)
+        url = reverse('post-comments', kwargs={'pk': self.post.pk})
+        _, data = self._count_queries(url, {'page': 2, 'page_size': 2})
+        
+        self.assertEqual(data['count'], 5)
+        self.assertEqual([c['content'] for c in data['results']], ['root 2', 'root 3'])
+        self.assertEqual(len(data['results'][0]['replies']), 1)
+        self.assertEqual(data['results'][0]['replies'][0]['replies'][0]['content'], 'nested')
+    
+    def test_post_comment_page_loads_only_its_own_replies(self):
+        """A page fetches its roots' replies level by level, not the whole thread"""
+        self._add_post_threads(5)
+        loaded = []
+        from_db = Comment.from_db.__func__
+        
+        def recording_from_db(cls, db, field_names, values):
+            instance = from_db(cls, db, field_names, values)
+            loaded.append(instance.content)
+            return instance
+        
+        url = reverse('post-comments', kwargs={'pk': self.post.pk})
+        with mock.patch.object(Comment, 'from_db', classmethod(recording_from_db)):
+            _, data = self._count_queries(url, {'page': 1, 'page_size': 2})
+        
+        self.assertEqual([c['content'] for c in data['results']], ['root 0', 'root 1'])
+        self.assertEqual(sorted(loaded), sorted(['root 0', 'root 1'] + ['reply'] * 2 + ['nested'] * 2))
+    
+    def test_blog_comment_tree_is_constant_queries(self):
+        """Blog threads share the same constant-query loading"""
+        url = reverse('blog_comments', kwargs={'blog_id': self.blog.pk})
+        self._add_blog_threads(2)
+        small_count, _ = self._count_queries(url)
+        self._add_blog_threads(4)
+        large_count, data = self._count_queries(url)
+        
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(data), 6)
+        self.assertTrue(data[0]['replies'][0]['is_liked'])
+
+
+class FeedQueryCountTestCase(APITestCase):
+    """Feed endpoints resolve viewer likes and authors per page, not per item"""
+    
+    # Page query + liked ids + follower/following counts + viewer follows
+    FEED_QUERY_BUDGET = 5
+    
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='reader', email='reader@example.com')
+        self.authors = [
+            User.objects.create_user(username=f'writer{i}', email=f'writer{i}@example.com')
+            for i in range(4)
+        ]
+        self.viewer.follow(self.authors[0])
+        self.client.force_authenticate(self.viewer)
+    
+    def _create_posts(self, count):
+        for i in range(count):
+            author = self.authors[i % len(self.authors)]
+            post = Post.objects.create(user=author, title=f'Post {i}', content='Body')
+            blog = BlogPost.objects.create(author=author, title=f'Blog {i}', content='Body', published=True)
+            if i % 2 == 0:
+                Like.objects.create(user=self.viewer, post=post)
+                BlogLike.objects.create(user=self.viewer, blog_post=blog)
+    
+    def test_post_list_query_count(self):
+        """PostViewSet.list stays within the budget as the feed grows"""
+        self._create_posts(8)
+        with self.assertNumQueries(self.FEED_QUERY_BUDGET):
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        data = response.json()
+        self.assertEqual(len(data), 8)
+        liked = {item['title']: item['is_liked'] for item in data}
+        self.assertTrue(liked['Post 0'])
+        self.assertFalse(liked['Post 1'])
+        following = {item['user']['username']: item['user']['is_following'] for item in data}
+        self.assertTrue(following['writer0'])
+        self.assertFalse(following['writer1'])
+    
+    def test_blog_all_posts_query_count(self):
+        """BlogPostViewSet.all_posts stays within the budget as the feed grows"""
+        self._create_posts(8)
+        with self.assertNumQueries(self.FEED_QUERY_BUDGET):
+            response = self.client.get(reverse('blogpost-all-posts'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        data = response.json()
+        self.assertEqual(data['count'], 8)
+        liked = {item['title']: item['is_liked'] for item in data['results']}
+        self.assertTrue(liked['Blog 2'])
+        self.assertFalse(liked['Blog 3'])
+    
+    def test_blog_my_posts_query_count(self):
+        """BlogPostViewSet.my_posts uses the same batched context"""
+        self.client.force_authenticate(self.authors[0])
+        self._create_posts(8)
+        with self.assertNumQueries(self.FEED_QUERY_BUDGET):
+            response = self.client.get(reverse('blogpost-my-posts'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 2)
+
+
+class HomeTimelineTestCase(APITestCase):
+    """Home feed built from follow edges with fan-out-on-write and on-read"""
+    
+    def setUp(self):
+        from .timeline_utils import HIGH_FOLLOWER_CACHE_KEY
+        cache.delete(HIGH_FOLLOWER_CACHE_KEY)
+        self.reader = User.objects.create_user(username='timeline_reader', email='tr@example.com')
+        self.creator = User.objects.create_user(username='timeline_creator', email='tc@example.com')
+        self.stranger = User.objects.create_user(username='timeline_stranger', email='ts@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.follow(self.creator)
+        self.client.force_authenticate(self.reader)
+    
+    def _publish(self, count, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                Post.objects.create(user=user or self.creator, title=f'Post {i}', content='Body')
+    
+    def test_followed_posts_are_fanned_out(self):
+        """New posts from followed accounts appear; strangers' posts do not"""
+        self._publish(2)
+        self._publish(1, user=self.stranger)
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPost.objects.create(author=self.creator, title='Blog', content='Body', published=True)
+        
+        response = self.client.get(reverse('home_feed'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual([item['type'] for item in results], ['blog_post', 'post', 'post'])
+        self.assertEqual(results[1]['item']['title'], 'Post 1')
+    
+    def test_cursor_pagination_has_no_gaps_or_duplicates(self):
+        """Walking the cursor yields every item exactly once"""
+        self._publish(7)
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(reverse('home_feed'), params).json()
+            seen.extend((item['type'], item['id']) for item in data['results'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+    
+    def test_unfollow_prunes_feed(self):
+        """Unfollowing removes that account's items from the stored feed"""
+        self._publish(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.unfollow(self.creator)
+        self.assertEqual(self.client.get(reverse('home_feed')).json()['results'], [])
+    
+    def test_high_follower_accounts_are_merged_on_read(self):
+        """Accounts over the threshold are not fanned out but still appear"""
+        from .models import FeedEntry
+        from .timeline_utils import HIGH_FOLLOWER_CACHE_KEY
+        with mock.patch('core.timeline_utils.TIMELINE_FANOUT_THRESHOLD', 1):
+            cache.delete(HIGH_FOLLOWER_CACHE_KEY)
+            self._publish(2)
+            self._publish(1, user=self.reader)
+            self.assertFalse(FeedEntry.objects.filter(actor=self.creator).exists())
+            
+            results = self.client.get(reverse('home_feed')).json()['results']
+        cache.delete(HIGH_FOLLOWER_CACHE_KEY)
+        self.assertEqual(len(results), 3)
+
+
+class SellerStatsRollupTestCase(APITestCase):
+    """Seller stats come from aggregates and an incrementally kept daily rollup"""
+    
+    def setUp(self):
+        from .models import AssetCategory, CreativeAsset
+        self.seller = User.objects.create_user(username='rollup_seller', email='rs@example.com')
+        self.buyers = [
+            User.objects.create_user(username=f'rollup_buyer{i}', email=f'rb{i}@example.com')
+            for i in range(3)
+        ]
+        category = AssetCategory.objects.create(name='Graphics')
+        self.assets = [
+            CreativeAsset.objects.create(
+                title=f'Asset {i}', description='Desc', seller=self.seller, category=category,
+                asset_type='graphic', price=Decimal('10.00'), tags='a,b', is_active=(i != 2)
+            )
+            for i in range(3)
+        ]
+    
+    def _sell_and_review(self):
+        from .asset_utils import process_asset_purchase
+        from .models import AssetReview
+        for buyer in self.buyers:
+            process_asset_purchase(buyer, self.assets[0])
+        process_asset_purchase(self.buyers[0], self.assets[1])
+        AssetReview.objects.create(asset=self.assets[0], reviewer=self.buyers[0], rating=5)
+        AssetReview.objects.create(asset=self.assets[0], reviewer=self.buyers[1], rating=2)
+    
+    def test_stats_match_raw_rows(self):
+        """Totals from the rollup match the purchases and reviews written"""
+        from .asset_utils import get_seller_stats
+        self._sell_and_review()
+        stats = get_seller_stats(self.seller)
+        self.assertEqual(stats['total_assets'], 3)
+        self.assertEqual(stats['active_assets'], 2)
+        self.assertEqual(stats['total_downloads'], 4)
+        self.assertEqual(stats['total_revenue'], Decimal('40.00'))
+        self.assertEqual(stats['total_reviews'], 2)
+        self.assertAlmostEqual(stats['average_rating'], 3.5)
+    
+    def test_rollup_follows_edits_and_deletes(self):
+        """Rating edits and deletions are applied to the rollup as deltas"""
+        from .asset_utils import get_seller_stats
+        from .models import AssetPurchase, AssetReview
+        self._sell_and_review()
+        review = AssetReview.objects.get(reviewer=self.buyers[1])
+        review.rating = 4
+        review.save()
+        self.assertAlmostEqual(get_seller_stats(self.seller)['average_rating'], 4.5)
+        
+        review.delete()
+        AssetPurchase.objects.filter(buyer=self.buyers[2]).delete()
+        stats = get_seller_stats(self.seller)
+        self.assertEqual(stats['total_reviews'], 1)
+        self.assertEqual(stats['total_revenue'], Decimal('30.00'))
+    
+    def test_rebuild_matches_incremental_rollup(self):
+        """Recomputing the rollup from raw rows gives the same answer"""
+        from .asset_utils import get_seller_stats, rebuild_seller_rollups
+        self._sell_and_review()
+        before = get_seller_stats(self.seller)
+        rebuild_seller_rollups([self.seller.id])
+        self.assertEqual(get_seller_stats(self.seller), before)
+    
+    def test_seller_stats_query_count(self):
+        """Stats cost a fixed number of queries however many sales exist"""
+        from .asset_utils import get_seller_stats
+        self._sell_and_review()
+        with self.assertNumQueries(2):
+            get_seller_stats(self.seller)
+    
+    def test_seller_stats_endpoint_daily_breakdown(self):
+        """A date range adds a per-day breakdown to the endpoint response"""
+        self._sell_and_review()
+        self.client.force_authenticate(self.seller)
+        today = timezone.localdate().isoformat()
+        response = self.client.get(
+            reverse('creativeasset-seller-stats'), {'start': today, 'end': today}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['daily']), 1)
+        self.assertEqual(response.data['daily'][0]['sales'], 4)
+        
+        response = self.client.get(reverse('creativeasset-seller-stats'), {'start': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ShareArtifactCacheTestCase(APITestCase):
+    """Share pages and meta payloads are rendered once per blog revision"""
+    
+    CRAWLER_UA = 'facebookexternalhit/1.1'
+    
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='share_author', email='sa@example.com')
+        self.blog = BlogPost.objects.create(
+            author=self.author, title='Shared Post', content='<p>Hello world</p>', published=True
+        )
+        self.share_url = f'/blog/{self.blog.slug}/'
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_repeat_crawler_hits_skip_database(self):
+        """Only the first crawler hit renders; later hits come from cache"""
+        first = self.client.get(self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn(b'Shared Post', first.content)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+    
+    def test_conditional_requests_get_304(self):
+        """Matching ETag or Last-Modified validators return Not Modified"""
+        first = self.client.get(self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA)
+        response = self.client.get(
+            self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA, HTTP_IF_NONE_MATCH=first['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(
+            self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        meta_url = reverse('blog_meta_tags', args=[self.blog.slug])
+        meta = self.client.get(meta_url)
+        self.assertEqual(meta.json()['description'], 'Hello world...')
+        response = self.client.get(meta_url, HTTP_IF_NONE_MATCH=meta['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_update_invalidates_but_counters_do_not(self):
+        """Editing the post re-renders; like/view counter saves keep the cache"""
+        first = self.client.get(self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA)
+        self.blog.increment_like_count()
+        with self.assertNumQueries(0):
+            self.client.get(self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA)
+        
+        self.blog.title = 'Edited Post'
+        self.blog.save()
+        response = self.client.get(
+            self.share_url, HTTP_USER_AGENT=self.CRAWLER_UA, HTTP_IF_NONE_MATCH=first['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'Edited Post', response.content)
+
+
+class SitemapTestCase(TestCase):
+    """Sitemap index with chunked, cached section sitemaps"""
+    
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='sitemap_author', email='sm@example.com')
+        for i in range(5):
+            BlogPost.objects.create(author=self.author, title=f'Sitemap Blog {i}', content='Body', published=True)
+            Post.objects.create(user=self.author, title=f'Sitemap Post {i}', content='Body')
+        BlogPost.objects.create(author=self.author, title='Draft', content='Body', published=False)
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_index_lists_chunks_for_every_section(self):
+        """Each section appears in the index, split into ?p= chunks"""
+        from .sitemaps import ModelSitemap
+        with mock.patch.object(ModelSitemap, 'limit', 2):
+            response = self.client.get(reverse('sitemap_index'))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        for section in ['static', 'blog', 'profiles', 'posts', 'api']:
+            self.assertIn(f'sitemap-{section}.xml', content)
+        for section in ['portfolio', 'assets']:
+            self.assertNotIn(f'sitemap-{section}.xml', content)
+        self.assertIn('sitemap-blog.xml?p=3', content)
+        self.assertNotIn('sitemap-blog.xml?p=4', content)
+    
+    def test_section_chunk_only_contains_its_slice(self):
+        """A chunk lists only its page of published items"""
+        from .sitemaps import ModelSitemap
+        with mock.patch.object(ModelSitemap, 'limit', 2):
+            response = self.client.get(reverse('sitemap_section', args=['blog']), {'p': 3})
+            self.assertEqual(response.content.decode().count('<url>'), 1)
+            self.assertEqual(
+                self.client.get(reverse('sitemap_section', args=['blog']), {'p': 4}).status_code, 404
+            )
+        self.assertNotIn(b'/blog/draft/', self.client.get(reverse('sitemap_section', args=['blog'])).content)
+        self.assertEqual(self.client.get(reverse('sitemap_section', args=['nope'])).status_code, 404)
+    
+    def test_chunks_are_cached_until_content_changes(self):
+        """Repeat hits cost one token query; publishing a post refreshes the chunk"""
+        url = reverse('sitemap_section', args=['blog'])
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        
+        BlogPost.objects.create(author=self.author, title='Fresh Blog', content='Body', published=True)
+        self.assertIn(b'/blog/fresh-blog/', self.client.get(url).content)
+
+
+class EmailQueueTestCase(TestCase):
+    """Outbound emails are queued and delivered in batches over one SMTP session"""
+    
+    def setUp(self):
+        from .smtp_stub import LocalSMTPServer
+        self.smtp = LocalSMTPServer().start()
+        self.addCleanup(self.smtp.stop)
+        self.smtp_settings = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=self.smtp.host, EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+        self.smtp_settings.enable()
+        self.addCleanup(self.smtp_settings.disable)
+    
+    def _queue(self, count):
+        from .email_queue import enqueue_email
+        return [
+            enqueue_email(f'Subject {i}', 'Body', [f'user{i}@example.com'], html_body='<p>Body</p>')
+            for i in range(count)
+        ]
+    
+    @override_settings(EMAIL_QUEUE_EAGER=False)
+    def test_enqueue_does_not_send(self):
+        """Queueing only writes a row; nothing reaches SMTP, even after commit"""
+        from .email_utils import send_welcome_email
+        from .models import OutboundEmail
+        user = User.objects.create_user(username='queued', email='queued@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(send_welcome_email(user))
+        self.assertEqual(self.smtp.session_count, 0)
+        self.assertEqual(OutboundEmail.objects.get().category, 'welcome')
+    
+    def test_eager_mode_sends_only_the_new_row(self):
+        """Eager delivery after commit sends the queued email, not other users' backlog"""
+        from .email_queue import enqueue_email
+        from .models import OutboundEmail
+        with override_settings(EMAIL_QUEUE_EAGER=False):
+            backlog = self._queue(3)
+        with override_settings(EMAIL_QUEUE_EAGER=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                email = enqueue_email('Eager', 'Body', ['eager@example.com'])
+        
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'sent')
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertEqual(
+            OutboundEmail.objects.filter(pk__in=[row.pk for row in backlog], status='pending').count(), 3
+        )
+    
+    def test_batch_reuses_one_connection(self):
+        """A batch is delivered over a single SMTP session"""
+        from .email_queue import process_email_queue
+        from .models import OutboundEmail
+        self._queue(5)
+        self.assertEqual(process_email_queue(), (5, 0))
+        self.assertEqual(len(self.smtp.messages), 5)
+        self.assertEqual(self.smtp.session_count, 1)
+        self.assertEqual(OutboundEmail.objects.filter(status='sent').count(), 5)
+    
+    def test_failures_retry_with_backoff_then_give_up(self):
+        """Transient failures are retried later; exhausted rows are marked failed"""
+        from .email_queue import process_email_queue, EMAIL_QUEUE_MAX_ATTEMPTS
+        from .models import OutboundEmail
+        email = self._queue(1)[0]
+        self.smtp.fail_next = 1
+        self.assertEqual(process_email_queue(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('451', email.last_error)
+        
+        # Not due yet, so nothing is claimed
+        self.assertEqual(process_email_queue(), (0, 0))
+        
+        self.smtp.fail_next = EMAIL_QUEUE_MAX_ATTEMPTS
+        for _ in range(EMAIL_QUEUE_MAX_ATTEMPTS - 1):
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            process_email_queue()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', EMAIL_QUEUE_MAX_ATTEMPTS))
+        self.assertEqual(self.smtp.messages, [])
+
+
+class EmailVerificationTokenTestCase(APITestCase):
+    """Hashed verification tokens, enforced expiry and the expiry sweeper"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='unverified', email='unverified@example.com')
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+    
+    def test_only_hash_is_stored_and_new_token_supersedes_old(self):
+        """The raw token is never persisted and resending retires the old token"""
+        from .models import EmailVerification
+        first = EmailVerification.create_for_user(self.user)
+        self.assertNotEqual(first.token_hash, first.token)
+        self.assertEqual(first.token_hash, EmailVerification.hash_token(first.token))
+        
+        second = EmailVerification.create_for_user(self.user)
+        self.assertEqual(list(EmailVerification.objects.filter(user=self.user)), [second])
+        self.assertEqual(EmailVerification.verify_token(first.token), (None, 'invalid'))
+    
+    def test_verify_endpoint_outcomes(self):
+        """Valid tokens verify once; expired tokens are refused by the query"""
+        from .models import EmailVerification
+        verification = EmailVerification.create_for_user(self.user)
+        url = reverse('user-verify-email')
+        
+        response = self.client.post(url, {'token': verification.token})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_active)
+        self.assertEqual(
+            self.client.post(url, {'token': verification.token}).data['message'], 'Email already verified'
+        )
+        
+        other = User.objects.create_user(username='late', email='late@example.com')
+        expired = EmailVerification.create_for_user(other)
+        EmailVerification.objects.filter(pk=expired.pk).update(expires_at=timezone.now())
+        response = self.client.post(url, {'token': expired.token})
+        self.assertEqual(response.data['error'], 'Verification token has expired')
+        self.assertEqual(self.client.post(url, {'token': 'bogus'}).status_code, 400)
+    
+    def test_sweeper_deletes_expired_rows_in_batches(self):
+        """Expired unverified rows go; live and recently verified rows stay"""
+        from datetime import timedelta
+        from .models import EmailVerification
+        users = [User.objects.create_user(username=f'sweep{i}', email=f'sweep{i}@example.com') for i in range(5)]
+        rows = [EmailVerification.create_for_user(user) for user in users]
+        past = timezone.now() - timedelta(days=1)
+        EmailVerification.objects.filter(pk__in=[row.pk for row in rows[:3]]).update(expires_at=past)
+        EmailVerification.objects.filter(pk=rows[3].pk).update(expires_at=past, is_verified=True)
+        
+        self.assertEqual(EmailVerification.sweep_expired(batch_size=2), 3)
+        self.assertEqual(
+            set(EmailVerification.objects.values_list('pk', flat=True)), {rows[3].pk, rows[4].pk}
+        )
+
+
+class NotificationRetentionTestCase(TestCase):
+    """Batched, per-verb notification retention"""
+    
+    def setUp(self):
+        from datetime import timedelta
+        from .models import Notification
+        self.user = User.objects.create_user(username='retained', email='retained@example.com')
+        self.actor = User.objects.create_user(username='retainer', email='retainer@example.com')
+        now = timezone.now()
+        self.old = now - timedelta(days=20)
+        self.ancient = now - timedelta(days=45)
+        for verb, created_at, is_read in [
+            ('message', self.old, True),
+            ('message', self.old, False),
+            ('like', self.old, True),
+            ('like', self.ancient, True),
+            ('like', self.ancient, True),
+            ('like', self.ancient, False),
+        ]:
+            notification = Notification.objects.create(user=self.user, actor=self.actor, verb=verb, is_read=is_read)
+            Notification.objects.filter(pk=notification.pk).update(created_at=created_at)
+    
+    def test_per_verb_policies_delete_only_expired_read_rows(self):
+        """Each verb uses its own window and unread rows are kept by default"""
+        from .models import Notification
+        from .retention_utils import purge_notifications
+        metrics = purge_notifications(policies={'message': 14, '*': 30}, batch_size=1, pause=0)
+        self.assertEqual(metrics['notification:read:message'], 1)
+        self.assertEqual(metrics['notification:read:*'], 2)
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 2)
+        self.assertEqual(Notification.objects.count(), 3)
+    
+    def test_dry_run_counts_without_deleting(self):
+        """Dry runs report matching rows only"""
+        from .models import Notification
+        from .retention_utils import purge_notifications
+        metrics = purge_notifications(policies={'*': 10}, unread_days=40, pause=0, dry_run=True)
+        self.assertEqual(metrics['notification:read:*'], 4)
+        self.assertEqual(metrics['notification:unread'], 1)
+        self.assertEqual(Notification.objects.count(), 6)
+    
+    def test_read_follow_notifications_are_purged(self):
+        """Follow notifications share the main table and its per-verb policies"""
+        from datetime import timedelta
+        from .models import Notification
+        from .retention_utils import purge_notifications
+        follow = Notification.objects.create(user=self.user, actor=self.actor, verb='follow', is_read=True)
+        Notification.objects.filter(pk=follow.pk).update(created_at=timezone.now() - timedelta(days=90))
+        metrics = purge_notifications(policies={'follow': 60, '*': 365}, pause=0)
+        self.assertEqual(metrics['notification:read:follow'], 1)
+        self.assertFalse(Notification.objects.filter(verb='follow').exists())
+
+
+class NotificationAggregationTestCase(TestCase):
+    """Likes, follows and reactions fold into one row per target and time bucket"""
+    
+    def setUp(self):
+        self.author = User.objects.create_user(username='popular', email='popular@example.com')
+        self.fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', first_name=f'Fan{i}')
+            for i in range(5)
+        ]
+        self.post = Post.objects.create(user=self.author, title='Viral', content='Body')
+    
+    @mock.patch('core.notification_utils.send_push_notifications')
+    @mock.patch('core.notification_utils.broadcast_notification')
+    def test_likes_bump_one_aggregate_and_rate_limit_delivery(self, broadcast, push):
+        """Many likes produce one row, one actor count and throttled delivery"""
+        from datetime import timedelta
+        from .models import Notification
+        from .notification_utils import create_like_notification
+        for fan in self.fans:
+            create_like_notification(fan, self.post)
+        
+        notification = Notification.objects.get(user=self.author)
+        self.assertEqual(notification.actor_count, 5)
+        self.assertEqual(notification.actor, self.fans[-1])
+        self.assertEqual(notification.latest_actor_ids, [fan.id for fan in reversed(self.fans)][:3])
+        self.assertEqual(notification.title, 'Fan4 and 4 others liked your post')
+        # First like delivers immediately; the rest fall inside the delivery interval
+        self.assertEqual(broadcast.call_count, 1)
+        self.assertEqual(push.call_count, 1)
+        
+        Notification.objects.filter(pk=notification.pk).update(last_delivered_at=timezone.now() - timedelta(hours=1))
+        create_like_notification(User.objects.create_user(username='late_fan', email='lf@example.com'), self.post)
+        self.assertEqual(broadcast.call_count, 2)
+    
+    @mock.patch('core.notification_utils.send_push_notifications')
+    @mock.patch('core.notification_utils.broadcast_notification')
+    def test_aggregates_split_by_target_bucket_and_repeat_actor(self, broadcast, push):
+        """Different targets or buckets get their own rows; repeat actors are not recounted"""
+        from datetime import timedelta
+        from .models import Notification
+        from .notification_utils import create_like_notification, create_message_notification
+        other_post = Post.objects.create(user=self.author, title='Other', content='Body')
+        create_like_notification(self.fans[0], self.post)
+        create_like_notification(self.fans[0], self.post)
+        create_like_notification(self.fans[1], other_post)
+        self.assertEqual(Notification.objects.filter(verb='like').count(), 2)
+        self.assertEqual(Notification.objects.get(target_object_id=self.post.id).actor_count, 1)
+        
+        later = timezone.now() + timedelta(days=1)
+        with mock.patch('core.notification_utils.timezone.now', return_value=later):
+            create_like_notification(self.fans[2], self.post)
+        self.assertEqual(Notification.objects.filter(verb='like').count(), 3)
+        
+        # Verbs outside the aggregated set still create one row each
+        create_message_notification(self.fans[0], self.author, 'hi')
+        create_message_notification(self.fans[0], self.author, 'hi again')
+        self.assertEqual(Notification.objects.filter(verb='message').count(), 2)
+
+
+class FollowNotificationPipelineTestCase(APITestCase):
+    """Follows are delivered through the main Notification pipeline"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='followed', email='followed@example.com')
+        self.followers = [
+            User.objects.create_user(username=f'follower{i}', email=f'follower{i}@example.com')
+            for i in range(3)
+        ]
+    
+    @mock.patch('core.notification_utils.send_push_notifications')
+    @mock.patch('core.notification_utils.broadcast_notification')
+    def test_follow_creates_main_notification(self, broadcast, push):
+        """Following through the API writes a Notification and lists it"""
+        from .models import Notification
+        self.client.force_authenticate(self.followers[0])
+        response = self.client.put(reverse('follow:follow-toggle', args=[self.user.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        notification = Notification.objects.get(user=self.user, verb='follow')
+        self.assertEqual(notification.actor, self.followers[0])
+        self.assertEqual(broadcast.call_count, 1)
+        
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('follow:follow-notifications'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['follower']['username'], 'follower0')
+        self.assertIsNone(response.data['results'][0]['read_at'])
+    
+    def test_legacy_follow_frame_carries_notification_id(self):
+        """The messaging socket frame is keyed by the id the REST list and mark-read use"""
+        from asgiref.sync import async_to_sync
+        from messaging.consumers import MessagingConsumer
+        from .models import Notification
+        from .notification_utils import follow_event
+        notification = Notification.objects.create(user=self.user, actor=self.followers[0], verb='follow')
+        event = follow_event(notification, {})
+        self.assertEqual(event['follow_id'], notification.id)
+        
+        consumer = MessagingConsumer()
+        consumer.send = mock.AsyncMock()
+        async_to_sync(consumer.follow_notification)(event)
+        frame = json.loads(consumer.send.call_args.kwargs['text_data'])
+        self.assertEqual(frame['type'], 'follow_notification')
+        self.assertEqual(frame['follow_id'], notification.id)
+        self.assertEqual(frame['follower']['username'], 'follower0')
+        
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('follow:follow-notifications'))
+        self.assertEqual(response.data['results'][0]['id'], frame['follow_id'])
+    
+    def test_mark_all_read_is_one_update(self):
+        """Mark-all issues a single UPDATE regardless of how many rows are unread"""
+        from .models import Notification
+        for follower in self.followers:
+            Notification.objects.create(user=self.user, actor=follower, verb='follow')
+        Notification.objects.create(user=self.user, actor=self.followers[0], verb='like')
+        
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('follow:mark-all-notifications-read'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(Notification.objects.filter(verb='follow', is_read=False).exists())
+        self.assertTrue(Notification.objects.filter(verb='like', is_read=False).exists())
+    
+    def test_mark_one_read_is_scoped_to_recipient(self):
+        """Another user's notification id is not found"""
+        from .models import Notification
+        notification = Notification.objects.create(user=self.user, actor=self.followers[0], verb='follow')
+        self.client.force_authenticate(self.followers[1])
+        url = reverse('follow:mark-notification-read', args=[notification.id])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_404_NOT_FOUND)
+        
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_read)
+
+
+class MarketplaceSearchTestCase(APITestCase):
+    """Skill filters use normalized Skill links and freelancers rank by coverage"""
+    
+    def setUp(self):
+        self.client_user = User.objects.create_user(username='client', email='client@example.com')
+        self.category = ProjectCategory.objects.create(name='Development')
+        self.project = Project.objects.create(
+            title='Shop backend', description='Build it', client=self.client_user, category=self.category,
+            budget_type='fixed', budget_min=Decimal('100'), budget_max=Decimal('500'),
+            required_skills='Python, Django ,  PostgreSQL', experience_level='expert'
+        )
+        self.freelancers = {}
+        for username, skills, rating in [
+            ('full', 'python, django, postgresql', '3.00'),
+            ('partial', 'Django, React', '5.00'),
+            ('none', 'Photography', '5.00'),
+        ]:
+            user = User.objects.create_user(username=username, email=f'{username}@example.com')
+            self.freelancers[username] = FreelancerProfile.objects.create(
+                user=user, title=username, hourly_rate=Decimal('20'), availability='Full-time',
+                skill_level='expert', rating=Decimal(rating)
+            )
+            user.userprofile.skills = skills
+            user.userprofile.save()
+    
+    def test_skills_are_normalized_and_synced(self):
+        """Comma strings become lowercase Skill links on save"""
+        from .marketplace_utils import normalize_skills
+        self.assertEqual(normalize_skills(' Python,python , UI/UX  Design,,'), ['python', 'ui/ux design'])
+        self.assertEqual(
+            sorted(self.project.skills.values_list('name', flat=True)), ['django', 'postgresql', 'python']
+        )
+        self.assertEqual(
+            sorted(self.freelancers['partial'].skills.values_list('name', flat=True)), ['django', 'react']
+        )
+        
+        self.project.required_skills = 'Go'
+        self.project.save()
+        self.assertEqual(list(self.project.skills.values_list('name', flat=True)), ['go'])
+    
+    def test_skill_filters_match_whole_skills(self):
+        """Filters match normalized skills, not substrings of the comma string"""
+        response = self.client.get('/api/projects/', {'skills': 'DJANGO'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual([p['id'] for p in results], [self.project.id])
+        
+        response = self.client.get('/api/projects/', {'skills': 'jang'})
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual(results, [])
+        
+        response = self.client.get('/api/freelancer-profiles/', {'skills': 'django'})
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual([f['id'] for f in results], [self.freelancers['partial'].id, self.freelancers['full'].id])
+    
+    def test_matching_freelancers_ranked_by_coverage(self):
+        """More shared skills outrank a higher rating"""
+        response = self.client.get(f'/api/projects/{self.project.id}/matching_freelancers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['required_skills'], 3)
+        ranked = [(r['id'], r['match_score'], r['match_ratio']) for r in response.data['results']]
+        self.assertEqual(ranked, [
+            (self.freelancers['full'].id, 3, 1.0),
+            (self.freelancers['partial'].id, 1, 0.33),
+        ])
+
+
+class SelectFreelancerTestCase(APITestCase):
+    """Awarding a project is atomic and batches the rejections"""
+    
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', first_name='Olive')
+        category = ProjectCategory.objects.create(name='Design')
+        self.project = Project.objects.create(
+            title='Logo', description='A logo', client=self.owner, category=category,
+            budget_type='fixed', budget_min=Decimal('50'), budget_max=Decimal('200'),
+            required_skills='Logo Design', experience_level='intermediate'
+        )
+        self.applicants = [
+            User.objects.create_user(username=f'applicant{i}', email=f'applicant{i}@example.com')
+            for i in range(4)
+        ]
+        for i, applicant in enumerate(self.applicants):
+            ProjectApplication.objects.create(
+                project=self.project, freelancer=applicant, cover_letter='Hire me',
+                proposed_rate=Decimal('150') if i == 0 else None
+            )
+        self.url = f'/api/projects/{self.project.id}/select_freelancer/'
+    
+    @mock.patch('core.notification_utils.send_push_notifications')
+    @mock.patch('core.notification_utils.broadcast_notification')
+    def test_award_updates_everything_in_bulk(self, broadcast, push):
+        """One UPDATE rejects the others and one INSERT notifies them"""
+        from .models import Notification, ProjectContract
+        self.client.force_authenticate(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {'freelancer_id': self.applicants[0].id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'in_progress')
+        self.assertEqual(self.project.selected_freelancer, self.applicants[0])
+        statuses = dict(ProjectApplication.objects.values_list('freelancer__username', 'status'))
+        self.assertEqual(statuses, {
+            'applicant0': 'accepted', 'applicant1': 'rejected', 'applicant2': 'rejected', 'applicant3': 'rejected'
+        })
+        contract = ProjectContract.objects.get(project=self.project)
+        self.assertEqual(contract.agreed_rate, Decimal('150'))
+        
+        sql = [q['sql'] for q in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith('UPDATE "core_projectapplication"')]), 2)
+        self.assertEqual(len([q for q in sql if q.startswith('INSERT INTO "core_notification"')]), 2)
+        self.assertEqual(Notification.objects.filter(verb='application_rejected').count(), 3)
+        self.assertEqual(Notification.objects.get(verb='project_awarded').user, self.applicants[0])
+        # Delivery happens after commit: four broadcasts, push only for the winner
+        self.assertEqual(broadcast.call_count, 4)
+        self.assertEqual(push.call_count, 1)
+    
+    def test_second_award_is_rejected(self):
+        """A project that is no longer open cannot be awarded again"""
+        from django.core.exceptions import ValidationError
+        from .marketplace_utils import award_project
+        from .models import ProjectContract
+        award_project(self.project.pk, self.owner, self.applicants[1].id)
+        with self.assertRaises(ValidationError):
+            award_project(self.project.pk, self.owner, self.applicants[2].id)
+        self.assertEqual(ProjectContract.objects.count(), 1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.selected_freelancer, self.applicants[1])
+    
+    def test_reopened_project_award_keeps_one_contract(self):
+        """Awarding a reopened project reuses its contract and never double counts the job"""
+        from django.core.exceptions import ValidationError
+        from .marketplace_utils import award_project
+        from .models import FreelancerProfile, ProjectContract
+        
+        def reopen():
+            Project.objects.filter(pk=self.project.pk).update(status='open', selected_freelancer=None)
+            ProjectApplication.objects.update(status='pending')
+        
+        self.applicants[1].userprofile.user_type = 'freelancer'
+        self.applicants[1].userprofile.save()
+        _, _, contract = award_project(self.project.pk, self.owner, self.applicants[1].id)
+        reopen()
+        _, _, again = award_project(self.project.pk, self.owner, self.applicants[1].id)
+        self.assertEqual(again.pk, contract.pk)
+        self.assertEqual(FreelancerProfile.objects.get(user=self.applicants[1]).total_jobs, 1)
+        
+        reopen()
+        with self.assertRaises(ValidationError):
+            award_project(self.project.pk, self.owner, self.applicants[2].id)
+        self.assertEqual(ProjectContract.objects.get().freelancer, self.applicants[1])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'open')
+        self.assertFalse(ProjectApplication.objects.exclude(status='pending').exists())
+    
+    def test_unknown_application_rolls_back(self):
+        """Selecting someone who did not apply changes nothing"""
+        outsider = User.objects.create_user(username='outsider', email='outsider@example.com')
+        self.client.force_authenticate(self.owner)
+        response = self.client.post(self.url, {'freelancer_id': outsider.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'open')
+        self.assertFalse(ProjectApplication.objects.exclude(status='pending').exists())
+
+
+class GoogleCertCacheTestCase(APITestCase):
+    """Google signing certificates are fetched once and reused until max-age"""
+    
+    CLIENT_ID = 'test-client.apps.googleusercontent.com'
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .google_cert_stub import LocalGoogleCertServer
+        cls.server = LocalGoogleCertServer(max_age=3600).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+    
+    def setUp(self):
+        from . import google_certs
+        google_certs.clear_cached_certs()
+        self.server.request_count = 0
+        self.server.fail_next = 0
+        patcher = mock.patch('core.google_certs.GOOGLE_CERTS_URL', self.server.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(google_certs.clear_cached_certs)
+    
+    def _age_cache(self, seconds_left, fetched_ago=3600):
+        """Move the cached entry's expiry and fetch time relative to now"""
+        import time
+        from . import google_certs
+        entry = dict(google_certs._local['entry'])
+        entry['expires_at'] = time.time() + seconds_left
+        entry['fetched_at'] = time.time() - fetched_ago
+        google_certs._local['entry'] = entry
+        cache.set(google_certs.CERTS_CACHE_KEY, entry)
+    
+    def test_certs_fetched_once_and_max_age_honored(self):
+        """Repeat verifications hit the cache; expiry follows Cache-Control"""
+        from . import google_certs
+        for _ in range(3):
+            token = self.server.sign_id_token({'email': 'repeat@example.com'}, audience=self.CLIENT_ID)
+            claims = google_certs.verify_google_id_token(token, self.CLIENT_ID)
+        self.assertEqual(claims['email'], 'repeat@example.com')
+        self.assertEqual(self.server.request_count, 1)
+        entry = google_certs._local['entry']
+        self.assertAlmostEqual(entry['expires_at'] - entry['fetched_at'], 3600, delta=1)
+        self.assertEqual(google_certs.parse_max_age('public, max-age=19790, must-revalidate'), 19790)
+    
+    def test_refresh_ahead_serves_cached_certs(self):
+        """Near expiry the cached set is served while one background refresh runs"""
+        import time
+        from . import google_certs
+        google_certs.get_google_certs()
+        self._age_cache(seconds_left=10)
+        google_certs.get_google_certs()
+        for _ in range(100):
+            if self.server.request_count == 2 and cache.get(google_certs.REFRESH_LOCK_KEY) is None:
+                break
+            time.sleep(0.02)
+        self.assertEqual(self.server.request_count, 2)
+        self.assertGreater(google_certs._local['entry']['expires_at'], time.time() + 3000)
+    
+    def test_key_rotation_and_stale_fallback(self):
+        """Unknown key ids force a refresh; fetch failures fall back to the cached set"""
+        from . import google_certs
+        google_certs.get_google_certs()
+        self._age_cache(seconds_left=3000)
+        new_key = self.server.rotate_key()
+        token = self.server.sign_id_token({'email': 'rotated@example.com'}, audience=self.CLIENT_ID, key_id=new_key)
+        self.assertEqual(google_certs.verify_google_id_token(token, self.CLIENT_ID)['email'], 'rotated@example.com')
+        self.assertEqual(self.server.request_count, 2)
+        
+        self._age_cache(seconds_left=-5)
+        self.server.fail_next = 1
+        self.assertEqual(google_certs.verify_google_id_token(token, self.CLIENT_ID)['email'], 'rotated@example.com')
+        self.assertEqual(self.server.request_count, 3)
+    
+    def test_rejects_wrong_audience_and_issuer(self):
+        """Tokens for another client or issuer are invalid"""
+        from . import google_certs
+        other = self.server.sign_id_token({'email': 'x@example.com'}, audience='someone-else')
+        with self.assertRaises(ValueError):
+            google_certs.verify_google_id_token(other, self.CLIENT_ID)
+        forged = self.server.sign_id_token({'email': 'x@example.com'}, audience=self.CLIENT_ID, issuer='evil.example.com')
+        with self.assertRaises(ValueError):
+            google_certs.verify_google_id_token(forged, self.CLIENT_ID)
+    
+    def test_google_login_creates_then_updates_user(self):
+        """The endpoint verifies locally and creates an active user with profile"""
+        claims = {'email': 'gina@example.com', 'given_name': 'Gina', 'family_name': 'Lado',
+                  'picture': 'https://res.cloudinary.com/demo/image/upload/gina.jpg'}
+        with mock.patch.dict('os.environ', {'GOOGLE_OAUTH2_CLIENT_ID': self.CLIENT_ID}):
+            token = self.server.sign_id_token(claims, audience=self.CLIENT_ID)
+            response = self.client.post('/api/auth/google/', {'id_token': token}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data['created'])
+            user = User.objects.get(email='gina@example.com')
+            self.assertTrue(user.is_active)
+            self.assertEqual(user.userprofile.avatar, claims['picture'])
+            
+            claims['family_name'] = 'Deng'
+            token = self.server.sign_id_token(claims, audience=self.CLIENT_ID)
+            response = self.client.post('/api/auth/google/', {'id_token': token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['created'])
+        self.assertEqual(response.data['user']['last_name'], 'Deng')
+        self.assertEqual(User.objects.filter(email='gina@example.com').count(), 1)
+        self.assertEqual(self.server.request_count, 1)
+    
+    def test_new_google_user_instance_matches_stored_activation(self):
+        """The returned user carries the is_active the database holds"""
+        from .google_auth import get_or_create_google_user
+        for email, verified in (('verified@example.com', True), ('unverified@example.com', False)):
+            user, _, created = get_or_create_google_user(email, 'New', 'User', None, email_verified=verified)
+            self.assertTrue(created)
+            self.assertEqual(user.is_active, verified)
+            self.assertEqual(User.objects.get(pk=user.pk).is_active, verified)
+
+
+class ProfileMetricsTestCase(APITestCase):
+    """Ratings, job counts and spend are maintained as running aggregates"""
+    
+    def setUp(self):
+        from .marketplace_utils import award_project
+        self.owner = User.objects.create_user(username='buyer', email='buyer@example.com')
+        self.worker = User.objects.create_user(username='maker', email='maker@example.com')
+        self.worker.userprofile.user_type = 'freelancer'
+        self.worker.userprofile.save()
+        category = ProjectCategory.objects.create(name='Video')
+        self.project = Project.objects.create(
+            title='Edit', description='Cut a video', client=self.owner, category=category,
+            budget_type='fixed', budget_min=Decimal('100'), budget_max=Decimal('300'),
+            required_skills='Video Editing', experience_level='expert'
+        )
+        ProjectApplication.objects.create(project=self.project, freelancer=self.worker, cover_letter='Me')
+        self.project, _, self.contract = award_project(self.project.pk, self.owner, self.worker.id)
+    
+    def _profiles(self):
+        return (FreelancerProfile.objects.get(user=self.worker),
+                ClientProfile.objects.get(user=self.owner))
+    
+    def test_reviews_update_rating_incrementally(self):
+        """Create, edit and delete each apply a delta to the reviewee's totals"""
+        from .models import ProjectReview
+        self.client.force_authenticate(self.owner)
+        response = self.client.post('/api/project-reviews/', {
+            'project': self.project.id, 'reviewee_id': self.worker.id, 'rating': 4, 'comment': 'Good'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        freelancer, _ = self._profiles()
+        self.assertEqual((freelancer.rating_sum, freelancer.rating_count, freelancer.rating), (4, 1, Decimal('4.00')))
+        
+        other = User.objects.create_user(username='second', email='second@example.com')
+        review = ProjectReview.objects.create(
+            project=self.project, reviewer=other, reviewee=self.worker, review_type='client_to_freelancer',
+            rating=5, comment='Great'
+        )
+        freelancer, _ = self._profiles()
+        self.assertEqual(freelancer.rating, Decimal('4.50'))
+        
+        review.rating = 2
+        review.save()
+        freelancer, _ = self._profiles()
+        self.assertEqual((freelancer.rating_sum, freelancer.rating), (6, Decimal('3.00')))
+        
+        review.delete()
+        freelancer, _ = self._profiles()
+        self.assertEqual((freelancer.rating_count, freelancer.rating), (1, Decimal('4.00')))
+        
+        self.client.force_authenticate(self.worker)
+        response = self.client.post('/api/project-reviews/', {
+            'project': self.project.id, 'reviewee_id': self.owner.id, 'rating': 3, 'comment': 'Fine'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        _, client_profile = self._profiles()
+        self.assertEqual(client_profile.rating, Decimal('3.00'))
+    
+    def test_contract_completion_updates_jobs_and_spend(self):
+        """Awarding counts a job; completing it counts completion and spend"""
+        freelancer, client_profile = self._profiles()
+        self.assertEqual((freelancer.total_jobs, freelancer.completed_jobs), (1, 0))
+        self.assertEqual(client_profile.projects_posted, 1)
+        
+        self.client.force_authenticate(self.owner)
+        response = self.client.patch(f'/api/project-contracts/{self.contract.id}/', {'is_completed': True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        freelancer, client_profile = self._profiles()
+        self.assertEqual(freelancer.completed_jobs, 1)
+        self.assertEqual(freelancer.success_rate, 100)
+        self.assertEqual((client_profile.projects_completed, client_profile.total_spent), (1, Decimal('300')))
+        self.assertEqual(client_profile.completion_rate, 100)
+        
+        # Saving again without changes does not double count
+        self.contract.refresh_from_db()
+        self.contract.save()
+        freelancer, client_profile = self._profiles()
+        self.assertEqual((freelancer.completed_jobs, client_profile.total_spent), (1, Decimal('300')))
+    
+    def test_rebuild_matches_incremental_totals(self):
+        """The repair job arrives at the same numbers as the signals"""
+        from .marketplace_utils import rebuild_profile_metrics
+        from .models import ProjectReview
+        ProjectReview.objects.create(
+            project=self.project, reviewer=self.owner, reviewee=self.worker, review_type='client_to_freelancer',
+            rating=5, comment='Great'
+        )
+        before = [(p.rating, p.rating_sum, p.rating_count) for p in self._profiles()]
+        FreelancerProfile.objects.filter(user=self.worker).update(rating=0, rating_sum=0, rating_count=0, total_jobs=9)
+        rebuild_profile_metrics()
+        freelancer, client_profile = self._profiles()
+        self.assertEqual([(p.rating, p.rating_sum, p.rating_count) for p in (freelancer, client_profile)], before)
+        self.assertEqual(freelancer.total_jobs, 1)
+        self.assertEqual(client_profile.projects_posted, 1)
+
+
+@mock.patch('core.instrumentation.INSTRUMENTATION_SAMPLE_RATE', 1.0)
+class RequestInstrumentationTestCase(APITestCase):
+    """Request metrics are recorded per view/action and exposed for scraping"""
+    
+    def setUp(self):
+        from .instrumentation import registry
+        registry.reset()
+        self.user = User.objects.create_user(username='observer', email='observer@example.com')
+        Post.objects.create(user=self.user, title='Hello', content='Body')
+        self.client.force_authenticate(self.user)
+    
+    def _scrape(self, token='t'):
+        with mock.patch('core.instrumentation.INSTRUMENTATION_METRICS_TOKEN', 't'):
+            return self.client.get('/internal/metrics', HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def test_records_view_action_metrics(self):
+        self.client.get(reverse('post-list'))
+        body = self._scrape().content.decode()
+        
+        self.assertIn('vikrahub_requests_total{view="PostViewSet",action="list",method="GET",status="200"} 1', body)
+        self.assertIn('vikrahub_db_queries_per_request_count{view="PostViewSet",action="list"} 1', body)
+        self.assertIn('vikrahub_serializer_duration_seconds_count{view="PostViewSet",action="list"} 1', body)
+        self.assertIn('vikrahub_request_duration_seconds_bucket{view="PostViewSet",action="list",le="+Inf"} 1', body)
+    
+    def test_counts_queries_issued_by_the_view(self):
+        from .instrumentation import registry
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('post-list'))
+        histogram = registry.histograms['vikrahub_db_queries_per_request'][(('view', 'PostViewSet'), ('action', 'list'))]
+        self.assertEqual(histogram.sum, len(captured))
+    
+    def test_metrics_endpoint_requires_token_or_staff(self):
+        self.client.force_authenticate(None)
+        for wrong in ('wrong', 'tt', 't\u00e9'):
+            self.assertEqual(self._scrape(token=wrong).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self._scrape().status_code, status.HTTP_200_OK)
+        
+        staff = User.objects.create_user(username='ops', email='ops@example.com', is_staff=True)
+        User.objects.filter(pk=staff.pk).update(is_active=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get('/internal/metrics').status_code, status.HTTP_200_OK)
+    
+    def test_slow_requests_are_logged_with_fingerprints(self):
+        with mock.patch('core.instrumentation.INSTRUMENTATION_SLOW_REQUEST_MS', 0):
+            with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+                self.client.get(reverse('post-list'))
+        self.assertIn('view=PostViewSet action=list', logs.output[0])
+        self.assertIn('top_queries=[', logs.output[0])
+        self.assertIn('vikrahub_slow_requests_total{view="PostViewSet",action="list"} 1', self._scrape().content.decode())
+    
+    def test_unsampled_requests_only_count(self):
+        from .instrumentation import registry
+        with mock.patch('core.instrumentation.INSTRUMENTATION_SAMPLE_RATE', 0.0):
+            self.client.get(reverse('post-list'))
+        self.assertEqual(sum(registry.counters['vikrahub_requests_total'].values()), 1)
+        self.assertEqual(registry.histograms['vikrahub_db_queries_per_request'], {})
+    
+    def test_fingerprint_normalizes_literals(self):
+        from .instrumentation import fingerprint
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'bob''s'  AND x IN (%s, %s, %s)"),
+            'SELECT * FROM t WHERE id = ? AND name = ? AND x IN (...)'
+        )
+
+
+class APIQueryBudgetTestCase(APITestCase):
+    """
+    Query-count and p95 latency budgets for the major API endpoints.
+    
+    Fixtures build on the create_sample_data freelancers with ROWS rows per
+    list, so an N+1 introduced in any serializer overruns its budget by at
+    least ROWS queries. Lower a budget when an endpoint gets cheaper.
+    """
+    
+    ROWS = 12
+    REPEATS = 5
+    P95_BUDGET_MS = 500
+    
+    # Cold-cache queries per request at ROWS rows. Entries marked per-row
+    # still issue queries for every item and are pinned at today's cost.
+    QUERY_BUDGETS = {
+        'public profiles': 1,
+        'public profile': 7,
+        'freelancer profiles': 49,
+        'creator profiles': 49,  # per-row
+        'followers': 57,  # per-row
+        'following': 57,  # per-row
+        'follow suggestions': 2,
+        'posts': 5,
+        'home feed': 6,
+        'blog': 49,  # per-row
+        'blog all posts': 5,
+        'assets': 73,  # per-row
+        'asset purchases': 97,  # per-row
+        'projects': 61,  # per-row
+        'notifications': 73,  # per-row
+        'conversations': 195,  # per-row
+        'messages': 18,
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        from .follow_models import Follow
+        from .management.commands.create_sample_data import create_sample_freelancers
+        from .models import AssetCategory, AssetPurchase, CreativeAsset, Notification
+        from messaging.models import Conversation, ConversationParticipant, Message
+        
+        cls.freelancers = create_sample_freelancers()
+        cls.viewer = User.objects.create_user(username='budget_viewer', email='budget_viewer@example.com')
+        cls.others = [
+            User.objects.create_user(username=f'budget_user{i}', email=f'budget_user{i}@example.com')
+            for i in range(cls.ROWS)
+        ]
+        for user in cls.others[::2]:
+            user.userprofile.user_type = 'creator'
+            user.userprofile.save()
+        authors = cls.freelancers + cls.others
+        
+        for author in authors:
+            Follow.objects.create(follower=cls.viewer, followed=author)
+            Follow.objects.create(follower=author, followed=cls.viewer)
+        
+        category = ProjectCategory.objects.create(name='Budget')
+        asset_category = AssetCategory.objects.create(name='Budget assets')
+        for i in range(cls.ROWS):
+            author = authors[i % len(authors)]
+            post = Post.objects.create(user=author, title=f'Post {i}', content='Body', tags='a, b')
+            Comment.objects.create(post=post, user=cls.viewer, content='Nice')
+            Like.objects.create(user=cls.viewer, post=post)
+            blog = BlogPost.objects.create(author=author, title=f'Blog {i}', content='Body', published=True)
+            BlogLike.objects.create(user=cls.viewer, blog_post=blog)
+            BlogComment.objects.create(blog_post=blog, user=cls.viewer, content='Great read')
+            asset = CreativeAsset.objects.create(
+                title=f'Asset {i}', description='Pack', seller=author, category=asset_category,
+                asset_type='graphics', price=Decimal('10.00'), tags='logo, brand'
+            )
+            AssetPurchase.objects.create(buyer=cls.viewer, asset=asset, price_paid=Decimal('10.00'))
+            Project.objects.create(
+                title=f'Project {i}', description='Work', client=cls.viewer, category=category,
+                budget_type='fixed', budget_min=Decimal('100'), budget_max=Decimal('200'),
+                required_skills='Python, Design', experience_level='intermediate'
+            )
+            Notification.objects.create(user=cls.viewer, actor=author, verb='like', message=f'Liked {i}')
+            
+            conversation = Conversation.objects.create()
+            ConversationParticipant.objects.create(conversation=conversation, user=cls.viewer)
+            ConversationParticipant.objects.create(conversation=conversation, user=author)
+            for n in range(3):
+                sender, recipient = (author, cls.viewer) if n % 2 else (cls.viewer, author)
+                Message.objects.create(conversation=conversation, sender=sender, recipient=recipient, content=f'Hi {n}')
+        cls.conversation = conversation
+    
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.viewer)
+    
+    def _endpoints(self):
+        return {
+            'public profiles': reverse('publicuserprofile-list'),
+            'public profile': reverse('publicuserprofile-detail', kwargs={'user__username': self.freelancers[0].username}),
+            'freelancer profiles': reverse('freelancerprofile-list'),
+            'creator profiles': reverse('creatorprofile-list'),
+            'followers': reverse('follow:user-followers', kwargs={'user_id': self.viewer.id}),
+            'following': reverse('follow:user-following', kwargs={'user_id': self.viewer.id}),
+            'follow suggestions': reverse('follow:follow-suggestions'),
+            'posts': reverse('post-list'),
+            'home feed': reverse('home_feed'),
+            'blog': reverse('blogpost-list'),
+            'blog all posts': reverse('blogpost-all-posts'),
+            'assets': reverse('creativeasset-list'),
+            'asset purchases': reverse('assetpurchase-list'),
+            'projects': reverse('project-list'),
+            'notifications': reverse('notification-list'),
+            'conversations': reverse('messaging:conversation-list-api'),
+            'messages': reverse('messaging:message-list-create', kwargs={'conversation_id': self.conversation.id}),
+        }
+    
+    def test_every_endpoint_has_a_budget(self):
+        self.assertEqual(set(self._endpoints()), set(self.QUERY_BUDGETS))
+    
+    def test_query_budgets(self):
+        for name, url in self._endpoints().items():
+            with self.subTest(endpoint=name):
+                with CaptureQueriesContext(connection) as captured:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertLessEqual(
+                    len(captured), self.QUERY_BUDGETS[name],
+                    f'{name} ({url}) issued {len(captured)} queries, budget {self.QUERY_BUDGETS[name]}'
+                )
+    
+    def test_latency_budgets(self):
+        from .management.commands.load_test_timeline import percentile
+        for name, url in self._endpoints().items():
+            with self.subTest(endpoint=name):
+                samples = []
+                for _ in range(self.REPEATS):
+                    started = time.perf_counter()
+                    self.client.get(url)
+                    samples.append((time.perf_counter() - started) * 1000)
+                p95 = percentile(samples, 95)
+                self.assertLessEqual(p95, self.P95_BUDGET_MS, f'{name} ({url}) p95 {p95:.1f} ms')
+
+
+class SyntheticDataTestCase(TestCase):
+    """The synthetic data generator is reproducible and leaves counters consistent"""
+    
+    VOLUMES = dict(users=30, follows=5, posts=40, blog_posts=8, comments=50, likes=60, assets=10,
+                   purchases=20, reviews=10, projects=10, conversations=15, messages=60)
+    
+    def _generate(self, seed):
+        from django.db import transaction
+        from .follow_models import Follow
+        from .synthetic_data import SyntheticDataGenerator
+        from messaging.models import Message
+        
+        class Rollback(Exception):
+            pass
+        
+        try:
+            with transaction.atomic():
+                generator = SyntheticDataGenerator(seed=seed, batch_size=7, log=lambda message: None)
+                counts = generator.generate(**self.VOLUMES)
+                snapshot = {
+                    'counts': counts,
+                    'follows': sorted(Follow.objects.values_list('follower__username', 'followed__username')),
+                    'posts': sorted(Post.objects.values_list('user__username', 'title', 'like_count', 'comment_count')),
+                    'messages': sorted(Message.objects.values_list('sender__username', 'recipient__username', 'content')),
+                }
+                raise Rollback()
+        except Rollback:
+            return snapshot
+    
+    def test_same_seed_reproduces_the_same_data(self):
+        first = self._generate(seed=5)
+        self.assertEqual(first, self._generate(seed=5))
+        self.assertNotEqual(first['follows'], self._generate(seed=6)['follows'])
+        self.assertEqual(first['counts']['posts'], 40)
+        self.assertEqual(first['counts']['messages'], 60)
+    
+    def test_counters_match_generated_rows(self):
+        from .synthetic_data import SyntheticDataGenerator
+        SyntheticDataGenerator(seed=9, batch_size=7, log=lambda message: None).generate(**self.VOLUMES)
+        
+        for post in Post.objects.all():
+            self.assertEqual(post.like_count, post.likes.count())
+            self.assertEqual(post.comment_count, post.comments.count())
+        self.assertEqual(UserProfile.objects.filter(user__username__startswith='syn9_').count(), 30)
+        self.assertEqual(ClientProfile.objects.filter(user__username__startswith='syn9_').count(), 30)
+    
+    def test_likes_and_purchases_are_unique_and_reviews_exact(self):
+        from .models import AssetPurchase, AssetReview, Like
+        from .synthetic_data import SyntheticDataGenerator
+        counts = SyntheticDataGenerator(seed=3, batch_size=7, log=lambda message: None).generate(**self.VOLUMES)
+        
+        likes = list(Like.objects.values_list('user_id', 'post_id'))
+        purchases = list(AssetPurchase.objects.values_list('buyer_id', 'asset_id'))
+        self.assertEqual(len(likes), len(set(likes)))
+        self.assertEqual(len(purchases), len(set(purchases)))
+        self.assertGreater(counts['likes'], 0.8 * 48)
+        self.assertGreater(counts['purchases'], 0.8 * 20)
+        self.assertEqual(AssetReview.objects.count(), min(10, counts['purchases']))
+        self.assertTrue(set(AssetReview.objects.values_list('reviewer_id', 'asset_id')) <= set(purchases))
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Read-heavy endpoints answer 304 from version validators alone"""
+    
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='cond_author', email='cond_author@example.com')
+        self.viewer = User.objects.create_user(username='cond_viewer', email='cond_viewer@example.com')
+        User.objects.filter(pk__in=[self.author.pk, self.viewer.pk]).update(is_active=True)
+        self.blog = BlogPost.objects.create(author=self.author, title='Cond Post', content='Body', published=True)
+        self.all_posts_url = reverse('blogpost-all-posts')
+        self.profile_url = reverse('publicuserprofile-detail', kwargs={'user__username': self.author.username})
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_unchanged_feed_returns_304_without_queries(self):
+        first = self.client.get(self.all_posts_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn('Authorization', first['Vary'])
+        with self.assertNumQueries(0):
+            response = self.client.get(self.all_posts_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], first['ETag'])
+        
+        response = self.client.get(self.all_posts_url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_writes_change_the_validator(self):
+        first = self.client.get(self.all_posts_url)
+        BlogLike.objects.create(user=self.viewer, blog_post=self.blog)
+        response = self.client.get(self.all_posts_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+    
+    def test_viewer_specific_payloads_are_private(self):
+        anonymous = self.client.get(self.all_posts_url)
+        self.client.force_authenticate(self.viewer)
+        response = self.client.get(self.all_posts_url, HTTP_IF_NONE_MATCH=anonymous['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotEqual(response['ETag'], anonymous['ETag'])
+    
+    def test_profile_versions_are_per_user(self):
+        from .follow_models import Follow
+        
+        first = self.client.get(self.profile_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        BlogPost.objects.create(author=self.viewer, title='Unrelated', content='Body', published=True)
+        response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        Follow.objects.create(follower=self.viewer, followed=self.author)
+        response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['stats']['followers_count'], 1)
+    
+    def test_category_lists(self):
+        url = reverse('projectcategory-list')
+        first = self.client.get(url)
+        self.assertIn('max-age=3600', first['Cache-Control'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        ProjectCategory.objects.create(name='Design')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_missing_profile_skips_validation(self):
+        url = reverse('publicuserprofile-detail', kwargs={'user__username': 'nobody_here'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class ResponseCacheTestCase(APITestCase):
+    """Anonymous list payloads are shared through the cache and invalidated by tags"""
+    
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='rc_author', email='rc_author@example.com')
+        BlogPost.objects.create(author=self.author, title='Cached Post', content='Body', published=True)
+        self.url = reverse('blogpost-all-posts')
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_anonymous_hits_are_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.json()['count'], 1)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), first.json())
+    
+    def test_model_changes_invalidate_tagged_entries(self):
+        self.client.get(self.url)
+        BlogPost.objects.create(author=self.author, title='Second Post', content='Body', published=True)
+        self.assertEqual(self.client.get(self.url).json()['count'], 2)
+    
+    def test_query_params_and_viewers_get_separate_entries(self):
+        from .cache_utils import response_cache_key
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        
+        factory = APIRequestFactory()
+        key = lambda path: response_cache_key('blog_list', Request(factory.get(path)), ('blog_feed',))
+        self.assertEqual(key('/api/blog/?a=1&b=2'), key('/api/blog/?b=2&a=1'))
+        self.assertNotEqual(key('/api/blog/?a=1'), key('/api/blog/?a=2'))
+        
+        self.client.get(self.url)
+        self.client.force_authenticate(self.author)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertGreater(len(queries), 0)
+    
+    def test_concurrent_miss_serves_stale_entry_without_waiting(self):
+        from .cache_utils import get_or_build
+        
+        build = mock.Mock(return_value={'v': 1})
+        get_or_build('response:test:v1', build, stale_key='response:test:stale')
+        
+        # Another worker holds the lock for the next version: serve the last payload, never sleep
+        cache.add('response:test:v2:lock', 1)
+        build.return_value = {'v': 2}
+        with mock.patch('time.sleep') as sleep:
+            self.assertEqual(get_or_build('response:test:v2', build, stale_key='response:test:stale'), {'v': 1})
+            build.assert_called_once()
+            
+            # No stale payload yet: build here, leaving the entry to the lock holder
+            cache.delete('response:test:stale')
+            self.assertEqual(get_or_build('response:test:v2', build, stale_key='response:test:stale'), {'v': 2})
+        sleep.assert_not_called()
+        self.assertIsNone(cache.get('response:test:v2'))
+        
+        cache.delete('response:test:v2:lock')
+        self.assertEqual(get_or_build('response:test:v2', build, stale_key='response:test:stale'), {'v': 2})
+        self.assertEqual(cache.get('response:test:stale'), {'v': 2})
+
+
+class JSONCodecTestCase(TestCase):
+    """json_codec output matches the stock DRF renderer with or without orjson"""
+    
+    def _payload(self):
+        import uuid
+        from django.utils.translation import gettext_lazy
+        return {
+            'price': Decimal('10.50'),
+            'when': timezone.now(),
+            'day': timezone.now().date(),
+            'id': uuid.UUID(int=7),
+            'label': gettext_lazy('Hello'),
+            'text': 'café\u2028line',
+            'big': 2 ** 70,
+            1: 'int key',
+            'nested': [{'a': None, 'b': True}],
+        }
+    
+    def test_renderer_matches_stock_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from .json_codec import FastJSONRenderer
+        
+        data = self._payload()
+        expected = json.loads(JSONRenderer().render(data))
+        for use_orjson in (True, False):
+            with mock.patch('core.json_codec.JSON_CODEC_USE_ORJSON', use_orjson):
+                body = FastJSONRenderer().render(data)
+            self.assertEqual(json.loads(body), expected)
+            self.assertNotIn('\u2028'.encode('utf-8'), body)
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+    
+    def test_parser_and_loads(self):
+        from io import BytesIO
+        from rest_framework.exceptions import ParseError
+        from .json_codec import FastJSONParser, dumps, loads
+        
+        self.assertEqual(FastJSONParser().parse(BytesIO(b'{"a": [1, "\xc3\xa9"]}')), {'a': [1, 'é']})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a":'))
+        with self.assertRaises(json.JSONDecodeError):
+            loads('not json')
+        self.assertEqual(loads(dumps({'type': 'pong'})), {'type': 'pong'})
+
+
+class SparseFieldsetTestCase(APITestCase):
+    """?fields= and ?expand= prune serializers; lists default to slim representations"""
+    
+    def setUp(self):
+        from .models import PortfolioItem
+        
+        cache.clear()
+        self.users = [
+            User.objects.create_user(username=f'sparse_user{i}', email=f'sparse_user{i}@example.com')
+            for i in range(4)
+        ]
+        User.objects.filter(pk__in=[user.pk for user in self.users]).update(is_active=True)
+        for user in self.users:
+            PortfolioItem.objects.create(user=user, title=f'Work {user.pk}', description='Piece')
+        self.list_url = reverse('publicuserprofile-list')
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def _rows(self, response):
+        data = response.json()
+        return data['results'] if isinstance(data, dict) else data
+    
+    def test_lists_leave_out_expandable_fields(self):
+        row = self._rows(self.client.get(self.list_url))[0]
+        self.assertIn('username', row)
+        for name in ('portfolio_items', 'stats', 'recognitions_list', 'cover_photo_small'):
+            self.assertNotIn(name, row)
+        
+        row = self._rows(self.client.get(self.list_url, {'expand': 'stats,portfolio_items'}))[0]
+        self.assertIn('stats', row)
+        self.assertEqual(len(row['portfolio_items']), 1)
+        self.assertNotIn('cover_photo_small', row)
+    
+    def test_expanding_costs_queries_only_when_requested(self):
+        with CaptureQueriesContext(connection) as slim:
+            self.client.get(self.list_url)
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(self.list_url, {'expand': 'stats,portfolio_items'})
+        self.assertGreaterEqual(len(full) - len(slim), len(self.users))
+    
+    def test_fields_selects_exact_fields(self):
+        row = self._rows(self.client.get(self.list_url, {'fields': 'username,stats'}))[0]
+        self.assertEqual(set(row), {'username', 'stats'})
+    
+    def test_detail_and_writes_keep_full_representation(self):
+        detail = self.client.get(
+            reverse('publicuserprofile-detail', kwargs={'user__username': self.users[0].username})
+        ).json()
+        for name in ('portfolio_items', 'stats', 'recognitions_list', 'cover_photo_small'):
+            self.assertIn(name, detail)
+        
+        from .serializers import PublicUserProfileSerializer
+        serializer = PublicUserProfileSerializer(self.users[0].userprofile)
+        self.assertIn('stats', serializer.data)
+    
+    def test_expanded_message_reactions_are_prefetched(self):
+        from messaging.models import Conversation, ConversationParticipant, Message, MessageReaction
+        
+        sender, recipient = self.users[:2]
+        conversation = Conversation.objects.create()
+        for user in (sender, recipient):
+            ConversationParticipant.objects.create(conversation=conversation, user=user)
+        url = reverse('messaging:message-list-create', kwargs={'conversation_id': conversation.id})
+        self.client.force_authenticate(recipient)
+        
+        def history():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {'expand': 'reactions'})
+            self.assertEqual(response.status_code, 200)
+            reaction_queries = [query for query in queries.captured_queries
+                                if 'messaging_message_reactions' in query['sql']]
+            return self._rows(response), len(reaction_queries)
+        
+        def add_message():
+            message = Message.objects.create(conversation=conversation, sender=sender, recipient=recipient, content='Hi')
+            MessageReaction.objects.create(message=message, user=recipient, reaction='like')
+            MessageReaction.objects.create(message=message, user=sender, reaction='like')
+        
+        add_message()
+        rows, reaction_queries = history()
+        self.assertEqual(rows[0]['reactions'], {'like': 2})
+        self.assertEqual(reaction_queries, 1)
+        self.assertNotIn('reactions', self._rows(self.client.get(url))[0])
+        
+        for _ in range(3):
+            add_message()
+        rows, reaction_queries = history()
+        self.assertEqual([row['reactions'] for row in rows], [{'like': 2}] * 4)
+        self.assertEqual(reaction_queries, 1)
@@ -0,0 +1,383 @@
+"""
+Home timeline service.
+
+Each user's home feed is built from their Follow edges and merges posts, blog
+posts, portfolio items and creative assets.
+
+- Fan-out-on-write: when a normal account publishes, a FeedEntry row is written
+  for every active follower (and the author), so reading a feed is a single
+  indexed range scan.
+- Fan-out-on-read: accounts with TIMELINE_FANOUT_THRESHOLD or more followers are
+  not fanned out; their recent items are pulled and merged at read time so one
+  post does not turn into hundreds of thousands of inserts.
+
+Feeds are paged with an opaque cursor over (created_at, content_type, object_id).
+"""
+import base64
+import datetime
+import logging
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DateTimeField, F, Q
+from django.db.models.functions import Cast
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.dateparse import parse_datetime
+
+from .follow_models import Follow, get_follow_stats_map
+from .models import FeedEntry, Post, BlogPost, PortfolioItem, CreativeAsset, Like, BlogLike, AssetPurchase
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_FANOUT_THRESHOLD = getattr(settings, 'TIMELINE_FANOUT_THRESHOLD', 1000)
+TIMELINE_BACKFILL_SIZE = getattr(settings, 'TIMELINE_BACKFILL_SIZE', 50)
+TIMELINE_PAGE_SIZE = 20
+TIMELINE_MAX_PAGE_SIZE = 100
+FANOUT_BATCH_SIZE = 1000
+HIGH_FOLLOWER_CACHE_KEY = 'timeline:high_follower_ids'
+HIGH_FOLLOWER_CACHE_TIMEOUT = 300
+
+
+class TimelineSource:
+    """How one content model takes part in the timeline"""
+
+    def __init__(self, kind, model, author_field, timestamp_field, visible_filter):
+        self.kind = kind
+        self.model = model
+        self.author_field = author_field
+        self.timestamp_field = timestamp_field
+        self.visible_filter = visible_filter
+
+    @property
+    def content_type(self):
+        return ContentType.objects.get_for_model(self.model)
+
+    def is_visible(self, instance):
+        return all(getattr(instance, field) == value for field, value in self.visible_filter.items())
+
+    def author_id(self, instance):
+        return getattr(instance, f'{self.author_field}_id')
+
+    def timestamp(self, instance):
+        """Feed timestamp for an instance; DateFields are placed at midnight UTC"""
+        value = getattr(instance, self.timestamp_field)
+        if isinstance(value, datetime.datetime):
+            return value
+        return datetime.datetime.combine(value, datetime.time.min, tzinfo=datetime.timezone.utc)
+
+    def visible_queryset(self):
+        """Visible items annotated with a datetime `feed_created_at` for ordering"""
+        field = self.model._meta.get_field(self.timestamp_field)
+        if isinstance(field, DateTimeField):
+            feed_created_at = F(self.timestamp_field)
+        else:
+            feed_created_at = Cast(self.timestamp_field, DateTimeField())
+        return self.model.objects.filter(**self.visible_filter).annotate(feed_created_at=feed_created_at)
+
+
+TIMELINE_SOURCES = [
+    TimelineSource('post', Post, 'user', 'created_at', {'is_public': True}),
+    TimelineSource('blog_post', BlogPost, 'author', 'created_at', {'published': True}),
+    TimelineSource('portfolio_item', PortfolioItem, 'user', 'date', {}),
+    TimelineSource('creative_asset', CreativeAsset, 'seller', 'created_at', {'is_active': True}),
+]
+SOURCES_BY_MODEL = {source.model: source for source in TIMELINE_SOURCES}
+
+
+# Cursor handling
+
+def encode_cursor(created_at, content_type_id, object_id):
+    raw = f"{created_at.isoformat()}|{content_type_id}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (created_at, content_type_id, object_id) or None for a bad cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, content_type_id, object_id = raw.split('|')
+        parsed = parse_datetime(created_at)
+        if parsed is None:
+            return None
+        return parsed, int(content_type_id), int(object_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def _entries_before(cursor):
+    """Q for FeedEntry rows strictly after `cursor` in timeline order"""
+    created_at, content_type_id, object_id = cursor
+    return (
+        Q(created_at__lt=created_at) |
+        Q(created_at=created_at, content_type_id__lt=content_type_id) |
+        Q(created_at=created_at, content_type_id=content_type_id, object_id__lt=object_id)
+    )
+
+
+def _items_before(cursor, content_type_id):
+    """Q for one source's items strictly after `cursor` in timeline order"""
+    created_at, cursor_content_type_id, object_id = cursor
+    if content_type_id < cursor_content_type_id:
+        return Q(feed_created_at__lte=created_at)
+    if content_type_id > cursor_content_type_id:
+        return Q(feed_created_at__lt=created_at)
+    return Q(feed_created_at__lt=created_at) | Q(feed_created_at=created_at, id__lt=object_id)
+
+
+# Fan-out policy
+
+def get_high_follower_ids():
+    """Ids of accounts that are served by fan-out-on-read (cached briefly)"""
+    high_follower_ids = cache.get(HIGH_FOLLOWER_CACHE_KEY)
+    if high_follower_ids is None:
+        high_follower_ids = set(
+            Follow.objects.filter(is_active=True)
+            .order_by().values('followed_id')
+            .annotate(total=Count('id'))
+            .filter(total__gte=TIMELINE_FANOUT_THRESHOLD)
+            .values_list('followed_id', flat=True)
+        )
+        cache.set(HIGH_FOLLOWER_CACHE_KEY, high_follower_ids, HIGH_FOLLOWER_CACHE_TIMEOUT)
+    return high_follower_ids
+
+
+def _bulk_insert_entries(entries):
+    for start in range(0, len(entries), FANOUT_BATCH_SIZE):
+        FeedEntry.objects.bulk_create(entries[start:start + FANOUT_BATCH_SIZE], ignore_conflicts=True)
+
+
+def fan_out_item(instance):
+    """Deliver a content item to its author's followers' stored feeds"""
+    source = SOURCES_BY_MODEL[type(instance)]
+    content_type = source.content_type
+
+    if not source.is_visible(instance):
+        remove_item(instance)
+        return 0
+
+    author_id = source.author_id(instance)
+    if author_id is None or author_id in get_high_follower_ids():
+        # Served at read time; nothing to write
+        return 0
+
+    owner_ids = list(
+        Follow.objects.filter(followed_id=author_id, is_active=True).values_list('follower_id', flat=True)
+    )
+    owner_ids.append(author_id)
+
+    created_at = source.timestamp(instance)
+    _bulk_insert_entries([
+        FeedEntry(
+            owner_id=owner_id,
+            actor_id=author_id,
+            content_type=content_type,
+            object_id=instance.pk,
+            created_at=created_at,
+        )
+        for owner_id in owner_ids
+    ])
+    return len(owner_ids)
+
+
+def remove_item(instance):
+    """Remove a content item from every stored feed"""
+    source = SOURCES_BY_MODEL[type(instance)]
+    FeedEntry.objects.filter(content_type=source.content_type, object_id=instance.pk).delete()
+
+
+def backfill_follow(follower_id, followed_id, limit=TIMELINE_BACKFILL_SIZE):
+    """Copy a newly followed account's recent items into the follower's feed"""
+    if followed_id in get_high_follower_ids():
+        return 0
+
+    entries = []
+    for source in TIMELINE_SOURCES:
+        content_type = source.content_type
+        recent = (
+            source.visible_queryset()
+            .filter(**{f'{source.author_field}_id': followed_id})
+            .order_by('-feed_created_at', '-id')
+            .values_list('id', 'feed_created_at')[:limit]
+        )
+        entries.extend(
+            FeedEntry(
+                owner_id=follower_id,
+                actor_id=followed_id,
+                content_type=content_type,
+                object_id=object_id,
+                created_at=created_at,
+            )
+            for object_id, created_at in recent
+        )
+    _bulk_insert_entries(entries)
+    return len(entries)
+
+
+def remove_follow(follower_id, followed_id):
+    """Drop an unfollowed account's items from the follower's feed"""
+    FeedEntry.objects.filter(owner_id=follower_id, actor_id=followed_id).delete()
+
+
+def rebuild_timeline(user_id, limit=TIMELINE_BACKFILL_SIZE):
+    """Rebuild one user's stored feed from scratch"""
+    with transaction.atomic():
+        FeedEntry.objects.filter(owner_id=user_id).delete()
+        followed_ids = list(
+            Follow.objects.filter(follower_id=user_id, is_active=True).values_list('followed_id', flat=True)
+        )
+        total = 0
+        for followed_id in followed_ids + [user_id]:
+            total += backfill_follow(user_id, followed_id, limit=limit)
+    return total
+
+
+# Reading
+
+def get_timeline(user, cursor=None, limit=TIMELINE_PAGE_SIZE):
+    """
+    Return (rows, next_cursor) for a user's home feed.
+
+    Rows are (created_at, content_type_id, object_id) tuples in timeline
+    order; `hydrate_timeline` turns them into serialized items.
+    """
+    decoded = decode_cursor(cursor) if cursor else None
+
+    stored = FeedEntry.objects.filter(owner=user)
+    if decoded:
+        stored = stored.filter(_entries_before(decoded))
+    rows = set(
+        stored.order_by('-created_at', '-content_type_id', '-object_id')
+        .values_list('created_at', 'content_type_id', 'object_id')[:limit + 1]
+    )
+
+    # Fan-out-on-read: merge in followed high-follower accounts (and self, if high-follower)
+    high_follower_ids = get_high_follower_ids()
+    pulled_author_ids = []
+    if high_follower_ids:
+        pulled_author_ids = list(
+            Follow.objects.filter(
+                follower=user, is_active=True, followed_id__in=high_follower_ids
+            ).values_list('followed_id', flat=True)
+        )
+        if user.id in high_follower_ids:
+            pulled_author_ids.append(user.id)
+
+    if pulled_author_ids:
+        for source in TIMELINE_SOURCES:
+            content_type_id = source.content_type.id
+            items = source.visible_queryset().filter(**{f'{source.author_field}_id__in': pulled_author_ids})
+            if decoded:
+                items = items.filter(_items_before(decoded, content_type_id))
+            rows.update(
+                (created_at, content_type_id, object_id)
+                for object_id, created_at in items.order_by('-feed_created_at', '-id')
+                .values_list('id', 'feed_created_at')[:limit + 1]
+            )
+
+    ordered = sorted(rows, reverse=True)
+    page = ordered[:limit]
+    next_cursor = encode_cursor(*page[-1]) if len(ordered) > limit else None
+    return page, next_cursor
+
+
+def hydrate_timeline(rows, request):
+    """Load and serialize timeline rows with batched viewer state"""
+    from .serializers import (
+        PostSerializer, BlogPostSerializer, PortfolioItemSerializer, CreativeAssetSerializer
+    )
+    from .feed_utils import get_liked_ids
+
+    serializer_classes = {
+        'post': PostSerializer,
+        'blog_post': BlogPostSerializer,
+        'portfolio_item': PortfolioItemSerializer,
+        'creative_asset': CreativeAssetSerializer,
+    }
+    sources_by_content_type = {source.content_type.id: source for source in TIMELINE_SOURCES}
+
+    ids_by_content_type = {}
+    for _, content_type_id, object_id in rows:
+        ids_by_content_type.setdefault(content_type_id, []).append(object_id)
+
+    objects = {}
+    for content_type_id, object_ids in ids_by_content_type.items():
+        source = sources_by_content_type.get(content_type_id)
+        if source is None:
+            continue
+        related = [source.author_field] + (['category'] if source.model is CreativeAsset else [])
+        for obj in source.model.objects.filter(pk__in=object_ids, **source.visible_filter).select_related(*related):
+            objects[(content_type_id, obj.pk)] = (source, obj)
+
+    viewer = request.user
+    by_kind = {}
+    for source, obj in objects.values():
+        by_kind.setdefault(source.kind, []).append(obj)
+
+    context = {
+        'request': request,
+        'follow_stats': get_follow_stats_map(
+            {source.author_id(obj) for source, obj in objects.values()}, viewer
+        ),
+        'liked_post_ids': get_liked_ids(Like, 'post', [o.id for o in by_kind.get('post', [])], viewer),
+        'liked_blog_post_ids': get_liked_ids(
+            BlogLike, 'blog_post', [o.id for o in by_kind.get('blog_post', [])], viewer
+        ),
+        'purchased_asset_ids': set(
+            AssetPurchase.objects.filter(
+                buyer=viewer, asset_id__in=[o.id for o in by_kind.get('creative_asset', [])]
+            ).values_list('asset_id', flat=True)
+        ) if viewer.is_authenticated and by_kind.get('creative_asset') else set(),
+    }
+
+    results = []
+    for created_at, content_type_id, object_id in rows:
+        found = objects.get((content_type_id, object_id))
+        if found is None:
+            continue
+        source, obj = found
+        results.append({
+            'type': source.kind,
+            'id': obj.pk,
+            'created_at': created_at.isoformat(),
+            'item': serializer_classes[source.kind](obj, context=context).data,
+        })
+    return results
+
+
+# Signal wiring
+
+def _on_item_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    # Counter bumps (likes, views, downloads) save with update_fields and
+    # cannot change what a feed shows, so they must not trigger a fan-out
+    source = SOURCES_BY_MODEL[sender]
+    if not created and update_fields is not None and not set(update_fields) & set(source.visible_filter):
+        return
+    transaction.on_commit(lambda: _safe(fan_out_item, instance))
+
+
+def _on_item_deleted(sender, instance, **kwargs):
+    _safe(remove_item, instance)
+
+
+def _safe(func, *args):
+    try:
+        return func(*args)
+    except Exception as e:
+        logger.error(f"Timeline update failed in {func.__name__}: {e}")
+
+
+for _source in TIMELINE_SOURCES:
+    post_save.connect(_on_item_saved, sender=_source.model, dispatch_uid=f'timeline_save_{_source.kind}')
+    post_delete.connect(_on_item_deleted, sender=_source.model, dispatch_uid=f'timeline_delete_{_source.kind}')
+
+
+@receiver(post_save, sender=Follow, dispatch_uid='timeline_follow_changed')
+def update_timeline_on_follow(sender, instance, **kwargs):
+    """Backfill on follow, prune on unfollow"""
+    follower_id, followed_id = instance.follower_id, instance.followed_id
+    if instance.is_active:
+        transaction.on_commit(lambda: _safe(backfill_follow, follower_id, followed_id))
+    else:
+        transaction.on_commit(lambda: _safe(remove_follow, follower_id, followed_id))
@@ -9,7 +9,7 @@ from .api_views import (
     ProjectCategoryViewSet, ProjectViewSet, ProjectApplicationViewSet, 
     ProjectContractViewSet, ProjectReviewViewSet, unread_notifications_count,
     PostViewSet, CommentViewSet, blog_like, blog_comments, blog_comment_like,
-    blog_meta_tags
+    blog_meta_tags, home_feed
 )
 from .google_auth import google_auth, google_auth_config
 
@@ -65,6 +65,9 @@ urlpatterns = [
     # Blog meta tags for social sharing
     path('blog/<slug:slug>/meta/', blog_meta_tags, name='blog_meta_tags'),
     
+    # Home timeline from followed accounts
+    path('feed/', home_feed, name='home_feed'),
+    
     # Follow system endpoints
     path('follow/', include('core.follow_urls')),
 ]
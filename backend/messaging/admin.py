@@ -1,6 +1,6 @@
 # backend/messaging/admin.py
 from django.contrib import admin
-from .models import Conversation, Message, ConversationParticipant, MessageRead, TypingStatus
+from .models import Conversation, Message, ConversationParticipant, MessageRead
 
 # TODO: Fix admin configurations - temporarily disabled
 # @admin.register(Conversation)
@@ -18,7 +18,3 @@ from .models import Conversation, Message, ConversationParticipant, MessageRead,
 # @admin.register(MessageRead)
 # class MessageReadAdmin(admin.ModelAdmin):
 #     pass
-
-# @admin.register(TypingStatus)
-# class TypingStatusAdmin(admin.ModelAdmin):
-#     pass
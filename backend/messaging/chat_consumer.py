@@ -17,6 +17,7 @@ from .models import (
     Conversation, Message, ConversationParticipant, 
     MessageReaction, UserStatus
 )
+from core import json_codec
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -67,7 +68,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.broadcast_user_status()
             
             # Send connection confirmation
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'connection_established',
                 'user_id': self.user.id,
                 'username': self.user.username,
@@ -104,7 +105,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle incoming WebSocket messages"""
         try:
-            data = json.loads(text_data)
+            data = json_codec.loads(text_data)
             message_type = data.get('type')
             
             logger.debug(f"ChatConsumer: Received message type: {message_type}")
@@ -116,22 +117,22 @@ class ChatConsumer(AsyncWebsocketConsumer):
             elif message_type in ['react', 'add_reaction', 'remove_reaction']:
                 await self.handle_reaction(data)
             elif message_type == 'ping':
-                await self.send(text_data=json.dumps({'type': 'pong'}))
+                await self.send(text_data=json_codec.dumps({'type': 'pong'}))
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}'
                 }))
                 
         except (json.JSONDecodeError, KeyError) as e:
             logger.exception(f"Error parsing WebSocket message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': 'Invalid message format'
             }))
         except Exception as exc:
             logger.exception(f"Unexpected error in receive: {exc}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': 'An unexpected error occurred'
             }))
@@ -144,7 +145,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             reply_to_id = data.get('reply_to_id')
             
             if not recipient_id or not text:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'recipient_id and text are required'
                 }))
@@ -153,14 +154,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # Validate recipient exists
             recipient = await self.get_user_by_id(recipient_id)
             if not recipient:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Recipient not found'
                 }))
                 return
             
             if recipient.id == self.user.id:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Cannot send message to yourself'
                 }))
@@ -171,7 +172,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             if reply_to_id:
                 reply_to_message = await self.get_message_by_id(reply_to_id)
                 if not reply_to_message:
-                    await self.send(text_data=json.dumps({
+                    await self.send(text_data=json_codec.dumps({
                         'type': 'error',
                         'message': 'Reply message not found'
                     }))
@@ -241,7 +242,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             )
             
             # Send delivery receipt to sender
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'message_delivered',
                 'message_id': str(message.id),
                 'delivered_to': recipient.username,
@@ -249,7 +250,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             }))
             
             # Send confirmation to sender
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'message_sent',
                 'message': message_data
             }))
@@ -258,7 +259,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.exception(f"Error handling direct message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to send message: {str(e)}'
             }))
@@ -268,7 +269,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         try:
             message_id = data.get('message_id')
             if not message_id:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'message_id is required'
                 }))
@@ -277,7 +278,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # Get message
             message = await self.get_message_by_id(message_id)
             if not message:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Message not found'
                 }))
@@ -298,14 +299,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
                     }
                 )
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'mark_read_success',
                 'message_id': str(message.id)
             }))
             
         except Exception as e:
             logger.exception(f"Error marking message as read: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to mark message as read: {str(e)}'
             }))
@@ -319,7 +320,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             message_type = data.get('type', 'react')
             
             if not message_id or not reaction:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'message_id and reaction/reaction_type are required'
                 }))
@@ -328,7 +329,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # Get message
             message = await self.get_message_by_id(message_id)
             if not message:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Message not found'
                 }))
@@ -345,9 +346,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 # Create notification for reaction if it was added (not removed)
                 if reaction_added and self.user != message.sender:
                     try:
-                        # Pre-compute full name to avoid database queries in sync method
-                        reactor_full_name = f"{self.user.first_name} {self.user.last_name}".strip()
-                        await self.create_reaction_notification_sync(self.user, message.sender, reaction, reactor_full_name)
+                        await self.create_reaction_notification_sync(self.user, message.sender, reaction, message.id)
                     except Exception as e:
                         logger.warning(f"Failed to create reaction notification: {e}")
             else:
@@ -357,9 +356,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 # Create notification for reaction if it was added (not removed)
                 if reaction_added and self.user != message.sender:
                     try:
-                        # Pre-compute full name to avoid database queries in sync method
-                        reactor_full_name = f"{self.user.first_name} {self.user.last_name}".strip()
-                        await self.create_reaction_notification_sync(self.user, message.sender, reaction, reactor_full_name)
+                        await self.create_reaction_notification_sync(self.user, message.sender, reaction, message.id)
                     except Exception as e:
                         logger.warning(f"Failed to create reaction notification: {e}")
             
@@ -385,7 +382,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.exception(f"Error handling reaction: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to process reaction: {str(e)}'
             }))
@@ -394,7 +391,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def new_message(self, event):
         """Send new message notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'new_message',
                 'message': event['message']
             }))
@@ -404,7 +401,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def message_read_event(self, event):
         """Send message read notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'message_read',
                 'message_id': event['message_id'],
                 'read_by': event['read_by'],
@@ -416,7 +413,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def reaction_update(self, event):
         """Send reaction update to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'reaction_update',
                 'message_id': event['message_id'],
                 'reactions': event['reactions'],
@@ -430,7 +427,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def user_status_update(self, event):
         """Send user status update to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'user_status',
                 'user_id': event['user_id'],
                 'username': event['username'],
@@ -454,9 +451,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def get_message_by_id(self, message_id):
-        """Get message by ID"""
+        """Get message by ID, with the relations the async handlers read"""
         try:
-            return Message.objects.get(id=message_id)
+            return Message.objects.select_related('sender', 'conversation').get(id=message_id)
         except Message.DoesNotExist:
             return None
         except Exception as e:
@@ -574,7 +571,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                         'username': reaction.user.username
                     },
                     'reaction_type': reaction.reaction,
-                    'created_at': reaction.created_at.isoformat()
+                    'created_at': reaction.reacted_at.isoformat()
                 }
                 for reaction in reactions
             ]
@@ -726,22 +723,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
             logger.warning(f"Failed to create message notification: {e}")
     
     @database_sync_to_async
-    def create_reaction_notification_sync(self, reactor, message_owner, reaction_type, reactor_full_name):
-        """Create reaction notification synchronously"""
+    def create_reaction_notification_sync(self, reactor, message_owner, reaction_type, message_id):
+        """Create (or fold into an aggregate) a reaction notification synchronously"""
         try:
-            from core.models import Notification
+            from core.notification_utils import create_reaction_notification
             
-            # Create notification using the pre-computed full name
-            notification = Notification.objects.create(
-                user=message_owner,
-                verb="reaction",
-                actor=reactor,
-                payload={
-                    "reaction_type": reaction_type,
-                    "reactor_username": reactor.username
-                },
-                message=f"{reactor_full_name or reactor.username} reacted {reaction_type} to your message"
-            )
+            notification = create_reaction_notification(reactor, message_owner, reaction_type, message_id)
             
             logger.debug(f"Created reaction notification for {message_owner.username}")
             return notification
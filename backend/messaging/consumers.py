@@ -5,13 +5,16 @@ import os
 from uuid import UUID
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from jwt import decode as jwt_decode
-from .models import Conversation, Message, TypingStatus
+from .models import Conversation, Message
+from .typing_store import get_typing_store
+from core import json_codec
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -99,7 +102,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 )
                 
                 # Send connection confirmation
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'connection_established',
                     'user_id': self.user.id,
                     'username': self.user.username
@@ -107,7 +110,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 logger.info(f"MessagingConsumer: Connection established for user {self.user.username}")
             else:
                 # Send anonymous connection confirmation
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'connection_established',
                     'user_id': None,
                     'username': 'anonymous',
@@ -154,7 +157,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle incoming WebSocket messages"""
         try:
-            data = json.loads(text_data)
+            data = json_codec.loads(text_data)
             message_type = data.get('type')
             
             logger.debug(f"MessagingConsumer: Received message type: {message_type}")
@@ -170,22 +173,22 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             elif message_type == 'typing_stop':
                 await self.handle_typing_stop(data)
             elif message_type == 'ping':
-                await self.send(text_data=json.dumps({'type': 'pong'}))
+                await self.send(text_data=json_codec.dumps({'type': 'pong'}))
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}'
                 }))
                 
         except (json.JSONDecodeError, KeyError) as e:
             logger.exception(f"Error parsing WebSocket message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': 'Invalid message format'
             }))
         except Exception as exc:
             logger.exception(f"Unexpected error in receive: {exc}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': 'An unexpected error occurred'
             }))
@@ -195,7 +198,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             token = data.get('token')
             if not token:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Token is required for authentication'
                 }))
@@ -217,21 +220,21 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                     self.channel_name
                 )
                 
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'authenticated',
                     'user_id': user.id,
                     'username': user.username
                 }))
                 logger.info(f"WebSocket authenticated for user: {user.username}")
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Invalid token'
                 }))
                 
         except Exception as e:
             logger.exception(f"Error during WebSocket authentication: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': 'Authentication failed'
             }))
@@ -241,7 +244,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             # Check if user is authenticated
             if not self.user or self.user.is_anonymous:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Authentication required to join conversations'
                 }))
@@ -254,7 +257,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             # Validate conversation access
             has_access = await self.check_conversation_access(conversation_id)
             if not has_access:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Access denied to this conversation'
                 }))
@@ -267,14 +270,14 @@ class MessagingConsumer(AsyncWebsocketConsumer):
                 self.channel_name
             )
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'conversation_joined',
                 'conversation_id': conversation_id
             }))
             
         except Exception as e:
             logger.exception(f"Error joining conversation: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to join conversation: {str(e)}'
             }))
@@ -284,7 +287,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             # Check if user is authenticated
             if not self.user or self.user.is_anonymous:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Authentication required'
                 }))
@@ -304,14 +307,14 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             # Clear typing status for this conversation
             await self.clear_typing_status_for_conversation(conversation_id)
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'conversation_left',
                 'conversation_id': conversation_id
             }))
             
         except Exception as e:
             logger.exception(f"Error leaving conversation: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to leave conversation: {str(e)}'
             }))
@@ -321,7 +324,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             # Check if user is authenticated
             if not self.user or self.user.is_anonymous:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Authentication required'
                 }))
@@ -357,7 +360,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.exception(f"Error handling typing start: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to update typing status: {str(e)}'
             }))
@@ -367,7 +370,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         try:
             # Check if user is authenticated
             if not self.user or self.user.is_anonymous:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'error',
                     'message': 'Authentication required'
                 }))
@@ -403,7 +406,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.exception(f"Error handling typing stop: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'error',
                 'message': f'Failed to update typing status: {str(e)}'
             }))
@@ -412,7 +415,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def new_message(self, event):
         """Send new message notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'new_message',
                 'message': event['message']
             }))
@@ -422,7 +425,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def message_updated(self, event):
         """Send message update notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'message_updated',
                 'message': event['message']
             }))
@@ -432,7 +435,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def message_deleted(self, event):
         """Send message deletion notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'message_deleted',
                 'message_id': event['message_id'],
                 'conversation_id': event['conversation_id']
@@ -444,7 +447,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
         """Send typing notification to client (don't send to self)"""
         try:
             if hasattr(self, 'user') and self.user and event['user']['id'] != self.user.id:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'user_typing',
                     'conversation_id': event['conversation_id'],
                     'user': event['user'],
@@ -456,23 +459,13 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def conversation_updated(self, event):
         """Send conversation update notification to client"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'conversation_updated',
                 'conversation': event['conversation']
             }))
         except Exception as e:
             logger.exception(f"Error sending conversation update notification: {e}")
     
-    async def follow_notification(self, event):
-        """Send follow notification to client"""
-        try:
-            await self.send(text_data=json.dumps({
-                'type': 'follow_notification',
-                'notification': event['notification']
-            }))
-        except Exception as e:
-            logger.exception(f"Error sending follow notification: {e}")
-    
     # Database operations
     @database_sync_to_async
     def check_conversation_access(self, conversation_id):
@@ -494,66 +487,38 @@ class MessagingConsumer(AsyncWebsocketConsumer):
             logger.exception(f"Unexpected error in conversation access check: {e}")
             return False
     
-    @database_sync_to_async
+    @sync_to_async
     def set_typing_status(self, conversation_id, is_typing):
         """Set typing status for user in conversation"""
         try:
             if not self.user or self.user.is_anonymous:
                 return
-                
-            conversation = Conversation.objects.get(
-                id=UUID(conversation_id),
-                participants=self.user,
-                is_deleted=False
-            )
             
+            store = get_typing_store()
             if is_typing:
-                typing_status, created = TypingStatus.objects.get_or_create(
-                    user=self.user,
-                    conversation=conversation,
-                    defaults={'is_typing': True}
-                )
-                if not created:
-                    typing_status.is_typing = True
-                    typing_status.save()
+                store.set_typing(conversation_id, self.user.id)
             else:
-                TypingStatus.objects.filter(
-                    user=self.user,
-                    conversation=conversation
-                ).delete()
-                
-        except (Conversation.DoesNotExist, ValidationError) as e:
-            logger.warning(f"Setting typing status failed: {e}")
+                store.clear(conversation_id, self.user.id)
         except Exception as e:
             logger.exception(f"Unexpected error setting typing status: {e}")
     
-    @database_sync_to_async
+    @sync_to_async
     def clear_typing_status(self):
         """Clear all typing status for this user"""
         try:
             if self.user and not self.user.is_anonymous:
-                TypingStatus.objects.filter(user=self.user).delete()
+                get_typing_store().clear_user(self.user.id)
         except Exception as e:
             logger.exception(f"Error clearing typing status: {e}")
     
-    @database_sync_to_async
+    @sync_to_async
     def clear_typing_status_for_conversation(self, conversation_id):
         """Clear typing status for specific conversation"""
         try:
             if not self.user or self.user.is_anonymous:
                 return
-                
-            conversation = Conversation.objects.get(
-                id=UUID(conversation_id),
-                participants=self.user,
-                is_deleted=False
-            )
-            TypingStatus.objects.filter(
-                user=self.user,
-                conversation=conversation
-            ).delete()
-        except (Conversation.DoesNotExist, ValidationError) as e:
-            logger.warning(f"Clearing conversation typing status failed: {e}")
+            
+            get_typing_store().clear(conversation_id, self.user.id)
         except Exception as e:
             logger.exception(f"Unexpected error clearing conversation typing status: {e}")
 
@@ -561,8 +526,9 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def follow_notification(self, event):
         """Send follow notification to user"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'follow_notification',
+                'follow_id': event.get('follow_id'),
                 'follower': event['follower'],
                 'message': event.get('message', 'You have a new follower!'),
                 'timestamp': event.get('timestamp')
@@ -573,7 +539,7 @@ class MessagingConsumer(AsyncWebsocketConsumer):
     async def unread_count_update(self, event):
         """Send unread count update to user"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'unread_count_update',
                 'message_count': event.get('message_count', 0),
                 'notification_count': event.get('notification_count', 0),
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-19 11:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_merge_20250805_0921'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='TypingStatus',
+        ),
+    ]
@@ -247,30 +247,6 @@ class MessageRead(models.Model):
         return f"{self.user.username} read message {self.message.id}"
 
 
-class TypingStatus(models.Model):
-    """
-    Temporary model to track typing status
-    """
-    conversation = models.ForeignKey(
-        Conversation,
-        on_delete=models.CASCADE,
-        related_name='typing_statuses'
-    )
-    user = models.ForeignKey(
-        User,
-        on_delete=models.CASCADE,
-        related_name='typing_in'
-    )
-    started_typing_at = models.DateTimeField(auto_now=True)
-    
-    class Meta:
-        db_table = 'messaging_typing_status'
-        unique_together = ['conversation', 'user']
-    
-    def __str__(self):
-        return f"{self.user.username} typing in {self.conversation.id}"
-
-
 class MessageReaction(models.Model):
     """
     Model for message reactions (like, love, laugh, etc.)
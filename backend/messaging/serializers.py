@@ -1,8 +1,10 @@
 # backend/messaging/serializers.py
+from collections import Counter
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db.models import Count
+from core.fieldset_utils import SparseFieldsetMixin
 from .models import (
     Conversation, Message, ConversationParticipant, MessageRead, 
     MessageDelivered, MessageReaction, UserStatus
@@ -38,8 +40,8 @@ class ReactionSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'reaction', 'reacted_at']
 
 
-class MessageSerializer(serializers.ModelSerializer):
-    """Serializer for messages"""
+class MessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Serializer for messages; lists include reactions and read/delivery users only with ?expand="""
     sender = UserSerializer(read_only=True)
     recipient = UserSerializer(read_only=True)
     reply_to = serializers.SerializerMethodField()
@@ -57,6 +59,7 @@ class MessageSerializer(serializers.ModelSerializer):
             'is_read', 'is_delivered', 'read_by_users', 'delivered_by_users', 'reactions'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'sender', 'recipient']
+        expandable_fields = ['read_by_users', 'delivered_by_users', 'reactions']
     
     def get_reply_to(self, obj):
         """Get replied-to message snippet"""
@@ -97,6 +100,8 @@ class MessageSerializer(serializers.ModelSerializer):
     
     def get_reactions(self, obj):
         """Get reaction counts for this message"""
+        if 'reactions' in getattr(obj, '_prefetched_objects_cache', {}):
+            return dict(Counter(reaction.reaction for reaction in obj.reactions.all()))
         reactions = obj.reactions.values('reaction').annotate(count=Count('reaction'))
         return {reaction['reaction']: reaction['count'] for reaction in reactions}
 
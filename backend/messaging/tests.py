@@ -0,0 +1,101 @@
+import os
+import uuid
+from unittest import mock
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from . import typing_store
+from .models import Conversation, ConversationParticipant
+from .typing_store import InMemoryTypingStore, RedisTypingStore
+
+
+class TypingStoreTestCase(APITestCase):
+    """Typing indicators expire on their own and stay within their conversation"""
+    
+    def setUp(self):
+        self.typist = User.objects.create_user(username='typist', email='typist@example.com', first_name='Tia')
+        self.reader = User.objects.create_user(username='reader', email='reader@example.com')
+        self.outsider = User.objects.create_user(username='outsider', email='outsider@example.com')
+        self.conversation = Conversation.objects.create()
+        for user in (self.typist, self.reader):
+            ConversationParticipant.objects.create(conversation=self.conversation, user=user)
+        self.store = InMemoryTypingStore(ttl=8)
+    
+    def _check_store(self, store, clock):
+        """Shared behaviour of both stores; clock patches the time source the store uses"""
+        first, second = 'conversation-a', 'conversation-b'
+        with mock.patch(clock, return_value=1000.0):
+            store.set_typing(first, 1)
+            store.set_typing(first, 2)
+            store.set_typing(second, 1)
+            self.assertEqual(sorted(store.get_typing_users(first)), [1, 2])
+            self.assertEqual(store.get_typing_users(second), [1])
+            self.assertEqual(store.get_typing_users('conversation-c'), [])
+            
+            store.clear(first, 2)
+            self.assertEqual(store.get_typing_users(first), [1])
+            self.assertEqual(store.get_typing_users(second), [1])
+        
+        with mock.patch(clock, return_value=1005.0):
+            store.set_typing(second, 3)
+        with mock.patch(clock, return_value=1009.0):
+            # User 1 stopped refreshing 9s ago with an 8s TTL; user 3 typed 4s ago
+            self.assertEqual(store.get_typing_users(first), [])
+            self.assertEqual(store.get_typing_users(second), [3])
+            store.set_typing(first, 3)
+            store.clear_user(3)
+            self.assertEqual(store.get_typing_users(first), [])
+            self.assertEqual(store.get_typing_users(second), [])
+    
+    def test_in_memory_store_expiry_and_isolation(self):
+        self._check_store(self.store, 'messaging.typing_store.time.monotonic')
+    
+    def test_redis_store_expiry_and_isolation(self):
+        redis_url = os.environ.get('REDIS_URL')
+        if not redis_url:
+            self.skipTest('REDIS_URL is not set')
+        store = RedisTypingStore(redis_url, ttl=8)
+        try:
+            store._client.ping()
+        except Exception as exc:
+            self.skipTest(f'Redis unavailable: {exc}')
+        prefix = uuid.uuid4().hex
+        store._conversation_key = lambda conversation_id: f'test:{prefix}:{conversation_id}'
+        store._user_key = lambda user_id: f'test:{prefix}:user:{user_id}'
+        self._check_store(store, 'messaging.typing_store.time.time')
+    
+    def test_store_follows_redis_url(self):
+        with mock.patch.object(typing_store, '_store', None), mock.patch.dict('os.environ', {'REDIS_URL': ''}):
+            store = typing_store.get_typing_store()
+            self.assertIsInstance(store, typing_store.InMemoryTypingStore)
+            self.assertIs(typing_store.get_typing_store(), store)
+        with mock.patch.object(typing_store, '_store', None), \
+                mock.patch.dict('os.environ', {'REDIS_URL': 'redis://localhost:6379/0'}):
+            self.assertIsInstance(typing_store.get_typing_store(), typing_store.RedisTypingStore)
+    
+    def test_start_and_stop_endpoints(self):
+        kwargs = {'conversation_id': self.conversation.id}
+        typing_url = reverse('messaging:typing-users', kwargs=kwargs)
+        with mock.patch('messaging.views.get_typing_store', return_value=self.store):
+            self.client.force_authenticate(self.typist)
+            response = self.client.post(reverse('messaging:start-typing', kwargs=kwargs))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # Typists do not see themselves
+            self.assertEqual(self.client.get(typing_url).json()['typing'], [])
+            
+            self.client.force_authenticate(self.reader)
+            typing = self.client.get(typing_url).json()['typing']
+            self.assertEqual(typing, [{'id': self.typist.id, 'username': 'typist', 'full_name': 'Tia'}])
+            
+            self.client.force_authenticate(self.typist)
+            self.client.post(reverse('messaging:stop-typing', kwargs=kwargs))
+            self.client.force_authenticate(self.reader)
+            self.assertEqual(self.client.get(typing_url).json()['typing'], [])
+            
+            self.client.force_authenticate(self.outsider)
+            response = self.client.post(reverse('messaging:start-typing', kwargs=kwargs))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(self.client.get(typing_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.store.get_typing_users(self.conversation.id), [])
@@ -0,0 +1,156 @@
+# backend/messaging/typing_store.py
+"""
+Ephemeral typing-indicator state.
+
+Typing state is short-lived and write-heavy, so it is kept out of the database.
+Entries expire on their own after ``TYPING_STATUS_TTL`` seconds, which means a
+client that disconnects without sending ``typing_stop`` never leaves a stale
+indicator behind.
+
+An in-process store is used by default; when ``REDIS_URL`` is configured the
+state lives in Redis so every worker sees the same typists.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TYPING_STATUS_TTL = getattr(settings, 'TYPING_STATUS_TTL', 8)
+
+
+class InMemoryTypingStore:
+    """Per-process typing store keyed by conversation with lazy expiry"""
+
+    def __init__(self, ttl=TYPING_STATUS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # {conversation_id: {user_id: expires_at}}
+        self._conversations = {}
+
+    def set_typing(self, conversation_id, user_id):
+        """Mark user as typing in conversation, refreshing the expiry"""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._conversations.setdefault(str(conversation_id), {})[user_id] = expires_at
+
+    def clear(self, conversation_id, user_id):
+        """Remove user's typing state for a single conversation"""
+        key = str(conversation_id)
+        with self._lock:
+            typists = self._conversations.get(key)
+            if typists is None:
+                return
+            typists.pop(user_id, None)
+            if not typists:
+                del self._conversations[key]
+
+    def clear_user(self, user_id):
+        """Remove user's typing state from every conversation"""
+        with self._lock:
+            for key in list(self._conversations):
+                typists = self._conversations[key]
+                typists.pop(user_id, None)
+                if not typists:
+                    del self._conversations[key]
+
+    def get_typing_users(self, conversation_id):
+        """Return ids of users currently typing in conversation"""
+        key = str(conversation_id)
+        now = time.monotonic()
+        with self._lock:
+            typists = self._conversations.get(key)
+            if not typists:
+                return []
+            for user_id, expires_at in list(typists.items()):
+                if expires_at <= now:
+                    del typists[user_id]
+            if not typists:
+                del self._conversations[key]
+                return []
+            return list(typists)
+
+
+class RedisTypingStore:
+    """
+    Redis-backed typing store shared across workers.
+
+    Each conversation is a sorted set of user ids scored by expiry time, so a
+    single ZRANGEBYSCORE answers "who is typing" and stale members are trimmed
+    in the same round trip. A per-user set of conversations lets disconnects
+    clear everything without scanning keys.
+    """
+
+    def __init__(self, redis_url, ttl=TYPING_STATUS_TTL):
+        import redis
+
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(redis_url)
+
+    def _conversation_key(self, conversation_id):
+        return f"typing:conversation:{conversation_id}"
+
+    def _user_key(self, user_id):
+        return f"typing:user:{user_id}"
+
+    def set_typing(self, conversation_id, user_id):
+        """Mark user as typing in conversation, refreshing the expiry"""
+        conversation_key = self._conversation_key(conversation_id)
+        user_key = self._user_key(user_id)
+        pipe = self._client.pipeline()
+        pipe.zadd(conversation_key, {user_id: time.time() + self.ttl})
+        pipe.expire(conversation_key, self.ttl)
+        pipe.sadd(user_key, str(conversation_id))
+        pipe.expire(user_key, self.ttl)
+        pipe.execute()
+
+    def clear(self, conversation_id, user_id):
+        """Remove user's typing state for a single conversation"""
+        pipe = self._client.pipeline()
+        pipe.zrem(self._conversation_key(conversation_id), user_id)
+        pipe.srem(self._user_key(user_id), str(conversation_id))
+        pipe.execute()
+
+    def clear_user(self, user_id):
+        """Remove user's typing state from every conversation"""
+        user_key = self._user_key(user_id)
+        conversation_ids = self._client.smembers(user_key)
+        pipe = self._client.pipeline()
+        for conversation_id in conversation_ids:
+            pipe.zrem(self._conversation_key(conversation_id.decode()), user_id)
+        pipe.delete(user_key)
+        pipe.execute()
+
+    def get_typing_users(self, conversation_id):
+        """Return ids of users currently typing in conversation"""
+        conversation_key = self._conversation_key(conversation_id)
+        now = time.time()
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(conversation_key, '-inf', now)
+        pipe.zrangebyscore(conversation_key, now, '+inf')
+        _, members = pipe.execute()
+        return [int(member) for member in members]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_typing_store():
+    """Return the process-wide typing store, creating it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                redis_url = os.environ.get('REDIS_URL')
+                if redis_url:
+                    try:
+                        _store = RedisTypingStore(redis_url)
+                    except ImportError:
+                        logger.warning("redis not installed - falling back to in-memory typing store")
+                if _store is None:
+                    _store = InMemoryTypingStore()
+    return _store
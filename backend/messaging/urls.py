@@ -11,6 +11,7 @@ urlpatterns = [
     path('conversations/<uuid:pk>/', views.ConversationDetailView.as_view(), name='conversation-detail'),
     path('conversations/<uuid:conversation_id>/messages/', views.MessageListCreateView.as_view(), name='message-list-create'),
     path('conversations/<uuid:conversation_id>/mark-read/', views.mark_conversation_as_read, name='mark-conversation-read'),
+    path('conversations/<uuid:conversation_id>/typing/', views.get_typing_users, name='typing-users'),
     path('conversations/<uuid:conversation_id>/typing/start/', views.start_typing, name='start-typing'),
     path('conversations/<uuid:conversation_id>/typing/stop/', views.stop_typing, name='stop-typing'),
     
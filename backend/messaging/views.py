@@ -6,13 +6,16 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.http import Http404
 from django.contrib.auth.models import User
 from django.db.models import Q, Max, Count, Prefetch
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
+from core.fieldset_utils import requested_expansions
 from .models import Conversation, Message, ConversationParticipant
+from .typing_store import get_typing_store
 from .serializers import (
     ConversationSerializer,
     ConversationDetailSerializer,
@@ -201,12 +204,22 @@ class MessageListCreateView(generics.ListCreateAPIView):
         )
         
         # Only show messages not deleted by current user
-        return Message.objects.filter(
+        queryset = Message.objects.filter(
             conversation=conversation,
             is_deleted=False
         ).exclude(
             deleted_by=self.request.user
-        ).select_related('sender').prefetch_related('read_by').order_by('created_at')
+        ).select_related('sender').order_by('created_at')
+        
+        # Reactions and read/delivery users are only serialized when expanded
+        expand = requested_expansions(self.request)
+        if 'reactions' in expand:
+            queryset = queryset.prefetch_related('reactions')
+        if 'read_by_users' in expand:
+            queryset = queryset.prefetch_related('read_by')
+        if 'delivered_by_users' in expand:
+            queryset = queryset.prefetch_related('delivered_to')
+        return queryset
     
     def create(self, request, *args, **kwargs):
         """Enhanced create method with better error handling"""
@@ -440,72 +453,6 @@ def send_unread_count_update(user):
         logger.warning(f"Failed to send unread count update: {e}")
 
 
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def start_typing(request, conversation_id):
-    """Notify other participants that user is typing"""
-    conversation = get_object_or_404(
-        Conversation,
-        id=conversation_id,
-        participants=request.user,
-        is_deleted=False
-    )
-    
-    # Send typing notification via WebSocket
-    channel_layer = get_channel_layer()
-    
-    for participant in conversation.participants.all():
-        if participant != request.user:
-            async_to_sync(channel_layer.group_send)(
-                f"user_{participant.id}",
-                {
-                    'type': 'user_typing',
-                    'conversation_id': str(conversation.id),
-                    'user': {
-                        'id': request.user.id,
-                        'username': request.user.username,
-                        'full_name': f"{request.user.first_name} {request.user.last_name}".strip() or request.user.username
-                    },
-                    'is_typing': True
-                }
-            )
-    
-    return Response({'status': 'typing notification sent'})
-
-
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def stop_typing(request, conversation_id):
-    """Notify other participants that user stopped typing"""
-    conversation = get_object_or_404(
-        Conversation,
-        id=conversation_id,
-        participants=request.user,
-        is_deleted=False
-    )
-    
-    # Send stop typing notification via WebSocket
-    channel_layer = get_channel_layer()
-    
-    for participant in conversation.participants.all():
-        if participant != request.user:
-            async_to_sync(channel_layer.group_send)(
-                f"user_{participant.id}",
-                {
-                    'type': 'user_typing',
-                    'conversation_id': str(conversation.id),
-                    'user': {
-                        'id': request.user.id,
-                        'username': request.user.username,
-                        'full_name': f"{request.user.first_name} {request.user.last_name}".strip() or request.user.username
-                    },
-                    'is_typing': False
-                }
-            )
-    
-    return Response({'status': 'stop typing notification sent'})
-
-
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_unread_count(request):
@@ -804,35 +751,48 @@ def mark_conversation_as_read(request, conversation_id):
         )
 
 
+def _broadcast_typing(request, conversation_id, is_typing):
+    """Record typing state and notify the conversation group"""
+    store = get_typing_store()
+    if is_typing:
+        store.set_typing(conversation_id, request.user.id)
+    else:
+        store.clear(conversation_id, request.user.id)
+    
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        f"conversation_{conversation_id}",
+        {
+            'type': 'user_typing',
+            'conversation_id': str(conversation_id),
+            'user': {
+                'id': request.user.id,
+                'username': request.user.username,
+                'full_name': f"{request.user.first_name} {request.user.last_name}".strip() or request.user.username
+            },
+            'is_typing': is_typing
+        }
+    )
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def start_typing(request, conversation_id):
     """Handle typing start events"""
     try:
-        conversation = get_object_or_404(
+        get_object_or_404(
             Conversation,
             id=conversation_id,
             participants=request.user,
             is_deleted=False
         )
         
-        # Broadcast typing event via WebSockets
-        channel_layer = get_channel_layer()
-        conversation_group_name = f"conversation_{conversation_id}"
-        
-        async_to_sync(channel_layer.group_send)(
-            conversation_group_name,
-            {
-                'type': 'typing_start',
-                'user': {
-                    'id': request.user.id,
-                    'username': request.user.username
-                }
-            }
-        )
+        _broadcast_typing(request, conversation_id, True)
         
         return Response({'status': 'success'}, status=status.HTTP_200_OK)
         
+    except Http404:
+        raise
     except Exception as e:
         logger.error(f"Error starting typing indicator: {e}")
         return Response(
@@ -846,30 +806,19 @@ def start_typing(request, conversation_id):
 def stop_typing(request, conversation_id):
     """Handle typing stop events"""
     try:
-        conversation = get_object_or_404(
+        get_object_or_404(
             Conversation,
             id=conversation_id,
             participants=request.user,
             is_deleted=False
         )
         
-        # Broadcast typing stop event via WebSockets
-        channel_layer = get_channel_layer()
-        conversation_group_name = f"conversation_{conversation_id}"
-        
-        async_to_sync(channel_layer.group_send)(
-            conversation_group_name,
-            {
-                'type': 'typing_stop',
-                'user': {
-                    'id': request.user.id,
-                    'username': request.user.username
-                }
-            }
-        )
+        _broadcast_typing(request, conversation_id, False)
         
         return Response({'status': 'success'}, status=status.HTTP_200_OK)
         
+    except Http404:
+        raise
     except Exception as e:
         logger.error(f"Error stopping typing indicator: {e}")
         return Response(
@@ -878,6 +827,36 @@ def stop_typing(request, conversation_id):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def get_typing_users(request, conversation_id):
+    """List the other participants currently typing in a conversation"""
+    get_object_or_404(
+        Conversation,
+        id=conversation_id,
+        participants=request.user,
+        is_deleted=False
+    )
+    
+    user_ids = [
+        user_id for user_id in get_typing_store().get_typing_users(conversation_id)
+        if user_id != request.user.id
+    ]
+    users = User.objects.filter(id__in=user_ids).only('id', 'username', 'first_name', 'last_name')
+    
+    return Response({
+        'conversation_id': str(conversation_id),
+        'typing': [
+            {
+                'id': user.id,
+                'username': user.username,
+                'full_name': f"{user.first_name} {user.last_name}".strip() or user.username
+            }
+            for user in users
+        ]
+    })
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_messages_between_users(request):
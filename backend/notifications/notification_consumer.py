@@ -5,6 +5,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
 from django.utils import timezone
+from core import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +85,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle incoming WebSocket messages from frontend"""
         try:
-            data = json.loads(text_data)
+            data = json_codec.loads(text_data)
             message_type = data.get('type')
             
             logger.debug(f"📥 NotificationConsumer received: {data}")
@@ -94,7 +95,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             elif message_type == 'mark_all_notifications_read':
                 await self.handle_mark_all_notifications_read()
             elif message_type == 'ping':
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'pong',
                     'timestamp': timezone.now().isoformat()
                 }))
@@ -121,7 +122,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 await self.send_unread_count()
                 
                 # Confirm to frontend
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=json_codec.dumps({
                     'type': 'notification_marked_read',
                     'notification_id': notification_id,
                     'timestamp': timezone.now().isoformat()
@@ -140,7 +141,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await self.send_unread_count()
             
             # Confirm to frontend
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'all_notifications_marked_read',
                 'updated_count': updated_count,
                 'timestamp': timezone.now().isoformat()
@@ -154,7 +155,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     async def new_notification(self, event):
         """Handle new notification broadcast from backend"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'new_notification',
                 'notification': event['notification'],
                 'timestamp': event['timestamp']
@@ -166,7 +167,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     async def unread_count_update(self, event):
         """Handle unread count update from backend"""
         try:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'unread_count_update',
                 'notification_count': event.get('notification_count', 0),
                 'message_count': event.get('message_count', 0),
@@ -253,7 +254,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         try:
             count = await self.get_unread_count()
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=json_codec.dumps({
                 'type': 'unread_count',
                 'count': count,
                 'timestamp': timezone.now().isoformat()
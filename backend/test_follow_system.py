@@ -15,7 +15,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vikrahub.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from core.follow_models import Follow, FollowNotification
+from core.follow_models import Follow
+from core.models import Notification
 from core.follow_serializers import FollowSerializer, FollowStatsSerializer
 
 def test_follow_system():
@@ -112,7 +113,7 @@ def test_follow_system():
     # 6. Test Follow Notifications
     print("\n6. Testing follow notifications...")
     try:
-        notification_count = FollowNotification.objects.filter(recipient=user2).count()
+        notification_count = Notification.objects.filter(user=user2, verb='follow').count()
         print(f"   ✅ {user2.username} has {notification_count} follow notifications")
         
     except Exception as e:
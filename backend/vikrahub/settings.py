@@ -89,6 +89,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestMetricsMiddleware',  # Outermost so it times the whole stack
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -168,6 +169,27 @@ else:
             }
         }
 
+# Cache: Redis (shared by every worker) when REDIS_URL is set, per-process memory otherwise.
+# Backs the anonymous response cache, conditional GET versions and share pages.
+if redis_url:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": redis_url,
+            "KEY_PREFIX": "vikrahub",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "vikrahub",
+            "TIMEOUT": 300,
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
 # Database
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if DATABASE_URL:
@@ -204,6 +226,30 @@ if EMAIL_BACKEND == 'django.core.mail.backends.smtp.EmailBackend':
 else:
     print("Development mode: Using console email backend (emails will print to console)")
 
+# Outbound email queue (see core/email_queue.py). Delivered by
+# process_email_queue --loop; eager delivery after each request is for local
+# development without a worker and is on by default only when DEBUG is
+EMAIL_QUEUE_EAGER = os.environ.get('EMAIL_QUEUE_EAGER', str(DEBUG)).lower() == 'true'
+EMAIL_QUEUE_BATCH_SIZE = int(os.environ.get('EMAIL_QUEUE_BATCH_SIZE', '50'))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get('EMAIL_QUEUE_MAX_ATTEMPTS', '5'))
+EMAIL_QUEUE_RETRY_BASE_SECONDS = int(os.environ.get('EMAIL_QUEUE_RETRY_BASE_SECONDS', '60'))
+
+# Request instrumentation (see core/instrumentation.py)
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'True').lower() == 'true'
+INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('INSTRUMENTATION_SAMPLE_RATE', '1.0' if DEBUG else '0.1'))
+INSTRUMENTATION_SLOW_REQUEST_MS = int(os.environ.get('INSTRUMENTATION_SLOW_REQUEST_MS', '500'))
+INSTRUMENTATION_SLOW_QUERY_COUNT = int(os.environ.get('INSTRUMENTATION_SLOW_QUERY_COUNT', '50'))
+INSTRUMENTATION_METRICS_TOKEN = os.environ.get('INSTRUMENTATION_METRICS_TOKEN', '')
+
+# Anonymous response cache (see core/cache_utils.py)
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '300'))
+RESPONSE_CACHE_LOCK_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_LOCK_TIMEOUT', '30'))
+RESPONSE_CACHE_STALE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_STALE_TIMEOUT', '3600'))
+
+# JSON codec for DRF and WebSockets (see core/json_codec.py); orjson is used when installed
+JSON_CODEC_USE_ORJSON = os.environ.get('JSON_CODEC_USE_ORJSON', 'True').lower() == 'true'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
@@ -338,7 +384,12 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.json_codec.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.json_codec.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
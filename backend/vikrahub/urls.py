@@ -11,16 +11,8 @@ from rest_framework_simplejwt.views import (
 )
 
 # Sitemap imports
-from django.contrib.sitemaps.views import sitemap
-from core.sitemaps import StaticViewSitemap, BlogSitemap, APISitemap, PortfolioSitemap
-
-# Sitemap dictionary
-sitemaps = {
-    'static': StaticViewSitemap,
-    'blog': BlogSitemap,
-    'api': APISitemap,
-    'portfolio': PortfolioSitemap,
-}
+from core.sitemaps import sitemap_index, sitemap_section
+from core.instrumentation import metrics_view
 
 def robots_txt(request):
     """Generate robots.txt for search engine crawlers"""
@@ -96,7 +88,8 @@ urlpatterns = [
     path('api/', api_root, name='api_status'),
     
     # SEO and crawlers
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemap.xml', sitemap_index, name='sitemap_index'),
+    path('sitemap-<str:section>.xml', sitemap_section, name='sitemap_section'),
     path('robots.txt', robots_txt, name='robots_txt'),
     
     # Blog sharing for social media (must come before API routes)
@@ -113,6 +106,9 @@ urlpatterns = [
     
     # Admin interface (keep for backend management)
     path('admin/', admin.site.urls),
+    
+    # Prometheus metrics for this worker (staff or INSTRUMENTATION_METRICS_TOKEN)
+    path('internal/metrics', metrics_view, name='internal_metrics'),
 ]
 
 # Serve media files in development
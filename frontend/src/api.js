@@ -761,10 +761,11 @@ export const messagesAPI = {
   // Get conversation details
   getConversation: (conversationId) => api.get(`messaging/conversations/${conversationId}/`),
   
-  // Get messages in conversation (paginated)
+  // Get messages in conversation (paginated); reactions are only listed when expanded
   getMessages: (conversationId, page = 1) => {
-    const params = page > 1 ? `?page=${page}` : '';
-    return api.get(`messaging/conversations/${conversationId}/messages/${params}`);
+    const params = { expand: 'reactions' };
+    if (page > 1) params.page = page;
+    return api.get(`messaging/conversations/${conversationId}/messages/`, { params });
   },
   
   // Send message to conversation
@@ -1007,7 +1008,9 @@ export const messagingAPI = {
         throw new Error('Conversation ID is required');
       }
       
-      const response = await api.get(`messaging/conversations/${conversation_id}/messages/`);
+      const response = await api.get(`messaging/conversations/${conversation_id}/messages/`, {
+        params: { expand: 'reactions' }
+      });
       console.log('✅ Messages fetched successfully:', response.data?.length || 0);
       return response;
     } catch (error) {